@@ -0,0 +1,93 @@
+"""Baseline schema, as created by init_db before migrations were added.
+
+Databases created that way should be stamped at this revision
+(``alembic stamp 0001``) and then upgraded.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "publishers",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=200), nullable=False),
+        sa.Column("slug", sa.String(length=200), nullable=False),
+        sa.Column("country", sa.String(length=2), nullable=True),
+        sa.Column("website_url", sa.String(), nullable=True),
+        sa.Column("logo_url", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name"),
+    )
+    op.create_index("ix_publishers_id", "publishers", ["id"])
+    op.create_index("ix_publishers_slug", "publishers", ["slug"], unique=True)
+
+    op.create_table(
+        "manga_releases",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(length=500), nullable=False),
+        sa.Column("series_name", sa.String(length=500), nullable=True),
+        sa.Column("volume_number", sa.String(length=50), nullable=True),
+        sa.Column("isbn_13", sa.String(length=13), nullable=True),
+        sa.Column("isbn_10", sa.String(length=10), nullable=True),
+        sa.Column("release_date", sa.Date(), nullable=False),
+        sa.Column("publisher_id", sa.Integer(), nullable=False),
+        sa.Column("format", sa.String(length=50), nullable=True),
+        sa.Column("page_count", sa.Integer(), nullable=True),
+        sa.Column("price_usd", sa.Numeric(precision=8, scale=2), nullable=True),
+        sa.Column("price_gbp", sa.Numeric(precision=8, scale=2), nullable=True),
+        sa.Column("cover_image_url", sa.Text(), nullable=True),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("demographic", sa.String(length=50), nullable=True),
+        sa.Column("genres", sa.JSON(), nullable=True),
+        sa.Column("regions", sa.JSON(), nullable=True),
+        sa.Column("authors", sa.JSON(), nullable=True),
+        sa.Column("illustrators", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("source_metadata", sa.JSON(), nullable=True),
+        sa.ForeignKeyConstraint(["publisher_id"], ["publishers.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_manga_releases_id", "manga_releases", ["id"])
+    op.create_index("ix_manga_releases_title", "manga_releases", ["title"])
+    op.create_index("ix_manga_releases_series_name", "manga_releases", ["series_name"])
+    op.create_index("ix_manga_releases_isbn_13", "manga_releases", ["isbn_13"], unique=True)
+    op.create_index("ix_manga_releases_release_date", "manga_releases", ["release_date"])
+    op.create_index("ix_manga_releases_publisher_id", "manga_releases", ["publisher_id"])
+
+    op.create_table(
+        "source_records",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("manga_release_id", sa.Integer(), nullable=False),
+        sa.Column("source_name", sa.String(length=100), nullable=False),
+        sa.Column("external_id", sa.String(length=255), nullable=False),
+        sa.Column("source_url", sa.Text(), nullable=True),
+        sa.Column("raw_data", sa.JSON(), nullable=True),
+        sa.Column("fetched_at", sa.DateTime(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["manga_release_id"], ["manga_releases.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_source_records_id", "source_records", ["id"])
+    op.create_index("ix_source_records_manga_release_id", "source_records", ["manga_release_id"])
+    op.create_index("ix_source_records_source_name", "source_records", ["source_name"])
+
+
+def downgrade() -> None:
+    op.drop_table("source_records")
+    op.drop_table("manga_releases")
+    op.drop_table("publishers")
@@ -0,0 +1,77 @@
+"""Full-text and trigram search.
+
+- pg_trgm, for the trigram operator classes
+- manga_releases.search_vector, a generated tsvector over title, series
+  and authors, with a GIN index
+- trigram GIN indexes on release titles, series names and publisher names,
+  for typo-tolerant matching
+
+Databases that init_db created after search was added already have these;
+upgrading them skips what exists.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+TRIGRAM_INDEXES = {
+    "ix_manga_releases_title_trgm": ("manga_releases", "title"),
+    "ix_manga_releases_series_name_trgm": ("manga_releases", "series_name"),
+    "ix_publishers_name_trgm": ("publishers", "name"),
+}
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    inspector = sa.inspect(op.get_bind())
+    if "search_vector" not in {column["name"] for column in inspector.get_columns("manga_releases")}:
+        # authors is still JSON here; 0003 rebuilds this over the JSONB column
+        op.add_column(
+            "manga_releases",
+            sa.Column(
+                "search_vector",
+                postgresql.TSVECTOR(),
+                sa.Computed(
+                    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+                    "setweight(to_tsvector('english', coalesce(series_name, '')), 'A') || "
+                    "setweight(jsonb_to_tsvector('english', coalesce(authors::jsonb, '[]'::jsonb), "
+                    "'[\"string\"]'), 'B')",
+                    persisted=True,
+                ),
+                nullable=True,
+            ),
+        )
+    op.create_index(
+        "ix_manga_releases_search_vector",
+        "manga_releases",
+        ["search_vector"],
+        postgresql_using="gin",
+        if_not_exists=True,
+    )
+    for name, (table, column) in TRIGRAM_INDEXES.items():
+        op.create_index(
+            name,
+            table,
+            [column],
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    for name, (table, column) in TRIGRAM_INDEXES.items():
+        op.drop_index(name, table_name=table)
+    op.drop_index("ix_manga_releases_search_vector", table_name="manga_releases")
+    op.drop_column("manga_releases", "search_vector")
@@ -0,0 +1,159 @@
+"""Sync state, source record provenance, and JSONB list columns.
+
+- data_sources, holding each source's incremental sync cursor
+- source_records.content_hash and raw_data_compressed, and a unique
+  (source_name, external_id) index (older duplicates are dropped first)
+- genres, regions, authors and illustrators as JSONB, with GIN indexes for
+  the region and genre filters and a (demographic, release_date) index;
+  search_vector is rebuilt, since it depends on authors
+
+Databases that init_db created after some of these changes already have
+them; upgrading them skips what exists.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+LIST_COLUMNS = ["genres", "regions", "authors", "illustrators"]
+
+
+def _search_vector(authors: str) -> sa.Column:
+    """The generated search document, over ``authors`` as a JSONB expression."""
+    return sa.Column(
+        "search_vector",
+        postgresql.TSVECTOR(),
+        sa.Computed(
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(series_name, '')), 'A') || "
+            f"setweight(jsonb_to_tsvector('english', coalesce({authors}, '[]'::jsonb), "
+            "'[\"string\"]'), 'B')",
+            persisted=True,
+        ),
+        nullable=True,
+    )
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    if not inspector.has_table("data_sources"):
+        _create_data_sources()
+
+    source_record_columns = {column["name"] for column in inspector.get_columns("source_records")}
+    if "raw_data_compressed" not in source_record_columns:
+        op.add_column("source_records", sa.Column("raw_data_compressed", sa.LargeBinary(), nullable=True))
+    if "content_hash" not in source_record_columns:
+        op.add_column("source_records", sa.Column("content_hash", sa.String(length=64), nullable=True))
+    op.execute("""
+        DELETE FROM source_records a
+        USING source_records b
+        WHERE a.source_name = b.source_name
+          AND a.external_id = b.external_id
+          AND a.id < b.id
+    """)
+    op.create_index(
+        "uq_source_records_source_external",
+        "source_records",
+        ["source_name", "external_id"],
+        unique=True,
+        if_not_exists=True,
+    )
+
+    release_types = {
+        column["name"]: column["type"] for column in inspector.get_columns("manga_releases")
+    }
+    if not all(isinstance(release_types[column], postgresql.JSONB) for column in LIST_COLUMNS):
+        op.drop_index("ix_manga_releases_search_vector", table_name="manga_releases", if_exists=True)
+        op.drop_column("manga_releases", "search_vector")
+        for column in LIST_COLUMNS:
+            op.alter_column(
+                "manga_releases",
+                column,
+                type_=postgresql.JSONB(),
+                postgresql_using=f"{column}::jsonb",
+            )
+        op.add_column("manga_releases", _search_vector("authors"))
+        op.create_index(
+            "ix_manga_releases_search_vector",
+            "manga_releases",
+            ["search_vector"],
+            postgresql_using="gin",
+        )
+    for column in ("regions", "genres"):
+        op.create_index(
+            f"ix_manga_releases_{column}",
+            "manga_releases",
+            [column],
+            postgresql_using="gin",
+            postgresql_ops={column: "jsonb_path_ops"},
+            if_not_exists=True,
+        )
+    op.create_index(
+        "ix_manga_releases_demographic_release_date",
+        "manga_releases",
+        ["demographic", "release_date"],
+        if_not_exists=True,
+    )
+
+
+def _create_data_sources() -> None:
+    op.create_table(
+        "data_sources",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("slug", sa.String(length=100), nullable=False),
+        sa.Column("source_type", sa.String(length=50), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("priority", sa.Integer(), nullable=False),
+        sa.Column("config", sa.JSON(), nullable=True),
+        sa.Column("last_modified", sa.DateTime(), nullable=True),
+        sa.Column("etag", sa.String(length=255), nullable=True),
+        sa.Column("last_sync_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name"),
+    )
+    op.create_index("ix_data_sources_id", "data_sources", ["id"])
+    op.create_index("ix_data_sources_slug", "data_sources", ["slug"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_manga_releases_demographic_release_date", table_name="manga_releases")
+    op.drop_index("ix_manga_releases_genres", table_name="manga_releases")
+    op.drop_index("ix_manga_releases_regions", table_name="manga_releases")
+    op.drop_index("ix_manga_releases_search_vector", table_name="manga_releases")
+    op.drop_column("manga_releases", "search_vector")
+    for column in LIST_COLUMNS:
+        op.alter_column(
+            "manga_releases",
+            column,
+            type_=sa.JSON(),
+            postgresql_using=f"{column}::json",
+        )
+    op.add_column("manga_releases", _search_vector("authors::jsonb"))
+    op.create_index(
+        "ix_manga_releases_search_vector",
+        "manga_releases",
+        ["search_vector"],
+        postgresql_using="gin",
+    )
+
+    op.drop_index("uq_source_records_source_external", table_name="source_records")
+    op.drop_column("source_records", "content_hash")
+    op.drop_column("source_records", "raw_data_compressed")
+
+    op.drop_index("ix_data_sources_slug", table_name="data_sources")
+    op.drop_index("ix_data_sources_id", table_name="data_sources")
+    op.drop_table("data_sources")
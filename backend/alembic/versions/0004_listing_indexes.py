@@ -0,0 +1,57 @@
+"""Composite indexes for the listing queries.
+
+Listings filter on a month (and maybe a publisher or format) and page in
+(release_date, id) order, so each index ends in release_date, id. A query
+can then read the first page in order and stop at its LIMIT, with no sort.
+The (release_date, id) index also covers the count and per-month window
+queries, which need nothing else. The single-column release_date and
+publisher_id indexes are prefixes of the new ones and are dropped.
+
+Indexes are built CONCURRENTLY so that a live table stays writable.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+INDEXES = {
+    "ix_manga_releases_release_date_id": ["release_date", "id"],
+    "ix_manga_releases_publisher_id_release_date": ["publisher_id", "release_date", "id"],
+    "ix_manga_releases_format_release_date": ["format", "release_date", "id"],
+}
+REPLACED = {
+    "ix_manga_releases_release_date": ["release_date"],
+    "ix_manga_releases_publisher_id": ["publisher_id"],
+}
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES.items():
+            op.create_index(
+                name, "manga_releases", columns, postgresql_concurrently=True, if_not_exists=True
+            )
+        for name in REPLACED:
+            op.drop_index(
+                name, table_name="manga_releases", postgresql_concurrently=True, if_exists=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, columns in REPLACED.items():
+            op.create_index(
+                name, "manga_releases", columns, postgresql_concurrently=True, if_not_exists=True
+            )
+        for name in INDEXES:
+            op.drop_index(
+                name, table_name="manga_releases", postgresql_concurrently=True, if_exists=True
+            )
@@ -0,0 +1,67 @@
+"""Listing snapshots.
+
+- release_listings: each release's position in its month's listing per
+  sort, with the release as the API renders it
+- release_listing_months: the months built, with their release counts
+
+Both start empty; the listing endpoints query live until a commit or sync
+builds the months they serve. Databases that init_db created after
+snapshots were added already have both tables; upgrading them skips them.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("release_listings"):
+        _create_release_listings()
+    if not inspector.has_table("release_listing_months"):
+        op.create_table(
+            "release_listing_months",
+            sa.Column("month", sa.String(length=7), nullable=False),
+            sa.Column("total", sa.Integer(), nullable=False),
+            sa.Column("refreshed_at", sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint("month"),
+        )
+
+
+def _create_release_listings() -> None:
+    op.create_table(
+        "release_listings",
+        sa.Column("month", sa.String(length=7), nullable=False),
+        sa.Column("sort", sa.String(length=20), nullable=False),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("publisher_slug", sa.String(length=200), nullable=False),
+        sa.Column("publisher_position", sa.Integer(), nullable=False),
+        sa.Column("release_id", sa.Integer(), nullable=False),
+        sa.Column("data", sa.JSON(), nullable=False),
+        sa.PrimaryKeyConstraint("month", "sort", "position"),
+    )
+    op.create_index(
+        "uq_release_listings_publisher_position",
+        "release_listings",
+        ["month", "sort", "publisher_slug", "publisher_position"],
+        unique=True,
+    )
+    op.create_index(
+        "ix_release_listings_release", "release_listings", ["month", "sort", "release_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("release_listing_months")
+    op.drop_index("ix_release_listings_release", table_name="release_listings")
+    op.drop_index("uq_release_listings_publisher_position", table_name="release_listings")
+    op.drop_table("release_listings")
@@ -0,0 +1,50 @@
+"""Sync state per source and date window.
+
+- sync_states: each source's incremental sync cursor for one window
+- data_sources.last_modified and etag are dropped; a single watermark per
+  source was shared by syncs over different windows, so a run over one
+  window could skip another window's changes
+
+Existing watermarks are not carried over, since the window they were taken
+over is not known; the next run over each window fetches it in full.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("sync_states"):
+        op.create_table(
+            "sync_states",
+            sa.Column("data_source_id", sa.Integer(), nullable=False),
+            sa.Column("start_date", sa.Date(), nullable=False),
+            sa.Column("end_date", sa.Date(), nullable=False),
+            sa.Column("last_modified", sa.DateTime(), nullable=True),
+            sa.Column("etag", sa.String(length=255), nullable=True),
+            sa.Column("synced_at", sa.DateTime(), nullable=False),
+            sa.ForeignKeyConstraint(["data_source_id"], ["data_sources.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("data_source_id", "start_date", "end_date"),
+        )
+
+    data_source_columns = {column["name"] for column in inspector.get_columns("data_sources")}
+    for column in ("last_modified", "etag"):
+        if column in data_source_columns:
+            op.drop_column("data_sources", column)
+
+
+def downgrade() -> None:
+    op.add_column("data_sources", sa.Column("etag", sa.String(length=255), nullable=True))
+    op.add_column("data_sources", sa.Column("last_modified", sa.DateTime(), nullable=True))
+    op.drop_table("sync_states")
@@ -0,0 +1,51 @@
+"""Response helpers for cached endpoints."""
+import time
+from typing import Optional
+
+from fastapi import Request, Response
+
+from app.services.cache_service import CacheEntry
+from app.config import get_settings
+
+settings = get_settings()
+
+
+def cached_response(request: Request, entry: CacheEntry, ttl: int) -> Response:
+    """Send a cache entry's body as-is, or a 304 if the client already has it.
+
+    ``max-age`` is what is left of the entry's freshness, so browser and CDN
+    copies expire together with ours; ``stale-while-revalidate`` matches the
+    window in which we keep serving the entry while refreshing it.
+    """
+    max_age = max(0, min(ttl, int(entry.soft_expires_at - time.time())))
+    headers = {
+        "ETag": entry.etag,
+        "Cache-Control": (
+            f"public, max-age={max_age}, "
+            f"stale-while-revalidate={int(ttl * settings.CACHE_STALE_FACTOR)}"
+        ),
+    }
+
+    if _etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+
+    return Response(
+        content=entry.body,
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against our ETag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
@@ -1,19 +1,24 @@
 """Metadata API endpoints."""
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.utils.database import get_db
+from app.api.responses import cached_response
+from app.utils.database import get_read_db
 from app.services.release_service import ReleaseService
+from app.config import get_settings
 
+settings = get_settings()
 router = APIRouter()
 
 
 @router.get("/filters")
 async def get_filters(
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Get available filter options for publishers, regions, formats, etc.
     """
     service = ReleaseService(db)
-    return await service.get_metadata_filters()
+    entry = await service.get_metadata_filters()
+    return cached_response(request, entry, settings.CACHE_METADATA)
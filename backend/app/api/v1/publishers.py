@@ -1,20 +1,24 @@
 """Publisher API endpoints."""
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.utils.database import get_db
-from app.repositories.publisher_repository import PublisherRepository
+from app.api.responses import cached_response
+from app.utils.database import get_read_db
+from app.services.release_service import ReleaseService
+from app.config import get_settings
 
+settings = get_settings()
 router = APIRouter()
 
 
 @router.get("")
 async def get_publishers(
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Get all publishers with their release count.
     """
-    repo = PublisherRepository(db)
-    publishers = await repo.get_all_with_release_count()
-    return {"data": publishers}
+    service = ReleaseService(db)
+    entry = await service.get_publishers()
+    return cached_response(request, entry, settings.CACHE_METADATA)
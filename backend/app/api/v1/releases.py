@@ -2,11 +2,13 @@
 from datetime import date
 from typing import Optional
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.utils.database import get_db
+from app.api.responses import cached_response
+from app.utils.database import get_read_db
 from app.services.release_service import ReleaseService
+from app.utils.pagination import InvalidCursorError
 from app.config import get_settings
 
 settings = get_settings()
@@ -15,13 +17,19 @@ router = APIRouter()
 
 @router.get("/current")
 async def get_current_releases(
+    request: Request,
     limit: int = Query(default=100, ge=1, le=settings.MAX_PAGE_SIZE),
     offset: int = Query(default=0, ge=0),
     publisher: Optional[str] = Query(default=None, description="Publisher slug"),
     region: Optional[str] = Query(default=None, description="Region code (us, uk, etc.)"),
     format: Optional[str] = Query(default=None, description="Format (Paperback, Hardcover, etc.)"),
+    genre: Optional[str] = Query(default=None, description="Genre (Action, Romance, etc.)"),
+    demographic: Optional[str] = Query(default=None, description="Demographic (Shonen, Seinen, etc.)"),
     sort: str = Query(default="date", regex="^(date|title|publisher)$"),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(default=None, description="Cursor from meta.next_cursor"),
+    with_total: bool = Query(default=False, description="Count total matches on cursor pages"),
+    fields: str = Query(default="full", regex="^(full|card)$", description="Release fields: full or card"),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Get releases from the current calendar month.
@@ -31,26 +39,44 @@ async def get_current_releases(
     - **publisher**: Filter by publisher slug
     - **region**: Filter by region
     - **format**: Filter by format
+    - **genre**: Filter by genre
+    - **demographic**: Filter by demographic
     - **sort**: Sort by date, title, or publisher
+    - **cursor**: Continue after the page that returned this cursor (replaces offset)
+    - **with_total**: Also count the total on cursor pages (null otherwise)
+    - **fields**: full releases, or compact cards for list views
     """
     service = ReleaseService(db)
-    return await service.get_current_month_releases(
-        limit=limit,
-        offset=offset,
-        publisher=publisher,
-        region=region,
-        format=format,
-        sort=sort,
-    )
+    try:
+        entry = await service.get_current_month_releases(
+            limit=limit,
+            offset=offset,
+            publisher=publisher,
+            region=region,
+            format=format,
+            genre=genre,
+            demographic=demographic,
+            sort=sort,
+            cursor=cursor,
+            with_total=with_total,
+            fields=fields,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return cached_response(request, entry, settings.CACHE_CURRENT_MONTH)
 
 
 @router.get("/upcoming")
 async def get_upcoming_releases(
+    request: Request,
     months: int = Query(default=3, ge=1, le=4),
     publisher: Optional[str] = Query(default=None),
     region: Optional[str] = Query(default=None),
     format: Optional[str] = Query(default=None),
-    db: AsyncSession = Depends(get_db),
+    genre: Optional[str] = Query(default=None),
+    demographic: Optional[str] = Query(default=None),
+    fields: str = Query(default="full", regex="^(full|card)$", description="Release fields: full or card"),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Get upcoming releases from the next 3-4 months, grouped by month.
@@ -59,39 +85,63 @@ async def get_upcoming_releases(
     - **publisher**: Filter by publisher slug
     - **region**: Filter by region
     - **format**: Filter by format
+    - **genre**: Filter by genre
+    - **demographic**: Filter by demographic
+    - **fields**: full releases, or compact cards for list views
     """
     service = ReleaseService(db)
-    return await service.get_upcoming_releases(
+    entry = await service.get_upcoming_releases(
         months=months,
         publisher=publisher,
         region=region,
         format=format,
+        genre=genre,
+        demographic=demographic,
+        fields=fields,
     )
+    return cached_response(request, entry, settings.CACHE_UPCOMING_MONTHS)
 
 
 @router.get("/search")
 async def search_releases(
+    request: Request,
     q: str = Query(..., min_length=1, description="Search query"),
     limit: int = Query(default=50, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
     date_from: Optional[date] = Query(default=None),
     date_to: Optional[date] = Query(default=None),
-    db: AsyncSession = Depends(get_db),
+    sort: str = Query(default="relevance", regex="^(relevance|date)$"),
+    cursor: Optional[str] = Query(default=None, description="Cursor from meta.next_cursor"),
+    with_total: bool = Query(default=False, description="Count total matches on cursor pages"),
+    fields: str = Query(default="full", regex="^(full|card)$", description="Release fields: full or card"),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
-    Search releases by title or series name.
+    Search releases by title, series, author or publisher, with prefix and fuzzy matching.
 
     - **q**: Search query (required)
     - **limit**: Number of results
     - **offset**: Pagination offset
     - **date_from**: Filter by start date
     - **date_to**: Filter by end date
+    - **sort**: Sort by relevance or date (newest first)
+    - **cursor**: Continue after the page that returned this cursor (replaces offset)
+    - **with_total**: Also count the total on cursor pages (null otherwise)
+    - **fields**: full releases, or compact cards for list views
     """
     service = ReleaseService(db)
-    return await service.search_releases(
-        query=q,
-        limit=limit,
-        offset=offset,
-        date_from=date_from,
-        date_to=date_to,
-    )
+    try:
+        entry = await service.search_releases(
+            query=q,
+            limit=limit,
+            offset=offset,
+            date_from=date_from,
+            date_to=date_to,
+            sort=sort,
+            cursor=cursor,
+            with_total=with_total,
+            fields=fields,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return cached_response(request, entry, settings.CACHE_SEARCH)
@@ -1,6 +1,6 @@
 """Application configuration."""
 from functools import lru_cache
-from typing import List
+from typing import Dict, List, Optional
 
 from pydantic_settings import BaseSettings
 
@@ -18,6 +18,15 @@ class Settings(BaseSettings):
     DATABASE_URL: str = "postgresql+asyncpg://manga_user:manga_pass@db:5432/manga_radar"
     DATABASE_POOL_SIZE: int = 5
     DATABASE_MAX_OVERFLOW: int = 10
+    # Read replica for GET endpoints; unset sends reads to DATABASE_URL too
+    DATABASE_REPLICA_URL: Optional[str] = None
+    DATABASE_REPLICA_POOL_SIZE: int = 10
+    DATABASE_REPLICA_MAX_OVERFLOW: int = 20
+    # Reads go to the primary while the replica is further behind than this,
+    # and for this long after a write invalidated cached responses
+    DATABASE_REPLICA_MAX_LAG: float = 5.0  # seconds
+    DATABASE_REPLICA_LAG_CHECK_INTERVAL: float = 2.0  # seconds between lag checks
+    BULK_UPSERT_CHUNK_SIZE: int = 1000  # rows per INSERT ... ON CONFLICT statement
 
     # Redis
     REDIS_URL: str = "redis://redis:6379"
@@ -33,6 +42,16 @@ class Settings(BaseSettings):
     MANGADEX_API_URL: str = "https://api.mangadex.org"
     MANGADEX_RATE_LIMIT: int = 5  # requests per second
 
+    # Source HTTP transport. Requests per second for a source named "foo":
+    # SOURCE_RATE_LIMITS["foo"], else FOO_RATE_LIMIT, else the default
+    SOURCE_RATE_LIMITS: Dict[str, float] = {}
+    SOURCE_DEFAULT_RATE_LIMIT: float = 1.0
+    SOURCE_HTTP_TIMEOUT: float = 30.0
+    SOURCE_MAX_CONNECTIONS_PER_HOST: int = 10
+    SOURCE_MAX_RETRIES: int = 4
+    SOURCE_RETRY_BACKOFF: float = 0.5  # base delay, doubled per attempt
+    SOURCE_RETRY_BACKOFF_MAX: float = 30.0
+
     # Pagination
     DEFAULT_PAGE_SIZE: int = 100
     MAX_PAGE_SIZE: int = 100
@@ -43,10 +62,49 @@ class Settings(BaseSettings):
     CACHE_SEARCH: int = 1800  # 30 minutes
     CACHE_METADATA: int = 86400  # 24 hours
 
+    # Listing snapshots: precomputed pages for the current month and this
+    # many months after it (the furthest /releases/upcoming can reach)
+    LISTING_SNAPSHOTS_ENABLED: bool = True
+    LISTING_SNAPSHOT_MONTHS_AHEAD: int = 4
+
+    # Stale-while-revalidate: entries stay servable for ttl * factor past
+    # their TTL while a background task refreshes them
+    CACHE_STALE_FACTOR: float = 0.5
+    CACHE_XFETCH_BETA: float = 1.0  # > 1 refreshes earlier, < 1 later
+    # Tag generation counters must outlive any computation that reads them
+    CACHE_TAG_GENERATION_TTL: int = 86400  # 24 hours
+
+    # In-process (L1) cache in front of Redis
+    CACHE_L1_ENABLED: bool = True
+    CACHE_L1_MAX_BYTES: int = 64 * 1024 * 1024  # 64 MB per worker
+    CACHE_L1_MAX_TTL: int = 300  # 5 minutes, bounds staleness if an invalidation is missed
+    CACHE_INVALIDATION_CHANNEL: str = "cache:invalidate"
+
+    # Single-flight fill locks for cache misses (seconds)
+    CACHE_LOCK_TIMEOUT: float = 10.0  # lock expiry if the holder dies
+    CACHE_LOCK_WAIT: float = 2.0  # how long other processes wait for the fill
+    CACHE_LOCK_POLL_INTERVAL: float = 0.05
+
+    # Cache warmer: keeps the most requested listing keys computed
+    CACHE_WARM_ENABLED: bool = True
+    CACHE_WARM_KEYS: int = 50  # how many of the most requested keys to keep warm
+    CACHE_WARM_CONCURRENCY: int = 4  # keys recomputed at once
+    CACHE_WARM_INTERVAL: float = 30.0  # seconds between passes
+    CACHE_WARM_MARGIN: float = 120.0  # recompute keys this close to their soft expiry
+    CACHE_WARM_DECAY: float = 0.9  # request counts are multiplied by this every pass
+    CACHE_WARM_STARTUP_TIMEOUT: float = 10.0  # how long startup waits for the first pass
+
     # Background Worker
     ENABLE_WORKER: bool = True
     SYNC_CURRENT_CRON: str = "0 */6 * * *"  # Every 6 hours
     SYNC_UPCOMING_CRON: str = "0 2 * * *"  # Daily at 2 AM
+    SYNC_MAX_CONCURRENT_SOURCES: int = 4
+    SYNC_SOURCE_TIMEOUT: float = 300.0  # seconds to wait for each batch from a source
+    SOURCE_BATCH_SIZE: int = 500  # releases per batch streamed from a source
+    # Store source records' raw payloads zlib-compressed once they reach this size
+    SOURCE_RECORD_COMPRESS: bool = False
+    SOURCE_RECORD_COMPRESS_MIN_BYTES: int = 512
+    SYNC_QUEUE_SIZE: int = 8  # fetched batches waiting to be written
 
     class Config:
         env_file = ".env"
@@ -6,8 +6,10 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import get_settings
 from app.api.v1 import api_router
-from app.utils.database import init_db, close_db
+from app.utils.database import init_db, close_db, pool_metrics, read_router
 from app.services.cache_service import cache_service
+from app.sources.transport import source_transport
+from app.workers.cache_warmer import cache_warmer
 
 settings = get_settings()
 
@@ -18,9 +20,14 @@ async def lifespan(app: FastAPI):
     # Startup
     await init_db()
     await cache_service.connect()
+    if settings.CACHE_WARM_ENABLED:
+        # Serve the most requested pages warm from the first request
+        await cache_warmer.start()
     yield
     # Shutdown
+    await cache_warmer.stop()
     await cache_service.disconnect()
+    await source_transport.close()
     await close_db()
 
 
@@ -38,6 +45,7 @@ app.add_middleware(
     allow_credentials=settings.CORS_ALLOW_CREDENTIALS,
     allow_methods=settings.CORS_ALLOW_METHODS,
     allow_headers=settings.CORS_ALLOW_HEADERS,
+    expose_headers=["ETag"],
 )
 
 # Include API routes
@@ -50,6 +58,16 @@ async def health_check():
     return {"status": "healthy", "version": settings.VERSION}
 
 
+@app.get("/metrics")
+async def metrics():
+    """Cache, read routing and connection pool counters for this worker."""
+    return {
+        "cache": cache_service.get_stats(),
+        "database": read_router.get_stats(),
+        "pools": {name: metrics.get_stats() for name, metrics in pool_metrics.items()},
+    }
+
+
 @app.get("/")
 async def root():
     """Root endpoint."""
@@ -1,5 +1,15 @@
 """Database models."""
 from app.models.publisher import Publisher
 from app.models.release import MangaRelease, SourceRecord
+from app.models.data_source import DataSource, SyncState
+from app.models.release_listing import ReleaseListing, ReleaseListingMonth
 
-__all__ = ["Publisher", "MangaRelease", "SourceRecord"]
+__all__ = [
+    "Publisher",
+    "MangaRelease",
+    "SourceRecord",
+    "DataSource",
+    "SyncState",
+    "ReleaseListing",
+    "ReleaseListingMonth",
+]
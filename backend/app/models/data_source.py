@@ -0,0 +1,53 @@
+"""Data source models."""
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Boolean, Date, DateTime, ForeignKey, JSON
+
+from app.utils.database import Base
+
+
+class DataSource(Base):
+    """A source synced by the worker."""
+
+    __tablename__ = "data_sources"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(100), nullable=False, unique=True)
+    slug = Column(String(100), nullable=False, unique=True, index=True)
+    source_type = Column(String(50), nullable=True)  # api, scraper, etc.
+    is_active = Column(Boolean, default=True, nullable=False)
+    priority = Column(Integer, default=100, nullable=False)  # Lower = higher priority
+    config = Column(JSON, nullable=True)
+    last_sync_at = Column(DateTime, nullable=True)  # last completed run, over any window
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<DataSource(id={self.id}, name='{self.name}')>"
+
+
+class SyncState(Base):
+    """Where the last completed sync of a source over one date window left off.
+
+    A watermark only covers the window it was taken over: a run over another
+    window must not skip changes it never fetched, so each (source, window)
+    keeps its own.
+    """
+
+    __tablename__ = "sync_states"
+
+    data_source_id = Column(
+        Integer, ForeignKey("data_sources.id", ondelete="CASCADE"), primary_key=True
+    )
+    start_date = Column(Date, primary_key=True)
+    end_date = Column(Date, primary_key=True)
+    # Newest modification time seen, and the source's validator for its
+    # last full response
+    last_modified = Column(DateTime, nullable=True)
+    etag = Column(String(255), nullable=True)
+    synced_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self) -> str:
+        return (
+            f"<SyncState(data_source_id={self.data_source_id}, "
+            f"window={self.start_date}..{self.end_date})>"
+        )
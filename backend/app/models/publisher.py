@@ -1,6 +1,6 @@
 """Publisher model."""
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, Index
 from sqlalchemy.orm import relationship
 
 from app.utils.database import Base
@@ -10,6 +10,14 @@ class Publisher(Base):
     """Publisher model."""
 
     __tablename__ = "publishers"
+    __table_args__ = (
+        Index(
+            "ix_publishers_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(200), nullable=False, unique=True)
@@ -1,15 +1,54 @@
 """Release models."""
 from datetime import datetime, date
-from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Numeric, Text, JSON
+from typing import Optional
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Numeric, Text, JSON, Computed, Index, LargeBinary
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 from sqlalchemy.orm import relationship
 
 from app.utils.database import Base
+from app.utils.serialization import decompress
+from app.utils.search import SEARCH_CONFIG
 
 
 class MangaRelease(Base):
     """Manga release model."""
 
     __tablename__ = "manga_releases"
+    __table_args__ = (
+        Index("ix_manga_releases_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_manga_releases_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_manga_releases_series_name_trgm",
+            "series_name",
+            postgresql_using="gin",
+            postgresql_ops={"series_name": "gin_trgm_ops"},
+        ),
+        # jsonb_path_ops serves the @> containment filters, at a fraction of
+        # the default operator class's size
+        Index(
+            "ix_manga_releases_regions",
+            "regions",
+            postgresql_using="gin",
+            postgresql_ops={"regions": "jsonb_path_ops"},
+        ),
+        Index(
+            "ix_manga_releases_genres",
+            "genres",
+            postgresql_using="gin",
+            postgresql_ops={"genres": "jsonb_path_ops"},
+        ),
+        Index("ix_manga_releases_demographic_release_date", "demographic", "release_date"),
+        # Listings page through a month in (release_date, id) order, alone or
+        # within one publisher or format
+        Index("ix_manga_releases_release_date_id", "release_date", "id"),
+        Index("ix_manga_releases_publisher_id_release_date", "publisher_id", "release_date", "id"),
+        Index("ix_manga_releases_format_release_date", "format", "release_date", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(500), nullable=False, index=True)
@@ -17,8 +56,8 @@ class MangaRelease(Base):
     volume_number = Column(String(50), nullable=True)
     isbn_13 = Column(String(13), nullable=True, unique=True, index=True)
     isbn_10 = Column(String(10), nullable=True)
-    release_date = Column(Date, nullable=False, index=True)
-    publisher_id = Column(Integer, ForeignKey("publishers.id"), nullable=False, index=True)
+    release_date = Column(Date, nullable=False)
+    publisher_id = Column(Integer, ForeignKey("publishers.id"), nullable=False)
     format = Column(String(50), nullable=True)  # Paperback, Hardcover, etc.
     page_count = Column(Integer, nullable=True)
     price_usd = Column(Numeric(8, 2), nullable=True)
@@ -26,14 +65,27 @@ class MangaRelease(Base):
     cover_image_url = Column(Text, nullable=True)
     description = Column(Text, nullable=True)
     demographic = Column(String(50), nullable=True)  # Shonen, Shojo, Seinen, Josei
-    genres = Column(JSON, nullable=True)  # List of genres
-    regions = Column(JSON, nullable=True)  # List of regions (us, uk, etc.)
-    authors = Column(JSON, nullable=True)  # List of authors
-    illustrators = Column(JSON, nullable=True)  # List of illustrators
+    genres = Column(JSONB, nullable=True)  # List of genres
+    regions = Column(JSONB, nullable=True)  # List of regions (us, uk, etc.)
+    authors = Column(JSONB, nullable=True)  # List of authors
+    illustrators = Column(JSONB, nullable=True)  # List of illustrators
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     source_metadata = Column(JSON, nullable=True)  # Additional metadata from sources
 
+    # Full-text document; publisher names live in another table and are
+    # matched separately, since generated columns cannot reference them.
+    search_vector = Column(
+        TSVECTOR,
+        Computed(
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(series_name, '')), 'A') || "
+            f"setweight(jsonb_to_tsvector('{SEARCH_CONFIG}', coalesce(authors, '[]'::jsonb), "
+            f"'[\"string\"]'), 'B')",
+            persisted=True,
+        ),
+    )
+
     # Relationships
     publisher = relationship("Publisher", back_populates="releases")
     source_records = relationship("SourceRecord", back_populates="manga_release", cascade="all, delete-orphan")
@@ -46,6 +98,9 @@ class SourceRecord(Base):
     """Source record for tracking external data sources."""
 
     __tablename__ = "source_records"
+    __table_args__ = (
+        Index("uq_source_records_source_external", "source_name", "external_id", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     manga_release_id = Column(Integer, ForeignKey("manga_releases.id"), nullable=False, index=True)
@@ -53,11 +108,20 @@ class SourceRecord(Base):
     external_id = Column(String(255), nullable=False)
     source_url = Column(Text, nullable=True)
     raw_data = Column(JSON, nullable=True)
+    raw_data_compressed = Column(LargeBinary, nullable=True)  # zlib JSON, instead of raw_data
+    content_hash = Column(String(64), nullable=True)  # of the record as fetched
     fetched_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     # Relationships
     manga_release = relationship("MangaRelease", back_populates="source_records")
 
+    @property
+    def payload(self) -> Optional[dict]:
+        """The raw data as fetched, whichever way it was stored."""
+        if self.raw_data_compressed is not None:
+            return decompress(self.raw_data_compressed)
+        return self.raw_data
+
     def __repr__(self) -> str:
         return f"<SourceRecord(id={self.id}, source='{self.source_name}', external_id='{self.external_id}')>"
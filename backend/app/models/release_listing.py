@@ -0,0 +1,53 @@
+"""Listing snapshot models."""
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Index
+
+from app.utils.database import Base
+
+
+class ReleaseListing(Base):
+    """One release's place in a month's listing, in one sort order.
+
+    Rows are rebuilt from manga_releases whenever a commit touches their
+    month (see ``ListingSnapshotRepository``). ``data`` is the release as
+    the API returns it, so a page is read without a join or a sort.
+    """
+
+    __tablename__ = "release_listings"
+    __table_args__ = (
+        # Pages within one publisher are a contiguous range too
+        Index(
+            "uq_release_listings_publisher_position",
+            "month",
+            "sort",
+            "publisher_slug",
+            "publisher_position",
+            unique=True,
+        ),
+        # Where a cursor's release sits
+        Index("ix_release_listings_release", "month", "sort", "release_id"),
+    )
+
+    month = Column(String(7), primary_key=True)  # YYYY-MM
+    sort = Column(String(20), primary_key=True)  # date, title or publisher
+    position = Column(Integer, primary_key=True)  # 1-based within the month
+    publisher_slug = Column(String(200), nullable=False)
+    publisher_position = Column(Integer, nullable=False)  # 1-based within month and publisher
+    release_id = Column(Integer, nullable=False)
+    data = Column(JSON, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<ReleaseListing(month='{self.month}', sort='{self.sort}', position={self.position})>"
+
+
+class ReleaseListingMonth(Base):
+    """A month whose listing snapshot has been built."""
+
+    __tablename__ = "release_listing_months"
+
+    month = Column(String(7), primary_key=True)  # YYYY-MM
+    total = Column(Integer, nullable=False)
+    refreshed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<ReleaseListingMonth(month='{self.month}', total={self.total})>"
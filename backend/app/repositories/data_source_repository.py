@@ -0,0 +1,72 @@
+"""Data source repository."""
+from datetime import date, datetime
+from typing import Any, Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import DataSource, SyncState
+from app.repositories.base import BaseRepository
+
+
+class DataSourceRepository(BaseRepository[DataSource]):
+    """Repository for data sources and their sync state."""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(DataSource, db)
+
+    async def get_by_name(self, name: str) -> Optional[DataSource]:
+        """Get data source by name."""
+        result = await self.db.execute(
+            select(DataSource).where(DataSource.name == name)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_or_create(self, name: str, slug: str, **kwargs: Any) -> DataSource:
+        """Get existing data source or create a new one."""
+        existing = await self.get_by_name(name)
+        if existing:
+            return existing
+
+        return await self.create(name=name, slug=slug, **kwargs)
+
+    async def get_sync_state(
+        self,
+        data_source_id: int,
+        start_date: date,
+        end_date: date,
+    ) -> Optional[SyncState]:
+        """Where the last completed sync of a source over a window left off."""
+        return await self.db.get(SyncState, (data_source_id, start_date, end_date))
+
+    async def save_sync_state(
+        self,
+        data_source_id: int,
+        start_date: date,
+        end_date: date,
+        last_modified: Optional[datetime],
+        etag: Optional[str],
+    ) -> None:
+        """Record where a completed sync of a source over a window left off."""
+        synced_at = datetime.utcnow()
+        stmt = pg_insert(SyncState).values(
+            data_source_id=data_source_id,
+            start_date=start_date,
+            end_date=end_date,
+            last_modified=last_modified,
+            etag=etag,
+            synced_at=synced_at,
+        )
+        await self.db.execute(stmt.on_conflict_do_update(
+            index_elements=[SyncState.data_source_id, SyncState.start_date, SyncState.end_date],
+            set_={
+                "last_modified": stmt.excluded.last_modified,
+                "etag": stmt.excluded.etag,
+                "synced_at": stmt.excluded.synced_at,
+            },
+        ))
+        data_source = await self.get(data_source_id)
+        if data_source is not None:
+            data_source.last_sync_at = synced_at
+        await self.db.flush()
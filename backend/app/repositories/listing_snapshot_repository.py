@@ -0,0 +1,266 @@
+"""Listing snapshot repository."""
+from calendar import monthrange
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Float, cast, delete, func, insert, literal, or_, select
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import MangaRelease, Publisher, ReleaseListing, ReleaseListingMonth
+from app.utils.cache_tags import month_key, upcoming_month_keys
+from app.config import get_settings
+
+settings = get_settings()
+
+# Order of each listing sort, as ReleaseRepository applies it
+SORT_KEYS = {
+    "date": MangaRelease.release_date,
+    "title": MangaRelease.title,
+    "publisher": Publisher.name,
+}
+# Serializes rebuilds, so two commits cannot interleave their rows
+REFRESH_LOCK_KEY = 7_210_021
+
+
+class ListingSnapshotRepository:
+    """Precomputed listing pages for the months the listing endpoints serve.
+
+    Every release from the current month to LISTING_SNAPSHOT_MONTHS_AHEAD
+    months after it has one ``release_listings`` row per sort, numbered in
+    that sort's order. A page is then a contiguous range of positions read
+    from the primary key, or from the per-publisher index. Reads return
+    None for months that are not built, and callers query live instead.
+    """
+
+    def __init__(self, db: AsyncSession):
+        """Initialize repository."""
+        self.db = db
+
+    async def get_page(
+        self,
+        month: str,
+        sort: str,
+        *,
+        limit: int,
+        offset: int = 0,
+        publisher_slug: Optional[str] = None,
+        after: Optional[Tuple[Any, int]] = None,
+        include_total: bool = True,
+    ) -> Optional[Tuple[List[Dict[str, Any]], Optional[int]]]:
+        """One page of a month's listing, as release dicts, and the total.
+
+        ``after`` continues from the position of the release it names. It
+        returns None, like an unbuilt month, if that release is not in the
+        listing any more.
+        """
+        month_total = await self._month_totals([month])
+        if month_total is None:
+            return None
+
+        position = ReleaseListing.publisher_position if publisher_slug else ReleaseListing.position
+        conditions = [ReleaseListing.month == month, ReleaseListing.sort == sort]
+        if publisher_slug:
+            conditions.append(ReleaseListing.publisher_slug == publisher_slug)
+
+        start = offset
+        if after is not None:
+            start = (await self.db.execute(
+                select(position).where(*conditions, ReleaseListing.release_id == after[1])
+            )).scalar()
+            if start is None:
+                return None
+
+        result = await self.db.execute(
+            select(ReleaseListing.data)
+            .where(*conditions, position > start, position <= start + limit)
+            .order_by(position)
+        )
+        releases = list(result.scalars().all())
+
+        total = None
+        if include_total:
+            if publisher_slug:
+                total = await self._publisher_totals([month], publisher_slug)
+                total = total.get(month, 0)
+            else:
+                total = month_total[month]
+        return releases, total
+
+    async def get_upcoming(
+        self,
+        months: List[str],
+        limit_per_month: int = 100,
+        publisher_slug: Optional[str] = None,
+    ) -> Optional[Tuple[Dict[str, List[Dict[str, Any]]], Dict[str, int]]]:
+        """The first releases of each month by date, and each month's total."""
+        totals = await self._month_totals(months)
+        if totals is None:
+            return None
+
+        position = ReleaseListing.publisher_position if publisher_slug else ReleaseListing.position
+        conditions = [
+            ReleaseListing.month.in_(months),
+            ReleaseListing.sort == "date",
+            position <= limit_per_month,
+        ]
+        if publisher_slug:
+            conditions.append(ReleaseListing.publisher_slug == publisher_slug)
+            totals = dict.fromkeys(months, 0)
+            totals.update(await self._publisher_totals(months, publisher_slug))
+
+        result = await self.db.execute(
+            select(ReleaseListing.month, ReleaseListing.data)
+            .where(*conditions)
+            .order_by(ReleaseListing.month, position)
+        )
+        releases: Dict[str, List[Dict[str, Any]]] = {month: [] for month in months}
+        for month, data in result.all():
+            releases[month].append(data)
+        return releases, totals
+
+    async def refresh(self, months: Iterable[str]) -> List[str]:
+        """Rebuild the snapshots of these months; returns the months rebuilt.
+
+        Months outside the snapshot window are ignored, months in it that are
+        not built yet are added, and built months that have fallen out of it
+        are dropped. Runs in the session's transaction, which the caller
+        commits.
+        """
+        window = snapshot_months()
+        built = set((await self.db.execute(select(ReleaseListingMonth.month))).scalars().all())
+        rebuilt = sorted((set(months) | (set(window) - built)) & set(window))
+        dropped = built - set(window)
+        if not rebuilt and not dropped:
+            return []
+
+        await self.db.execute(select(func.pg_advisory_xact_lock(REFRESH_LOCK_KEY)))
+        await self._delete(rebuilt + sorted(dropped))
+        if not rebuilt:
+            return []
+
+        month = func.to_char(MangaRelease.release_date, "YYYY-MM")
+        in_months = or_(*(
+            MangaRelease.release_date.between(*_month_bounds(key)) for key in rebuilt
+        ))
+        for sort, key in SORT_KEYS.items():
+            order = (key, MangaRelease.id)
+            rows = (
+                select(
+                    month,
+                    literal(sort),
+                    func.row_number().over(partition_by=month, order_by=order),
+                    Publisher.slug,
+                    func.row_number().over(partition_by=(month, Publisher.slug), order_by=order),
+                    MangaRelease.id,
+                    _release_json(),
+                )
+                .select_from(MangaRelease)
+                .join(Publisher, MangaRelease.publisher_id == Publisher.id)
+                .where(in_months)
+            )
+            await self.db.execute(
+                insert(ReleaseListing).from_select(
+                    ["month", "sort", "position", "publisher_slug", "publisher_position", "release_id", "data"],
+                    rows,
+                )
+            )
+
+        result = await self.db.execute(
+            select(ReleaseListing.month, func.max(ReleaseListing.position))
+            .where(ReleaseListing.month.in_(rebuilt), ReleaseListing.sort == "date")
+            .group_by(ReleaseListing.month)
+        )
+        totals = dict(result.all())
+        now = datetime.utcnow()
+        await self.db.execute(insert(ReleaseListingMonth), [
+            {"month": key, "total": totals.get(key, 0), "refreshed_at": now} for key in rebuilt
+        ])
+        return rebuilt
+
+    async def mark_stale(self, months: Iterable[str]) -> None:
+        """Stop serving these months' snapshots until the next ``refresh``."""
+        months = sorted(set(months) & set(snapshot_months()))
+        if not months:
+            return
+        await self.db.execute(select(func.pg_advisory_xact_lock(REFRESH_LOCK_KEY)))
+        await self.db.execute(delete(ReleaseListingMonth).where(ReleaseListingMonth.month.in_(months)))
+
+    async def _delete(self, months: List[str]) -> None:
+        """Remove months' snapshot rows and markers."""
+        if not months:
+            return
+        await self.db.execute(delete(ReleaseListing).where(ReleaseListing.month.in_(months)))
+        await self.db.execute(delete(ReleaseListingMonth).where(ReleaseListingMonth.month.in_(months)))
+
+    async def _month_totals(self, months: List[str]) -> Optional[Dict[str, int]]:
+        """Release count of each month, or None unless all of them are built."""
+        result = await self.db.execute(
+            select(ReleaseListingMonth.month, ReleaseListingMonth.total)
+            .where(ReleaseListingMonth.month.in_(months))
+        )
+        totals = dict(result.all())
+        if set(totals) != set(months):
+            return None
+        return totals
+
+    async def _publisher_totals(self, months: List[str], publisher_slug: str) -> Dict[str, int]:
+        """A publisher's release count in each month, from its last position."""
+        result = await self.db.execute(
+            select(ReleaseListing.month, func.max(ReleaseListing.publisher_position))
+            .where(
+                ReleaseListing.month.in_(months),
+                ReleaseListing.sort == "date",
+                ReleaseListing.publisher_slug == publisher_slug,
+            )
+            .group_by(ReleaseListing.month)
+        )
+        return dict(result.all())
+
+
+def snapshot_months(today: Optional[date] = None) -> List[str]:
+    """The ``YYYY-MM`` months kept as snapshots: this one and those ahead."""
+    today = today or date.today()
+    return [month_key(today)] + upcoming_month_keys(settings.LISTING_SNAPSHOT_MONTHS_AHEAD, today)
+
+
+def _month_bounds(key: str) -> Tuple[date, date]:
+    """First and last day of a ``YYYY-MM`` month."""
+    year, month = (int(part) for part in key.split("-"))
+    return date(year, month, 1), date(year, month, monthrange(year, month)[1])
+
+
+def _release_json():
+    """A release and its publisher as ReleaseService._row_to_schema renders them."""
+    empty = cast("[]", JSONB)
+
+    def price(column):
+        # float(price) if price else None
+        return func.nullif(cast(column, Float), 0)
+
+    return func.json_build_object(
+        "id", MangaRelease.id,
+        "title", MangaRelease.title,
+        "series_name", MangaRelease.series_name,
+        "volume_number", MangaRelease.volume_number,
+        "isbn_13", MangaRelease.isbn_13,
+        "isbn_10", MangaRelease.isbn_10,
+        "release_date", MangaRelease.release_date,
+        "publisher", func.json_build_object(
+            "id", Publisher.id,
+            "name", Publisher.name,
+            "slug", Publisher.slug,
+            "country", Publisher.country,
+        ),
+        "format", MangaRelease.format,
+        "page_count", MangaRelease.page_count,
+        "price_usd", price(MangaRelease.price_usd),
+        "price_gbp", price(MangaRelease.price_gbp),
+        "cover_image_url", MangaRelease.cover_image_url,
+        "description", MangaRelease.description,
+        "demographic", MangaRelease.demographic,
+        "genres", func.coalesce(MangaRelease.genres, empty),
+        "regions", func.coalesce(MangaRelease.regions, empty),
+        "authors", func.coalesce(MangaRelease.authors, empty),
+        "illustrators", func.coalesce(MangaRelease.illustrators, empty),
+    )
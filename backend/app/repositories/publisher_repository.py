@@ -1,11 +1,12 @@
 """Publisher repository."""
-from typing import List, Optional
+from typing import Any, List, Optional
 
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import Publisher, MangaRelease
 from app.repositories.base import BaseRepository
+from app.utils.cache_tags import PUBLISHERS_TAG, record_tags
 
 
 class PublisherRepository(BaseRepository[Publisher]):
@@ -14,6 +15,12 @@ class PublisherRepository(BaseRepository[Publisher]):
     def __init__(self, db: AsyncSession):
         super().__init__(Publisher, db)
 
+    async def create(self, **kwargs: Any) -> Publisher:
+        """Create a publisher and record that publisher lists changed."""
+        publisher = await super().create(**kwargs)
+        record_tags(self.db, [PUBLISHERS_TAG])
+        return publisher
+
     async def get_by_slug(self, slug: str) -> Optional[Publisher]:
         """Get publisher by slug."""
         result = await self.db.execute(
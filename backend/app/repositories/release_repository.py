@@ -1,14 +1,31 @@
 """Release repository."""
 from datetime import date, datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable, Iterator, Set, Tuple
 from calendar import monthrange
 
-from sqlalchemy import select, func, and_, or_, extract
+from sqlalchemy import Integer, Row, any_, select, func, and_, or_, extract, literal, literal_column, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import MangaRelease, Publisher
 from app.repositories.base import BaseRepository
+from app.schemas.release import RELEASE_FIELDS
+from app.utils.cache_tags import (
+    PUBLISHERS_TAG,
+    SEARCH_TAG,
+    month_key,
+    month_tag,
+    record_tags,
+    upcoming_month_keys,
+)
+from app.utils.search import SEARCH_CONFIG, prefix_tsquery
+from app.config import get_settings
+
+settings = get_settings()
+
+# Publisher columns a release projection carries, labelled publisher_<column>
+PUBLISHER_COLUMNS = ("id", "name", "slug", "country")
 
 
 class ReleaseRepository(BaseRepository[MangaRelease]):
@@ -25,9 +42,14 @@ class ReleaseRepository(BaseRepository[MangaRelease]):
         publisher_slug: Optional[str] = None,
         region: Optional[str] = None,
         format: Optional[str] = None,
+        genre: Optional[str] = None,
+        demographic: Optional[str] = None,
         sort_by: str = "date",
-    ) -> tuple[List[MangaRelease], int]:
-        """Get releases from the current calendar month."""
+        after: Optional[Tuple[Any, int]] = None,
+        include_total: bool = True,
+        fields: str = "full",
+    ) -> tuple[List[Row], Optional[int]]:
+        """Get releases from the current calendar month, as ``fields`` rows."""
         today = date.today()
         first_day = date(today.year, today.month, 1)
         last_day = date(today.year, today.month, monthrange(today.year, today.month)[1])
@@ -40,7 +62,12 @@ class ReleaseRepository(BaseRepository[MangaRelease]):
             publisher_slug=publisher_slug,
             region=region,
             format=format,
+            genre=genre,
+            demographic=demographic,
             sort_by=sort_by,
+            after=after,
+            include_total=include_total,
+            fields=fields,
         )
 
     async def get_upcoming_releases(
@@ -51,38 +78,70 @@ class ReleaseRepository(BaseRepository[MangaRelease]):
         publisher_slug: Optional[str] = None,
         region: Optional[str] = None,
         format: Optional[str] = None,
-    ) -> Dict[str, List[MangaRelease]]:
-        """Get releases from upcoming months, grouped by month."""
-        today = date.today()
-        results = {}
-
-        for month_offset in range(1, months + 1):
-            # Calculate the target month
-            target_month = today.month + month_offset
-            target_year = today.year
-
-            while target_month > 12:
-                target_month -= 12
-                target_year += 1
-
-            first_day = date(target_year, target_month, 1)
-            last_day = date(target_year, target_month, monthrange(target_year, target_month)[1])
-
-            releases, _ = await self._get_releases_in_range(
-                start_date=first_day,
-                end_date=last_day,
-                limit=limit_per_month,
-                offset=0,
-                publisher_slug=publisher_slug,
-                region=region,
-                format=format,
-                sort_by="date",
-            )
+        genre: Optional[str] = None,
+        demographic: Optional[str] = None,
+        fields: str = "full",
+    ) -> tuple[Dict[str, List[Row]], Dict[str, int]]:
+        """Get releases from upcoming months, grouped by month, as ``fields`` rows.
+
+        One windowed query ranks releases within each month and carries the
+        per-month total alongside, so the cost is a single round trip no
+        matter how many months are requested. The window reads the rows'
+        columns itself, so the table is scanned once through the date index
+        rather than joined back by id. Returns the releases and the total
+        per month, both keyed by ``YYYY-MM``.
+        """
+        month_keys = [
+            tuple(int(part) for part in key.split("-"))
+            for key in upcoming_month_keys(months)
+        ]
+
+        first_year, first_month = month_keys[0]
+        last_year, last_month = month_keys[-1]
+        conditions = self._filter_conditions(
+            start_date=date(first_year, first_month, 1),
+            end_date=date(last_year, last_month, monthrange(last_year, last_month)[1]),
+            publisher_slug=publisher_slug,
+            region=region,
+            format=format,
+            genre=genre,
+            demographic=demographic,
+        )
+
+        month = func.date_trunc("month", MangaRelease.release_date)
+        release_fields = [name for name in RELEASE_FIELDS[fields] if name != "publisher"]
+        ranked = select(
+            *release_columns(release_fields),
+            MangaRelease.publisher_id,
+            func.row_number().over(
+                partition_by=month,
+                order_by=(MangaRelease.release_date, MangaRelease.id),
+            ).label("month_rank"),
+            func.count().over(partition_by=month).label("month_total"),
+        )
+        if publisher_slug:
+            ranked = ranked.join(Publisher)
+        ranked = ranked.where(and_(*conditions)).subquery()
+
+        # Join the publisher inline so the whole response stays a single statement
+        stmt = (
+            select(*release_columns(RELEASE_FIELDS[fields], ranked.c), ranked.c.month_total)
+            .join(Publisher, Publisher.id == ranked.c.publisher_id)
+            .where(ranked.c.month_rank <= limit_per_month)
+            .order_by(ranked.c.release_date, ranked.c.id)
+        )
+        result = await self.db.execute(stmt)
 
-            month_key = f"{target_year}-{target_month:02d}"
-            results[month_key] = releases
+        results: Dict[str, List[Row]] = {
+            f"{year}-{month:02d}": [] for year, month in month_keys
+        }
+        totals: Dict[str, int] = dict.fromkeys(results, 0)
+        for release in result.all():
+            release_month = month_key(release.release_date)
+            results[release_month].append(release)
+            totals[release_month] = release.month_total
 
-        return results
+        return results, totals
 
     async def search_releases(
         self,
@@ -92,41 +151,81 @@ class ReleaseRepository(BaseRepository[MangaRelease]):
         offset: int = 0,
         date_from: Optional[date] = None,
         date_to: Optional[date] = None,
-    ) -> tuple[List[MangaRelease], int]:
-        """Search releases by title or series name."""
-        stmt = select(MangaRelease).options(selectinload(MangaRelease.publisher))
-
+        sort_by: str = "relevance",
+        after: Optional[Tuple[Any, int]] = None,
+        include_total: bool = True,
+        fields: str = "full",
+    ) -> tuple[List[Row], Optional[int]]:
+        """Search releases by title, series, author or publisher, as ``fields`` rows.
+
+        A release matches when its ``search_vector`` contains every query word
+        as a prefix, when the query is trigram-similar to a word run in the
+        title or series (typos), or when its publisher's name is. Matching
+        publishers are looked up first and filtered as ``publisher_id =
+        ANY(ids)``, since an IN subquery under the OR would become a SubPlan
+        filter; that way every branch is an index scan under one BitmapOr. ``relevance`` sorts by ``ts_rank_cd`` plus
+        title similarity, ``date`` newest first; both are tie-broken on ``id``
+        and ``after`` seeks past a ``(sort key, id)`` keyset tuple. Relevance
+        sorted rows carry their rank as ``relevance``.
+        """
         # Build search conditions
         search_conditions = []
+        relevance = None
         if query:
-            search_term = f"%{query.lower()}%"
-            search_conditions.append(
-                or_(
-                    func.lower(MangaRelease.title).like(search_term),
-                    func.lower(MangaRelease.series_name).like(search_term),
-                )
-            )
+            matches = [
+                MangaRelease.title.op("%>")(query),
+                MangaRelease.series_name.op("%>")(query),
+            ]
+            publisher_ids = (
+                await self.db.execute(select(Publisher.id).where(Publisher.name.op("%>")(query)))
+            ).scalars().all()
+            if publisher_ids:
+                ids = literal(list(publisher_ids), ARRAY(Integer))
+                matches.append(MangaRelease.publisher_id == any_(ids))
+            relevance = func.word_similarity(query, MangaRelease.title)
+
+            tsquery_text = prefix_tsquery(query)
+            if tsquery_text:
+                tsquery = func.to_tsquery(SEARCH_CONFIG, tsquery_text)
+                matches.append(MangaRelease.search_vector.op("@@")(tsquery))
+                relevance = relevance + func.ts_rank_cd(MangaRelease.search_vector, tsquery)
+
+            search_conditions.append(or_(*matches))
 
         if date_from:
             search_conditions.append(MangaRelease.release_date >= date_from)
         if date_to:
             search_conditions.append(MangaRelease.release_date <= date_to)
 
+        stmt = select(*release_columns(RELEASE_FIELDS[fields])).join(Publisher)
         if search_conditions:
             stmt = stmt.where(and_(*search_conditions))
 
         # Count total
-        count_stmt = select(func.count()).select_from(MangaRelease)
-        if search_conditions:
-            count_stmt = count_stmt.where(and_(*search_conditions))
-        count_result = await self.db.execute(count_stmt)
-        total = count_result.scalar_one()
+        total = None
+        if include_total:
+            count_stmt = select(func.count()).select_from(MangaRelease)
+            if search_conditions:
+                count_stmt = count_stmt.where(and_(*search_conditions))
+            count_result = await self.db.execute(count_stmt)
+            total = count_result.scalar_one()
+
+        # Apply sorting
+        if sort_by == "relevance" and relevance is not None:
+            stmt = stmt.add_columns(relevance.label("relevance"))
+            sort_key = relevance
+        else:
+            sort_key = MangaRelease.release_date
+        stmt = stmt.order_by(sort_key.desc(), MangaRelease.id.desc())
 
         # Get paginated results
-        stmt = stmt.order_by(MangaRelease.release_date.desc())
-        stmt = stmt.offset(offset).limit(limit)
+        if after is not None:
+            stmt = stmt.where(tuple_(sort_key, MangaRelease.id) < tuple_(*after))
+        else:
+            stmt = stmt.offset(offset)
+        stmt = stmt.limit(limit)
         result = await self.db.execute(stmt)
-        releases = list(result.scalars().all())
+        releases = list(result.all())
 
         return releases, total
 
@@ -140,56 +239,103 @@ class ReleaseRepository(BaseRepository[MangaRelease]):
         publisher_slug: Optional[str] = None,
         region: Optional[str] = None,
         format: Optional[str] = None,
+        genre: Optional[str] = None,
+        demographic: Optional[str] = None,
         sort_by: str = "date",
-    ) -> tuple[List[MangaRelease], int]:
-        """Get releases in a date range with filters."""
-        stmt = select(MangaRelease).options(selectinload(MangaRelease.publisher))
-
-        # Build where conditions
-        conditions = [
-            MangaRelease.release_date >= start_date,
-            MangaRelease.release_date <= end_date,
-        ]
-
-        if publisher_slug:
-            stmt = stmt.join(Publisher)
-            conditions.append(Publisher.slug == publisher_slug)
-
-        if region:
-            # Check if region is in the JSON array
-            conditions.append(
-                func.jsonb_contains(MangaRelease.regions, f'["{region}"]')
-            )
-
-        if format:
-            conditions.append(MangaRelease.format == format)
-
+        after: Optional[Tuple[Any, int]] = None,
+        include_total: bool = True,
+        fields: str = "full",
+    ) -> tuple[List[Row], Optional[int]]:
+        """Get releases in a date range with filters.
+
+        Every sort mode is tie-broken on ``id`` so it can be paged by keyset:
+        when ``after`` holds the ``(sort key, id)`` of the previous page's last
+        row, the query seeks past it instead of applying ``offset``, and the
+        count query only runs if ``include_total`` is set.
+
+        Only the columns of the ``fields`` set are read, with the publisher
+        joined inline, and rows are returned as they come: no second query
+        for publishers and no model instances to build and track.
+        """
+        stmt = select(*release_columns(RELEASE_FIELDS[fields])).join(Publisher)
+
+        conditions = self._filter_conditions(
+            start_date=start_date,
+            end_date=end_date,
+            publisher_slug=publisher_slug,
+            region=region,
+            format=format,
+            genre=genre,
+            demographic=demographic,
+        )
         stmt = stmt.where(and_(*conditions))
 
         # Count total
-        count_stmt = select(func.count()).select_from(MangaRelease)
-        if publisher_slug:
-            count_stmt = count_stmt.join(Publisher)
-        count_stmt = count_stmt.where(and_(*conditions))
-        count_result = await self.db.execute(count_stmt)
-        total = count_result.scalar_one()
+        total = None
+        if include_total:
+            count_stmt = select(func.count()).select_from(MangaRelease)
+            if publisher_slug:
+                count_stmt = count_stmt.join(Publisher)
+            count_stmt = count_stmt.where(and_(*conditions))
+            count_result = await self.db.execute(count_stmt)
+            total = count_result.scalar_one()
 
         # Apply sorting
         if sort_by == "title":
-            stmt = stmt.order_by(MangaRelease.title)
+            sort_key = MangaRelease.title
         elif sort_by == "publisher":
-            stmt = stmt.join(Publisher).order_by(Publisher.name)
+            sort_key = Publisher.name
         else:  # default to date
-            stmt = stmt.order_by(MangaRelease.release_date)
+            sort_key = MangaRelease.release_date
+        stmt = stmt.order_by(sort_key, MangaRelease.id)
 
         # Apply pagination
-        stmt = stmt.offset(offset).limit(limit)
+        if after is not None:
+            stmt = stmt.where(tuple_(sort_key, MangaRelease.id) > tuple_(*after))
+        else:
+            stmt = stmt.offset(offset)
+        stmt = stmt.limit(limit)
 
         result = await self.db.execute(stmt)
-        releases = list(result.scalars().all())
+        releases = list(result.all())
 
         return releases, total
 
+    def _filter_conditions(
+        self,
+        *,
+        start_date: date,
+        end_date: date,
+        publisher_slug: Optional[str] = None,
+        region: Optional[str] = None,
+        format: Optional[str] = None,
+        genre: Optional[str] = None,
+        demographic: Optional[str] = None,
+    ) -> list:
+        """Build listing where conditions; callers join Publisher when filtering by slug."""
+        conditions = [
+            MangaRelease.release_date >= start_date,
+            MangaRelease.release_date <= end_date,
+        ]
+
+        if publisher_slug:
+            conditions.append(Publisher.slug == publisher_slug)
+
+        # Containment (@>) on the JSONB arrays is served by their GIN indexes
+        if region:
+            conditions.append(MangaRelease.regions.contains([region]))
+
+        if genre:
+            conditions.append(MangaRelease.genres.contains([genre]))
+
+        if demographic:
+            conditions.append(MangaRelease.demographic == demographic)
+
+        if format:
+            conditions.append(MangaRelease.format == format)
+
+        return conditions
+
     async def get_by_isbn(self, isbn_13: str) -> Optional[MangaRelease]:
         """Get release by ISBN-13."""
         result = await self.db.execute(
@@ -199,27 +345,221 @@ class ReleaseRepository(BaseRepository[MangaRelease]):
         )
         return result.scalar_one_or_none()
 
-    async def bulk_upsert(self, releases_data: List[Dict[str, Any]]) -> Dict[str, int]:
-        """Bulk upsert releases."""
+    async def create(self, **kwargs: Any) -> MangaRelease:
+        """Create a release and record the cache tags it affects."""
+        release = await super().create(**kwargs)
+        await self._record_write_tags(
+            [(release.release_date, release.publisher_id)], changes_counts=True
+        )
+        return release
+
+    async def update(self, id: int, **kwargs: Any) -> Optional[MangaRelease]:
+        """Update a release and record the cache tags of its old and new placement."""
+        before = await self._placements(MangaRelease.id == id)
+        release = await super().update(id, **kwargs)
+        after = await self._placements(MangaRelease.id == id)
+        if after:
+            await self._record_write_tags(before + after, changes_counts=before[0][1] != after[0][1])
+        return release
+
+    async def delete(self, id: int) -> bool:
+        """Delete a release and record the cache tags it affected."""
+        before = await self._placements(MangaRelease.id == id)
+        deleted = await super().delete(id)
+        if deleted:
+            await self._record_write_tags(before, changes_counts=True)
+        return deleted
+
+    async def bulk_upsert(self, releases_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Bulk upsert releases.
+
+        Rows with the ``id`` of a known release are merged on the primary key
+        with one ``INSERT ... ON CONFLICT (id) DO UPDATE`` per chunk, taking
+        the row's ISBN-13 if it brings one, and ``RETURNING (xmax = 0)`` tells
+        inserted rows apart from updated ones. Other rows carrying an ISBN-13,
+        and rows whose ISBN another release already holds, are merged on
+        ``isbn_13`` the same way. The rest have nothing to conflict on and are
+        inserted in plain multi-row batches.
+
+        The months and publishers of both the incoming rows and the rows
+        they replace are recorded as cache tags on the session.
+
+        Returns the ``created`` and ``updated`` counts, and ``ids``: the id of
+        the release each input row ended up in, in input order.
+        """
         created = 0
         updated = 0
 
+        # A statement cannot touch the same row twice, so repeated keys are
+        # folded here and counted as updates of the first.
+        keyed: Dict[str, Dict[str, Any]] = {}
+        by_id: Dict[int, Dict[str, Any]] = {}
+        unkeyed: List[Dict[str, Any]] = []
         for release_data in releases_data:
+            release_id = release_data.get("id")
             isbn = release_data.get("isbn_13")
-            if isbn:
-                existing = await self.get_by_isbn(isbn)
-                if existing:
-                    # Update
-                    await self.update(existing.id, **release_data)
+            if release_id:
+                if release_id in by_id:
                     updated += 1
-                else:
-                    # Create
-                    await self.create(**release_data)
-                    created += 1
+                by_id[release_id] = {**by_id.get(release_id, {}), **release_data}
+            elif isbn:
+                if isbn in keyed:
+                    updated += 1
+                keyed[isbn] = {**keyed.get(isbn, {}), **release_data}
             else:
-                # No ISBN, just create
-                await self.create(**release_data)
-                created += 1
+                unkeyed.append(release_data)
+
+        # An ISBN can only move to a release if no other release holds it;
+        # otherwise the row is merged into the one that does
+        isbn_owners: Dict[str, int] = {}
+        by_id_isbns = [row["isbn_13"] for row in by_id.values() if row.get("isbn_13")]
+        for chunk in _chunks(by_id_isbns, settings.BULK_UPSERT_CHUNK_SIZE):
+            result = await self.db.execute(
+                select(MangaRelease.isbn_13, MangaRelease.id)
+                .where(MangaRelease.isbn_13.in_(chunk))
+            )
+            isbn_owners.update(result.all())
+        for release_id, row in list(by_id.items()):
+            isbn = row.get("isbn_13")
+            if not isbn:
+                continue
+            if isbn_owners.setdefault(isbn, release_id) != release_id:
+                del by_id[release_id]
+                if isbn in keyed:
+                    updated += 1
+                keyed[isbn] = {**keyed.get(isbn, {}), **row}
+        for row in keyed.values():
+            row.pop("id", None)
+
+        # Where updated rows sit now, so listings they move out of are dropped too
+        placements = []
+        for chunk in _chunks(list(keyed), settings.BULK_UPSERT_CHUNK_SIZE):
+            placements += await self._placements(MangaRelease.isbn_13.in_(chunk))
+        for chunk in _chunks(list(by_id), settings.BULK_UPSERT_CHUNK_SIZE):
+            placements += await self._placements(MangaRelease.id.in_(chunk))
+        for release_data in releases_data:
+            if release_data.get("release_date") and release_data.get("publisher_id"):
+                placements.append((release_data["release_date"], release_data["publisher_id"]))
+
+        table = MangaRelease.__table__
+        isbn_ids: Dict[str, int] = {}
+        # By id first, so ISBN rows folding into a release that just took
+        # their ISBN update it rather than conflict with it
+        for conflict_column, rows_by_key in (("id", by_id), ("isbn_13", keyed)):
+            for columns, rows in _group_by_columns(rows_by_key.values()).items():
+                stmt = pg_insert(table)
+                set_ = {
+                    column: stmt.excluded[column]
+                    for column in columns
+                    if column not in ("id", "isbn_13", "created_at")
+                }
+                if conflict_column == "id" and "isbn_13" in columns:
+                    # A row without an ISBN keeps the one already stored
+                    set_["isbn_13"] = func.coalesce(stmt.excluded.isbn_13, table.c.isbn_13)
+                set_["updated_at"] = stmt.excluded.updated_at
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[table.c[conflict_column]],
+                    set_=set_,
+                ).returning(table.c.id, table.c.isbn_13, literal_column("xmax = 0").label("inserted"))
+
+                # The statement is compiled once; SQLAlchemy's insertmanyvalues
+                # renders each chunk as a single multi-row VALUES list.
+                for chunk in _chunks(rows, settings.BULK_UPSERT_CHUNK_SIZE):
+                    result = await self.db.execute(stmt, chunk)
+                    for release_id, isbn, inserted in result.all():
+                        if isbn:
+                            isbn_ids[isbn] = release_id
+                        if inserted:
+                            created += 1
+                        else:
+                            updated += 1
+
+        # Grouping reorders rows, so inserted ids are matched back by identity
+        unkeyed_ids: Dict[int, int] = {}
+        for columns, rows in _group_by_columns(unkeyed).items():
+            stmt = pg_insert(table).returning(table.c.id, sort_by_parameter_order=True)
+            for chunk in _chunks(rows, settings.BULK_UPSERT_CHUNK_SIZE):
+                result = await self.db.execute(stmt, chunk)
+                for row, release_id in zip(chunk, result.scalars().all()):
+                    unkeyed_ids[id(row)] = release_id
+                created += len(chunk)
+
+        ids = [
+            isbn_ids.get(release_data["isbn_13"]) if release_data.get("isbn_13")
+            else release_data.get("id") or unkeyed_ids.get(id(release_data))
+            for release_data in releases_data
+        ]
 
         await self.db.flush()
-        return {"created": created, "updated": updated}
+        if created or updated:
+            await self._record_write_tags(placements, changes_counts=created > 0)
+        return {"created": created, "updated": updated, "ids": ids}
+
+    async def _placements(self, condition) -> List[Tuple[date, int]]:
+        """The (release date, publisher id) of existing releases matching a condition."""
+        result = await self.db.execute(
+            select(MangaRelease.release_date, MangaRelease.publisher_id).where(condition)
+        )
+        return [tuple(row) for row in result.all()]
+
+    async def _record_write_tags(
+        self,
+        placements: Iterable[Tuple[date, int]],
+        changes_counts: bool = False,
+    ) -> None:
+        """Record the cache tags touched by writing releases with these placements.
+
+        Every write changes search results; only inserts and deletes change
+        publisher release counts.
+        """
+        placements = set(placements)
+        tags: Set[str] = {SEARCH_TAG}
+        if changes_counts:
+            tags.add(PUBLISHERS_TAG)
+
+        publisher_ids = {publisher_id for _, publisher_id in placements}
+        slugs: Dict[int, str] = {}
+        if publisher_ids:
+            result = await self.db.execute(
+                select(Publisher.id, Publisher.slug).where(Publisher.id.in_(publisher_ids))
+            )
+            slugs = dict(result.all())
+
+        for release_date, publisher_id in placements:
+            month = month_key(release_date)
+            tags.add(month_tag(month))
+            if publisher_id in slugs:
+                tags.add(month_tag(month, slugs[publisher_id]))
+
+        record_tags(self.db, tags)
+
+
+def release_columns(fields: Iterable[str], source=MangaRelease) -> list:
+    """Columns rendering these release fields; the publisher's are labelled ``publisher_*``.
+
+    ``source`` is MangaRelease, or the columns of a subquery selecting them.
+    Callers join Publisher.
+    """
+    columns = []
+    for name in fields:
+        if name == "publisher":
+            columns.extend(
+                getattr(Publisher, column).label(f"publisher_{column}") for column in PUBLISHER_COLUMNS
+            )
+        else:
+            columns.append(getattr(source, name))
+    return columns
+
+
+def _group_by_columns(rows: Iterable[Dict[str, Any]]) -> Dict[Tuple[str, ...], List[Dict[str, Any]]]:
+    """Group rows by their key set so each multi-row VALUES list is uniform."""
+    groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+    for row in rows:
+        groups.setdefault(tuple(sorted(row)), []).append(row)
+    return groups
+
+
+def _chunks(rows: List[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Split rows into consecutive chunks of at most ``size``."""
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
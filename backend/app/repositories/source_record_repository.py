@@ -0,0 +1,97 @@
+"""Source record repository."""
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import SourceRecord
+from app.repositories.base import BaseRepository
+from app.utils.serialization import compress, dumps
+from app.config import get_settings
+
+settings = get_settings()
+
+
+class SourceRecordRepository(BaseRepository[SourceRecord]):
+    """Repository for per-source records of releases."""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(SourceRecord, db)
+
+    async def get_known(
+        self,
+        source_name: str,
+        external_ids: Iterable[str],
+    ) -> Dict[str, Tuple[Optional[str], int]]:
+        """Content hash and release id of a source's records, by external id."""
+        external_ids = list(external_ids)
+        known: Dict[str, Tuple[Optional[str], int]] = {}
+        for start in range(0, len(external_ids), settings.BULK_UPSERT_CHUNK_SIZE):
+            result = await self.db.execute(
+                select(
+                    SourceRecord.external_id,
+                    SourceRecord.content_hash,
+                    SourceRecord.manga_release_id,
+                ).where(
+                    SourceRecord.source_name == source_name,
+                    SourceRecord.external_id.in_(
+                        external_ids[start:start + settings.BULK_UPSERT_CHUNK_SIZE]
+                    ),
+                )
+            )
+            for external_id, content_hash, release_id in result.all():
+                known[external_id] = (content_hash, release_id)
+        return known
+
+    async def bulk_upsert(self, records: List[Dict[str, Any]]) -> int:
+        """Insert or refresh source records, keyed on (source_name, external_id).
+
+        Rows need every column that is written on conflict: manga_release_id,
+        source_url, raw_data and content_hash. With SOURCE_RECORD_COMPRESS on,
+        large payloads are moved from raw_data to raw_data_compressed.
+        """
+        if not records:
+            return 0
+
+        # Later duplicates win, as a statement cannot touch a row twice
+        fetched_at = datetime.utcnow()
+        rows = list({
+            (record["source_name"], record["external_id"]): _payload_columns(
+                {"fetched_at": fetched_at, **record}
+            )
+            for record in records
+        }.values())
+
+        table = SourceRecord.__table__
+        stmt = pg_insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.source_name, table.c.external_id],
+            set_={
+                "manga_release_id": stmt.excluded.manga_release_id,
+                "source_url": stmt.excluded.source_url,
+                "raw_data": stmt.excluded.raw_data,
+                "raw_data_compressed": stmt.excluded.raw_data_compressed,
+                "content_hash": stmt.excluded.content_hash,
+                "fetched_at": stmt.excluded.fetched_at,
+            },
+        )
+        for start in range(0, len(rows), settings.BULK_UPSERT_CHUNK_SIZE):
+            await self.db.execute(stmt, rows[start:start + settings.BULK_UPSERT_CHUNK_SIZE])
+        await self.db.flush()
+        return len(rows)
+
+
+def _payload_columns(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Store a row's raw_data plain or compressed, clearing the other column."""
+    raw_data = row.get("raw_data")
+    row["raw_data_compressed"] = None
+    if (
+        settings.SOURCE_RECORD_COMPRESS
+        and raw_data
+        and len(dumps(raw_data)) >= settings.SOURCE_RECORD_COMPRESS_MIN_BYTES
+    ):
+        row["raw_data_compressed"] = compress(raw_data)
+        row["raw_data"] = None
+    return row
@@ -2,6 +2,8 @@
 from app.schemas.release import (
     PublisherSchema,
     MangaReleaseSchema,
+    MangaReleaseCardSchema,
+    RELEASE_FIELDS,
     MangaReleaseListResponse,
     UpcomingReleasesResponse,
     SearchResponse,
@@ -11,6 +13,8 @@ from app.schemas.release import (
 __all__ = [
     "PublisherSchema",
     "MangaReleaseSchema",
+    "MangaReleaseCardSchema",
+    "RELEASE_FIELDS",
     "MangaReleaseListResponse",
     "UpcomingReleasesResponse",
     "SearchResponse",
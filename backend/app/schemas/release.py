@@ -1,6 +1,6 @@
 """Release schemas."""
 from datetime import date
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Union
 from decimal import Decimal
 
 from pydantic import BaseModel, Field
@@ -45,6 +45,33 @@ class MangaReleaseSchema(BaseModel):
         from_attributes = True
 
 
+class MangaReleaseCardSchema(BaseModel):
+    """Compact manga release for list views (``fields=card``)."""
+
+    id: int
+    title: str
+    series_name: Optional[str] = None
+    volume_number: Optional[str] = None
+    isbn_13: Optional[str] = None
+    release_date: date
+    publisher: PublisherSchema
+    format: Optional[str] = None
+    price_usd: Optional[Decimal] = None
+    price_gbp: Optional[Decimal] = None
+    cover_image_url: Optional[str] = None
+    demographic: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+# Release fields each ``fields`` option renders, in response order
+RELEASE_FIELDS = {
+    "full": tuple(MangaReleaseSchema.model_fields),
+    "card": tuple(MangaReleaseCardSchema.model_fields),
+}
+
+
 class PaginationMeta(BaseModel):
     """Pagination metadata."""
 
@@ -56,21 +83,21 @@ class PaginationMeta(BaseModel):
 class MangaReleaseListResponse(BaseModel):
     """Response for current month releases."""
 
-    data: List[MangaReleaseSchema]
+    data: List[Union[MangaReleaseSchema, MangaReleaseCardSchema]]
     meta: Dict
 
 
 class UpcomingReleasesResponse(BaseModel):
     """Response for upcoming releases grouped by month."""
 
-    data: Dict[str, List[MangaReleaseSchema]]
+    data: Dict[str, List[Union[MangaReleaseSchema, MangaReleaseCardSchema]]]
     meta: Dict
 
 
 class SearchResponse(BaseModel):
     """Response for search results."""
 
-    data: List[MangaReleaseSchema]
+    data: List[Union[MangaReleaseSchema, MangaReleaseCardSchema]]
     meta: Dict
 
 
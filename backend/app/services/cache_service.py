@@ -1,67 +1,373 @@
 """Cache service using Redis."""
+import asyncio
+import hashlib
 import json
-from typing import Optional, Any
+import math
+import random
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from typing import Optional, Any, Awaitable, Callable, Dict, Iterable, List, Tuple
 
 import redis.asyncio as redis
 
 from app.config import get_settings
+from app.services.local_cache import LocalCache
+from app.utils.serialization import dumps, loads
 
 settings = get_settings()
 
+# Requests per cache key (a sorted set) and how to rebuild each key (a hash)
+REQUEST_COUNTS_KEY = "cache:requests"
+REQUEST_SPECS_KEY = "cache:request_specs"
+
+# Delete the lock only if this caller still owns it
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+# Delete every key in the given tag sets, and the sets themselves, in one
+# step so no key can be tagged in between, and bump each tag's generation.
+# KEYS are the tag sets then their generation counters; returns the deleted
+# keys.
+INVALIDATE_TAGS_SCRIPT = """
+local tags = #KEYS / 2
+local keys = {}
+for i = 1, tags do
+    for _, key in ipairs(redis.call("smembers", KEYS[i])) do
+        table.insert(keys, key)
+    end
+    redis.call("del", KEYS[i])
+    redis.call("incr", KEYS[tags + i])
+    redis.call("expire", KEYS[tags + i], ARGV[1])
+end
+for i = 1, #keys, 1000 do
+    redis.call("del", unpack(keys, i, math.min(i + 999, #keys)))
+end
+return keys
+"""
+
+# Store an entry and add it to its tag sets, unless a tag was invalidated
+# since the entry's data was read. KEYS are the entry, its tag sets, then
+# their generation counters; ARGV the hard TTL, the entry's fields, and the
+# generations read before computing it (none to store unconditionally).
+# Returns 1 if stored.
+STORE_SCRIPT = """
+local tags = (#KEYS - 1) / 2
+if #ARGV > 5 then
+    for i = 1, tags do
+        if (redis.call("get", KEYS[1 + tags + i]) or "0") ~= ARGV[5 + i] then
+            return 0
+        end
+    end
+end
+-- DEL first so a key of another type cannot block the HSET
+redis.call("del", KEYS[1])
+redis.call("hset", KEYS[1], "body", ARGV[2], "etag", ARGV[3], "soft_expires_at", ARGV[4], "delta", ARGV[5])
+redis.call("expire", KEYS[1], ARGV[1])
+for i = 1, tags do
+    -- A tag set lives as long as its longest-lived key
+    redis.call("sadd", KEYS[1 + i], KEYS[1])
+    redis.call("expire", KEYS[1 + i], ARGV[1], "NX")
+    redis.call("expire", KEYS[1 + i], ARGV[1], "GT")
+end
+return 1
+"""
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    """A cached value in its final serialized form."""
+
+    body: bytes  # JSON document, ready to send as a response body
+    etag: str  # quoted strong validator derived from body
+    soft_expires_at: float  # epoch seconds after which the entry is stale
+    delta: float  # seconds it took to compute
+
+    @classmethod
+    def build(cls, value: Any, ttl: int, delta: float = 0.0) -> "CacheEntry":
+        """Serialize a value once and hash it."""
+        body = dumps(value)
+        etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+        return cls(body=body, etag=etag, soft_expires_at=time.time() + ttl, delta=delta)
+
 
 class CacheService:
-    """Redis cache service."""
+    """Redis cache service with an in-process L1 tier.
+
+    Reads check the local LRU first and only fall through to Redis on a
+    miss. Local copies never outlive the Redis key they were read from, and
+    deletes are broadcast on a pub/sub channel so every worker drops its
+    copy. ``get_or_set`` coalesces concurrent misses for the same key.
+
+    Values are serialized once, when stored, and kept as CacheEntry bytes
+    (a Redis hash of body, etag, soft expiry and compute time), so a hit
+    hands back a ready response body without decoding it. The TTL passed
+    to ``set`` is the soft expiry; the Redis key outlives it by
+    CACHE_STALE_FACTOR x TTL so ``get_or_set`` can keep serving the stale
+    entry while a background task refreshes it.
+
+    Entries can be stored with tags naming the data they were built from.
+    Each tag is a Redis set of the keys carrying it, so ``invalidate_tags``
+    deletes exactly the dependent keys without scanning the keyspace. Each
+    tag also has a generation counter that invalidation bumps; computed
+    entries are only stored if their tags' generations are unchanged since
+    before the computation read its data, so a computation that overlaps a
+    write cannot cache the rows the write replaced.
+
+    Requests for keys worth keeping warm are counted in process with
+    ``count_request`` and flushed to a shared Redis sorted set, which the
+    cache warmer reads back with ``hot_keys``.
+    """
 
     def __init__(self):
         """Initialize cache service."""
         self.redis_client: Optional[redis.Redis] = None
+        self.local: Optional[LocalCache] = (
+            LocalCache(settings.CACHE_L1_MAX_BYTES) if settings.CACHE_L1_ENABLED else None
+        )
+        self._pubsub = None
+        self._listener: Optional[asyncio.Task] = None
+        # In-flight computations by cache key, shared by concurrent misses
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # Background stale-while-revalidate refreshes by cache key
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self.stats: Counter = Counter()
+        # Requests since the last flush, and how to rebuild each key
+        self._request_counts: Counter = Counter()
+        self._request_specs: Dict[str, Dict[str, Any]] = {}
+        # When this worker last dropped keys for a write, here or in another
+        # worker (monotonic seconds); read routing avoids a lagging replica
+        # for a while after it
+        self.last_invalidated_at = float("-inf")
 
     async def connect(self):
-        """Connect to Redis."""
+        """Connect to Redis and start listening for invalidations."""
         self.redis_client = await redis.from_url(
             settings.REDIS_URL,
-            encoding="utf-8",
-            decode_responses=True,
+            decode_responses=False,
         )
 
+        # Invalidations drop local copies, and tell read routing a write just
+        # happened, so every worker listens whether or not it has an L1 tier
+        try:
+            self._pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+            await self._pubsub.subscribe(settings.CACHE_INVALIDATION_CHANNEL)
+            self._listener = asyncio.create_task(self._listen_for_invalidations())
+        except Exception as e:
+            # Without the channel, local copies could go stale unnoticed
+            print(f"Cache subscribe error: {e}")
+            self.local = None
+
     async def disconnect(self):
         """Disconnect from Redis."""
+        for task in list(self._refreshing.values()):
+            task.cancel()
+        if self._listener:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+        if self._pubsub:
+            await self._pubsub.close()
         if self.redis_client:
             await self.redis_client.close()
 
     async def get(self, key: str) -> Optional[Any]:
-        """Get value from cache."""
-        if not self.redis_client:
+        """Get value from cache, stale or not, until its hard expiry."""
+        entry, tier = await self._lookup(key)
+        self.stats[tier] += 1
+        return loads(entry.body) if entry is not None else None
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: int = 3600,
+        delta: float = 0.0,
+        tags: Iterable[str] = (),
+    ) -> bool:
+        """Set value in cache with TTL (in seconds).
+
+        ``delta`` is how long the value took to compute; it scales how early
+        ``get_or_set`` starts refreshing it. ``tags`` let ``invalidate_tags``
+        find the key again.
+        """
+        entry = CacheEntry.build(value, ttl, delta)
+        return await self._store(key, entry, ttl, tags) is not None
+
+    async def get_or_set(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: int = 3600,
+        refresh: Optional[Callable[[], Awaitable[Any]]] = None,
+        tags: Iterable[str] = (),
+    ) -> CacheEntry:
+        """Get a serialized entry from cache, computing and storing it on a miss.
+
+        Concurrent misses for the same key run ``compute`` once: callers in
+        this process share one task, and other processes wait on a short
+        Redis lock for the winner to fill the key, computing themselves only
+        if it does not appear within CACHE_LOCK_WAIT seconds.
+
+        Hits past their soft expiry are still returned immediately, and a
+        background task recomputes them with ``refresh``. The refresh may
+        also start before the soft expiry, with a probability that rises as
+        the expiry nears and with the value's compute time (XFetch), so hot
+        keys are normally renewed before anyone sees them stale. Without
+        ``refresh``, stale entries are recomputed inline. Stored entries are
+        tagged with ``tags``.
+
+        ``compute`` runs in a task shared by every waiter, and ``refresh`` in
+        the background; both can outlive the caller, so neither may depend
+        on its request state (such as its database session).
+        """
+        tags = tuple(tags)
+        entry, tier = await self._lookup(key)
+        self.stats[tier] += 1
+        if entry is not None:
+            stale = time.time() >= entry.soft_expires_at
+            if refresh is not None and self._should_refresh(entry):
+                self.stats["stale_served" if stale else "early_refreshes"] += 1
+                self._schedule_refresh(key, refresh, ttl, tags)
+                return entry
+            if not stale:
+                return entry
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._compute_once(key, compute, ttl, tags))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.stats["coalesced_local"] += 1
+
+        # Shielded so one caller's cancellation does not fail the others
+        return await asyncio.shield(task)
+
+    async def warm(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: int = 3600,
+        tags: Iterable[str] = (),
+    ) -> Optional[CacheEntry]:
+        """Recompute and store a key now, whether or not it is cached.
+
+        Returns None without computing if another caller holds the key's
+        fill lock, since it is already being filled.
+        """
+        lock_key = f"lock:{key}"
+        token = uuid.uuid4().hex
+        if not await self._acquire_lock(lock_key, token):
             return None
 
         try:
-            value = await self.redis_client.get(key)
-            if value:
-                return json.loads(value)
-        except Exception as e:
-            print(f"Cache get error: {e}")
-        return None
+            self.stats["warmed"] += 1
+            tags = tuple(tags)
+            generations = await self._tag_generations(tags)
+            started = time.monotonic()
+            entry = CacheEntry.build(await compute(), ttl, delta=time.monotonic() - started)
+            await self._store(key, entry, ttl, tags, generations)
+            return entry
+        finally:
+            await self._release_lock(lock_key, token)
 
-    async def set(self, key: str, value: Any, ttl: int = 3600) -> bool:
-        """Set value in cache with TTL (in seconds)."""
+    def count_request(self, key: str, spec: Dict[str, Any]) -> None:
+        """Count a request for a key; ``spec`` says how to rebuild it."""
+        self._request_counts[key] += 1
+        self._request_specs[key] = spec
+
+    async def flush_request_counts(self, decay: float = 1.0) -> int:
+        """Add the counted requests to the shared counts; returns keys flushed.
+
+        Shared counts are multiplied by ``decay`` first, so keys nobody asks
+        for any more sink, and are forgotten once they fall below a half.
+        """
+        counts, specs = self._request_counts, self._request_specs
+        self._request_counts, self._request_specs = Counter(), {}
         if not self.redis_client:
-            return False
+            return 0
 
         try:
-            serialized = json.dumps(value, default=str)
-            await self.redis_client.setex(key, ttl, serialized)
-            return True
+            if decay < 1.0:
+                await self.redis_client.zunionstore(
+                    REQUEST_COUNTS_KEY, {REQUEST_COUNTS_KEY: decay}
+                )
+                forgotten = await self.redis_client.zrangebyscore(REQUEST_COUNTS_KEY, 0, "(0.5")
+                if forgotten:
+                    async with self.redis_client.pipeline(transaction=False) as pipe:
+                        pipe.zrem(REQUEST_COUNTS_KEY, *forgotten)
+                        pipe.hdel(REQUEST_SPECS_KEY, *forgotten)
+                        await pipe.execute()
+            if counts:
+                async with self.redis_client.pipeline(transaction=False) as pipe:
+                    for key, count in counts.items():
+                        pipe.zincrby(REQUEST_COUNTS_KEY, count, key)
+                    pipe.hset(REQUEST_SPECS_KEY, mapping={
+                        key: json.dumps(spec) for key, spec in specs.items()
+                    })
+                    await pipe.execute()
         except Exception as e:
-            print(f"Cache set error: {e}")
-            return False
+            print(f"Cache request count error: {e}")
+            return 0
+        return len(counts)
+
+    async def hot_keys(self, limit: int) -> List[Tuple[str, Dict[str, Any], Optional[float]]]:
+        """The most requested keys, with their specs and soft expiry.
+
+        The soft expiry is None for keys that are not cached right now.
+        """
+        if not self.redis_client or limit <= 0:
+            return []
+
+        try:
+            keys = await self.redis_client.zrevrange(REQUEST_COUNTS_KEY, 0, limit - 1)
+            if not keys:
+                return []
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.hmget(REQUEST_SPECS_KEY, keys)
+                for key in keys:
+                    pipe.hget(key, "soft_expires_at")
+                specs, *expiries = await pipe.execute()
+        except Exception as e:
+            print(f"Cache hot keys error: {e}")
+            return []
+
+        return [
+            (key.decode(), json.loads(spec), float(expiry) if expiry else None)
+            for key, spec, expiry in zip(keys, specs, expiries)
+            if spec
+        ]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit, miss and coalescing counters."""
+        stats = dict(self.stats)
+        stats["inflight"] = len(self._inflight)
+        stats["refreshing"] = len(self._refreshing)
+        if self.local is not None:
+            stats["l1_entries"] = len(self.local)
+            stats["l1_bytes"] = self.local.current_bytes
+        return stats
 
     async def delete(self, key: str) -> bool:
         """Delete key from cache."""
+        self.last_invalidated_at = time.monotonic()
+        if self.local is not None:
+            self.local.delete(key)
+
         if not self.redis_client:
             return False
 
         try:
             await self.redis_client.delete(key)
+            await self._publish_invalidation({"key": key})
             return True
         except Exception as e:
             print(f"Cache delete error: {e}")
@@ -69,10 +375,16 @@ class CacheService:
 
     async def invalidate_pattern(self, pattern: str) -> int:
         """Invalidate all keys matching a pattern."""
+        self.last_invalidated_at = time.monotonic()
+        if self.local is not None:
+            self.local.delete_matching(pattern)
+
         if not self.redis_client:
             return 0
 
         try:
+            await self._publish_invalidation({"pattern": pattern})
+
             keys = []
             async for key in self.redis_client.scan_iter(match=pattern):
                 keys.append(key)
@@ -83,6 +395,282 @@ class CacheService:
             print(f"Cache invalidate error: {e}")
         return 0
 
+    async def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """Delete every key stored with any of the given tags."""
+        tags = set(tags)
+        tag_keys = [self._tag_key(tag) for tag in tags]
+        if tag_keys:
+            self.last_invalidated_at = time.monotonic()
+        if not tag_keys or not self.redis_client:
+            return 0
+
+        try:
+            keys = [
+                key.decode()
+                for key in await self.redis_client.eval(
+                    INVALIDATE_TAGS_SCRIPT,
+                    2 * len(tag_keys),
+                    *tag_keys,
+                    *[self._generation_key(tag) for tag in tags],
+                    settings.CACHE_TAG_GENERATION_TTL,
+                )
+            ]
+            if self.local is not None:
+                for key in keys:
+                    self.local.delete(key)
+            await self._publish_invalidation({"keys": keys})
+            self.stats["tag_invalidated_keys"] += len(keys)
+            return len(keys)
+        except Exception as e:
+            print(f"Cache tag invalidate error: {e}")
+            return 0
+
+    async def _lookup(self, key: str) -> Tuple[Optional[CacheEntry], str]:
+        """Read an entry through both tiers, reporting which one answered."""
+        if self.local is not None:
+            entry = self.local.get(key)
+            if entry is not None:
+                return entry, "l1_hits"
+
+        if not self.redis_client:
+            return None, "misses"
+
+        try:
+            # Read the remaining TTL in the same round trip so a local copy
+            # expires no later than the Redis key.
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.hgetall(key)
+                pipe.pttl(key)
+                fields, ttl_ms = await pipe.execute()
+            if fields:
+                entry = CacheEntry(
+                    body=fields[b"body"],
+                    etag=fields[b"etag"].decode(),
+                    soft_expires_at=float(fields[b"soft_expires_at"]),
+                    delta=float(fields[b"delta"]),
+                )
+                if ttl_ms and ttl_ms > 0:
+                    self._set_local(key, entry, ttl_ms / 1000)
+                return entry, "redis_hits"
+        except Exception as e:
+            print(f"Cache get error: {e}")
+        return None, "misses"
+
+    async def _store(
+        self,
+        key: str,
+        entry: CacheEntry,
+        ttl: int,
+        tags: Iterable[str] = (),
+        generations: Optional[List[str]] = None,
+    ) -> Optional[CacheEntry]:
+        """Write an entry to both tiers; returns None if Redis is unavailable.
+
+        With ``generations`` (from ``_tag_generations``), the entry is only
+        written if none of its tags has been invalidated since; otherwise it
+        is dropped and None returned.
+        """
+        if not self.redis_client:
+            return None
+
+        tags = tuple(tags)
+        try:
+            hard_ttl = ttl + int(ttl * settings.CACHE_STALE_FACTOR)
+            stored = await self.redis_client.eval(
+                STORE_SCRIPT,
+                1 + 2 * len(tags),
+                key,
+                *[self._tag_key(tag) for tag in tags],
+                *[self._generation_key(tag) for tag in tags],
+                hard_ttl,
+                entry.body,
+                entry.etag,
+                repr(entry.soft_expires_at),
+                repr(entry.delta),
+                *(generations or ()),
+            )
+            if not stored:
+                self.stats["stores_superseded"] += 1
+                return None
+            self._set_local(key, entry, hard_ttl)
+            return entry
+        except Exception as e:
+            print(f"Cache set error: {e}")
+            return None
+
+    async def _tag_generations(self, tags: Tuple[str, ...]) -> Optional[List[str]]:
+        """Current generations of some tags, to read before computing an entry."""
+        if not tags or not self.redis_client:
+            return None
+
+        try:
+            values = await self.redis_client.mget([self._generation_key(tag) for tag in tags])
+        except Exception as e:
+            print(f"Cache tag generation error: {e}")
+            return None
+        return [value.decode() if value else "0" for value in values]
+
+    async def _compute_once(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: int,
+        tags: Tuple[str, ...] = (),
+    ) -> CacheEntry:
+        """Compute and cache a value under a cross-process lock."""
+        lock_key = f"lock:{key}"
+        token = uuid.uuid4().hex
+        acquired = await self._acquire_lock(lock_key, token)
+        if not acquired:
+            value = await self._wait_for_fill(key)
+            if value is not None:
+                self.stats["coalesced_remote"] += 1
+                return value
+            self.stats["lock_wait_timeouts"] += 1
+
+        try:
+            self.stats["computed"] += 1
+            generations = await self._tag_generations(tags)
+            started = time.monotonic()
+            value = await compute()
+            entry = CacheEntry.build(value, ttl, delta=time.monotonic() - started)
+            # Callers get the entry even if it could not be stored
+            await self._store(key, entry, ttl, tags, generations)
+            return entry
+        finally:
+            if acquired:
+                await self._release_lock(lock_key, token)
+
+    def _should_refresh(self, entry: CacheEntry) -> bool:
+        """XFetch: refresh once now - delta * beta * ln(rand) passes the soft expiry."""
+        jitter = -math.log(1.0 - random.random())  # exponential, mean 1
+        early_by = entry.delta * settings.CACHE_XFETCH_BETA * jitter
+        return time.time() + early_by >= entry.soft_expires_at
+
+    def _schedule_refresh(
+        self,
+        key: str,
+        refresh: Callable[[], Awaitable[Any]],
+        ttl: int,
+        tags: Tuple[str, ...] = (),
+    ) -> None:
+        """Start a background refresh of a key unless one is already running here."""
+        if key in self._refreshing:
+            return
+        task = asyncio.create_task(self._refresh(key, refresh, ttl, tags))
+        self._refreshing[key] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+
+    async def _refresh(
+        self,
+        key: str,
+        refresh: Callable[[], Awaitable[Any]],
+        ttl: int,
+        tags: Tuple[str, ...] = (),
+    ) -> None:
+        """Recompute a key in the background; another process's refresh wins."""
+        lock_key = f"lock:{key}"
+        token = uuid.uuid4().hex
+        if not await self._acquire_lock(lock_key, token):
+            return
+
+        try:
+            # Another worker may have refreshed Redis while our L1 copy aged
+            if self.local is not None and self.redis_client:
+                self.local.delete(key)
+                entry, _ = await self._lookup(key)
+                if entry is not None and not self._should_refresh(entry):
+                    return
+
+            self.stats["refreshed"] += 1
+            generations = await self._tag_generations(tags)
+            started = time.monotonic()
+            value = await refresh()
+            entry = CacheEntry.build(value, ttl, delta=time.monotonic() - started)
+            await self._store(key, entry, ttl, tags, generations)
+        except Exception as e:
+            self.stats["refresh_errors"] += 1
+            print(f"Cache refresh error: {e}")
+        finally:
+            await self._release_lock(lock_key, token)
+
+    async def _acquire_lock(self, lock_key: str, token: str) -> bool:
+        """Try to take the fill lock; without Redis every caller computes."""
+        if not self.redis_client:
+            return True
+
+        try:
+            return bool(await self.redis_client.set(
+                lock_key, token, nx=True, px=int(settings.CACHE_LOCK_TIMEOUT * 1000)
+            ))
+        except Exception as e:
+            print(f"Cache lock error: {e}")
+            return True
+
+    async def _release_lock(self, lock_key: str, token: str) -> None:
+        """Release the fill lock if it is still ours."""
+        if not self.redis_client:
+            return
+
+        try:
+            await self.redis_client.eval(RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+        except Exception as e:
+            print(f"Cache unlock error: {e}")
+
+    async def _wait_for_fill(self, key: str) -> Optional[CacheEntry]:
+        """Poll for another process to fill a key, up to CACHE_LOCK_WAIT seconds."""
+        deadline = time.monotonic() + settings.CACHE_LOCK_WAIT
+        while time.monotonic() < deadline:
+            await asyncio.sleep(settings.CACHE_LOCK_POLL_INTERVAL)
+            entry, _ = await self._lookup(key)
+            if entry is not None:
+                return entry
+        return None
+
+    def _tag_key(self, tag: str) -> str:
+        """Redis key of the set holding the keys stored with a tag."""
+        return f"tag:{tag}"
+
+    def _generation_key(self, tag: str) -> str:
+        """Redis key of a tag's generation counter."""
+        return f"tag_generation:{tag}"
+
+    def _set_local(self, key: str, entry: CacheEntry, ttl: float) -> None:
+        """Store an entry in the L1 tier, capped at CACHE_L1_MAX_TTL."""
+        if self.local is not None:
+            self.local.set(key, entry, len(entry.body), min(ttl, settings.CACHE_L1_MAX_TTL))
+
+    async def _publish_invalidation(self, message: dict) -> None:
+        """Tell every worker (including this one) that keys were dropped for a write."""
+        await self.redis_client.publish(settings.CACHE_INVALIDATION_CHANNEL, json.dumps(message))
+
+    async def _listen_for_invalidations(self) -> None:
+        """Note invalidations published by other workers, and apply them to the L1 tier."""
+        while True:
+            try:
+                async for message in self._pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    self.last_invalidated_at = time.monotonic()
+                    if self.local is None:
+                        continue
+                    payload = json.loads(message["data"])
+                    if "key" in payload:
+                        self.local.delete(payload["key"])
+                    elif "keys" in payload:
+                        for key in payload["keys"]:
+                            self.local.delete(key)
+                    elif "pattern" in payload:
+                        self.local.delete_matching(payload["pattern"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Messages may have been missed; drop everything to stay safe
+                print(f"Cache invalidation listener error: {e}")
+                if self.local is not None:
+                    self.local.clear()
+                await asyncio.sleep(1)
+
 
 # Global cache service instance
 cache_service = CacheService()
@@ -0,0 +1,71 @@
+"""In-process LRU cache tier."""
+import fnmatch
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+
+class LocalCache:
+    """Bounded in-process LRU cache with per-entry TTLs, sized by bytes.
+
+    CacheService stores CacheEntry objects here, whose bodies are already
+    serialized JSON, so a hit costs a dict lookup and nothing is decoded.
+    Callers pass the entry's size in bytes, which is what the byte budget
+    is charged against.
+    """
+
+    def __init__(self, max_bytes: int):
+        """Initialize local cache."""
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        # key -> (expires_at, size, value), least recently used first
+        self._entries: "OrderedDict[str, Tuple[float, int, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a live value, refreshing its recency."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, _, value = entry
+        if expires_at <= time.monotonic():
+            self.delete(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, size: int, ttl: float) -> None:
+        """Store a value for ``ttl`` seconds, evicting LRU entries to fit."""
+        self.delete(key)
+        if ttl <= 0 or size > self.max_bytes:
+            return
+
+        self._entries[key] = (time.monotonic() + ttl, size, value)
+        self.current_bytes += size
+        while self.current_bytes > self.max_bytes:
+            _, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self.current_bytes -= evicted_size
+
+    def delete(self, key: str) -> bool:
+        """Drop a key if present."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self.current_bytes -= entry[1]
+        return True
+
+    def delete_matching(self, pattern: str) -> int:
+        """Drop every key matching a Redis-style glob pattern."""
+        keys = [key for key in self._entries if fnmatch.fnmatchcase(key, pattern)]
+        for key in keys:
+            self.delete(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        """Drop everything."""
+        self._entries.clear()
+        self.current_bytes = 0
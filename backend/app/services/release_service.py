@@ -1,25 +1,62 @@
 """Release service."""
 from datetime import date
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Awaitable, Callable
 
+from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.repositories.release_repository import ReleaseRepository
+from app.repositories.listing_snapshot_repository import ListingSnapshotRepository
+from app.repositories.release_repository import PUBLISHER_COLUMNS, ReleaseRepository
 from app.repositories.publisher_repository import PublisherRepository
-from app.schemas.release import MangaReleaseSchema, PublisherSchema
-from app.services.cache_service import cache_service
+from app.schemas.release import RELEASE_FIELDS
+from app.services.cache_service import CacheEntry, cache_service
+from app.utils.cache_tags import (
+    PUBLISHERS_TAG,
+    SEARCH_TAG,
+    listing_tags,
+    month_key,
+    upcoming_month_keys,
+)
+from app.utils.database import ReadSessionLocal
+from app.utils.pagination import decode_cursor, encode_cursor, keyset_values
 from app.config import get_settings
 
 settings = get_settings()
 
 
+def _price(value) -> Optional[float]:
+    return float(value) if value else None
+
+
+def _list(value) -> list:
+    return value or []
+
+
+# How release columns are rendered where the value read is not used as is
+RENDER = {
+    "release_date": date.isoformat,
+    "price_usd": _price,
+    "price_gbp": _price,
+    "genres": _list,
+    "regions": _list,
+    "authors": _list,
+    "illustrators": _list,
+}
+
+
 class ReleaseService:
     """Service for managing manga releases."""
 
-    def __init__(self, db: AsyncSession):
-        """Initialize service."""
+    def __init__(self, db: AsyncSession, warming: bool = False):
+        """Initialize service.
+
+        A ``warming`` service recomputes and stores every response it is
+        asked for, cached or not, and does not count the requests.
+        """
+        self.warming = warming
         self.release_repo = ReleaseRepository(db)
         self.publisher_repo = PublisherRepository(db)
+        self.snapshot_repo = ListingSnapshotRepository(db)
 
     async def get_current_month_releases(
         self,
@@ -29,43 +66,95 @@ class ReleaseService:
         publisher: Optional[str] = None,
         region: Optional[str] = None,
         format: Optional[str] = None,
+        genre: Optional[str] = None,
+        demographic: Optional[str] = None,
         sort: str = "date",
-    ) -> Dict[str, Any]:
-        """Get current month releases with caching."""
+        cursor: Optional[str] = None,
+        with_total: bool = False,
+        fields: str = "full",
+    ) -> CacheEntry:
+        """Get current month releases with caching.
+
+        Listings filtered by nothing but a publisher are read from the month's
+        snapshot while it is built. ``fields`` names the set of release
+        fields rendered, from RELEASE_FIELDS. Raises InvalidCursorError if
+        ``cursor`` was not issued for ``sort``.
+        """
+        after = decode_cursor(cursor, sort) if cursor else None
+
         # Build cache key
-        cache_key = f"releases:current:{limit}:{offset}:{publisher}:{region}:{format}:{sort}"
-
-        # Try cache first
-        cached = await cache_service.get(cache_key)
-        if cached:
-            return cached
-
-        # Fetch from database
-        releases, total = await self.release_repo.get_current_month_releases(
-            limit=limit,
-            offset=offset,
-            publisher_slug=publisher,
-            region=region,
-            format=format,
-            sort_by=sort,
+        cache_key = (
+            f"releases:current:{limit}:{offset}:{publisher}:{region}:{format}:"
+            f"{genre}:{demographic}:{sort}:{fields}"
         )
-
-        # Build response
-        today = date.today()
-        response = {
-            "data": [self._release_to_schema(r) for r in releases],
-            "meta": {
-                "total": total,
+        if cursor:
+            cache_key += f":{cursor}:{with_total}"
+
+        async def build(service: "ReleaseService") -> Dict[str, Any]:
+            # Fetch from database; cursor pages skip the count unless asked for it
+            include_total = after is None or with_total
+            page = None
+            if service._snapshot_serves(region, format, genre, demographic):
+                page = await service.snapshot_repo.get_page(
+                    month_key(date.today()),
+                    sort,
+                    limit=limit,
+                    offset=offset,
+                    publisher_slug=publisher,
+                    after=after,
+                    include_total=include_total,
+                )
+            if page is not None:
+                page = service._select_fields(page[0], fields), page[1]
+            else:
+                releases, total = await service.release_repo.get_current_month_releases(
+                    limit=limit,
+                    offset=offset,
+                    publisher_slug=publisher,
+                    region=region,
+                    format=format,
+                    genre=genre,
+                    demographic=demographic,
+                    sort_by=sort,
+                    after=after,
+                    include_total=include_total,
+                    fields=fields,
+                )
+                page = [service._row_to_schema(r, fields) for r in releases], total
+            releases, total = page
+
+            # Build response
+            response = {
+                "data": releases,
+                "meta": {
+                    "total": total,
+                    "limit": limit,
+                    "offset": offset,
+                    "month": month_key(date.today()),
+                    "next_cursor": service._next_cursor(releases, limit, sort),
+                },
+            }
+            return response
+
+        tags = listing_tags([month_key(date.today())], publisher)
+        # Cursor pages are too varied to be worth keeping warm
+        spec = None if cursor else {
+            "method": "get_current_month_releases",
+            "kwargs": {
                 "limit": limit,
                 "offset": offset,
-                "month": f"{today.year}-{today.month:02d}",
+                "publisher": publisher,
+                "region": region,
+                "format": format,
+                "genre": genre,
+                "demographic": demographic,
+                "sort": sort,
+                "fields": fields,
             },
         }
-
-        # Cache the response
-        await cache_service.set(cache_key, response, ttl=settings.CACHE_CURRENT_MONTH)
-
-        return response
+        return await self._cached(
+            cache_key, build, ttl=settings.CACHE_CURRENT_MONTH, tags=tags, spec=spec
+        )
 
     async def get_upcoming_releases(
         self,
@@ -74,43 +163,77 @@ class ReleaseService:
         publisher: Optional[str] = None,
         region: Optional[str] = None,
         format: Optional[str] = None,
-    ) -> Dict[str, Any]:
-        """Get upcoming releases grouped by month."""
+        genre: Optional[str] = None,
+        demographic: Optional[str] = None,
+        fields: str = "full",
+    ) -> CacheEntry:
+        """Get upcoming releases grouped by month, rendering the ``fields`` set."""
         # Build cache key
-        cache_key = f"releases:upcoming:{months}:{publisher}:{region}:{format}"
-
-        # Try cache first
-        cached = await cache_service.get(cache_key)
-        if cached:
-            return cached
-
-        # Fetch from database
-        releases_by_month = await self.release_repo.get_upcoming_releases(
-            months=months,
-            publisher_slug=publisher,
-            region=region,
-            format=format,
+        cache_key = (
+            f"releases:upcoming:{months}:{publisher}:{region}:{format}:{genre}:{demographic}:{fields}"
         )
 
-        # Build response
-        response_data = {}
-        total = 0
-        for month_key, releases in releases_by_month.items():
-            response_data[month_key] = [self._release_to_schema(r) for r in releases]
-            total += len(releases)
-
-        response = {
-            "data": response_data,
-            "meta": {
-                "total": total,
-                "months_covered": list(releases_by_month.keys()),
+        async def build(service: "ReleaseService") -> Dict[str, Any]:
+            # Fetch from database, from the months' snapshots if they serve it
+            upcoming = None
+            if service._snapshot_serves(region, format, genre, demographic):
+                upcoming = await service.snapshot_repo.get_upcoming(
+                    upcoming_month_keys(months), publisher_slug=publisher
+                )
+            if upcoming is not None:
+                upcoming = {
+                    month: service._select_fields(releases, fields)
+                    for month, releases in upcoming[0].items()
+                }, upcoming[1]
+            else:
+                releases_by_month, month_totals = await service.release_repo.get_upcoming_releases(
+                    months=months,
+                    publisher_slug=publisher,
+                    region=region,
+                    format=format,
+                    genre=genre,
+                    demographic=demographic,
+                    fields=fields,
+                )
+                upcoming = {
+                    month: [service._row_to_schema(r, fields) for r in releases]
+                    for month, releases in releases_by_month.items()
+                }, month_totals
+            releases_by_month, month_totals = upcoming
+
+            # Build response
+            response_data = {}
+            total = 0
+            for key, releases in releases_by_month.items():
+                response_data[key] = releases
+                total += len(releases)
+
+            response = {
+                "data": response_data,
+                "meta": {
+                    "total": total,
+                    "months_covered": list(releases_by_month.keys()),
+                    "month_totals": month_totals,
+                },
+            }
+            return response
+
+        tags = listing_tags(upcoming_month_keys(months), publisher)
+        spec = {
+            "method": "get_upcoming_releases",
+            "kwargs": {
+                "months": months,
+                "publisher": publisher,
+                "region": region,
+                "format": format,
+                "genre": genre,
+                "demographic": demographic,
+                "fields": fields,
             },
         }
-
-        # Cache the response
-        await cache_service.set(cache_key, response, ttl=settings.CACHE_UPCOMING_MONTHS)
-
-        return response
+        return await self._cached(
+            cache_key, build, ttl=settings.CACHE_UPCOMING_MONTHS, tags=tags, spec=spec
+        )
 
     async def search_releases(
         self,
@@ -120,96 +243,161 @@ class ReleaseService:
         offset: int = 0,
         date_from: Optional[date] = None,
         date_to: Optional[date] = None,
-    ) -> Dict[str, Any]:
-        """Search releases."""
+        sort: str = "relevance",
+        cursor: Optional[str] = None,
+        with_total: bool = False,
+        fields: str = "full",
+    ) -> CacheEntry:
+        """Search releases, rendering the ``fields`` set.
+
+        Raises InvalidCursorError if ``cursor`` was not issued by a search
+        with the same sort.
+        """
+        # Date-sorted search runs newest first, unlike the listings
+        cursor_sort = "relevance" if sort == "relevance" else "search"
+        after = decode_cursor(cursor, cursor_sort) if cursor else None
+
         # Build cache key
-        cache_key = f"releases:search:{query}:{limit}:{offset}:{date_from}:{date_to}"
-
-        # Try cache first
-        cached = await cache_service.get(cache_key)
-        if cached:
-            return cached
-
-        # Search database
-        releases, total = await self.release_repo.search_releases(
-            query=query,
-            limit=limit,
-            offset=offset,
-            date_from=date_from,
-            date_to=date_to,
+        cache_key = (
+            f"releases:search:{query}:{limit}:{offset}:{date_from}:{date_to}:{sort}:{fields}"
+        )
+        if cursor:
+            cache_key += f":{cursor}:{with_total}"
+
+        async def build(service: "ReleaseService") -> Dict[str, Any]:
+            # Search database; cursor pages skip the count unless asked for it
+            releases, total = await service.release_repo.search_releases(
+                query=query,
+                limit=limit,
+                offset=offset,
+                date_from=date_from,
+                date_to=date_to,
+                sort_by=sort,
+                after=after,
+                include_total=after is None or with_total,
+                fields=fields,
+            )
+
+            # Build response
+            response = {
+                "data": [service._row_to_schema(r, fields) for r in releases],
+                "meta": {
+                    "total": total,
+                    "limit": limit,
+                    "offset": offset,
+                    "query": query,
+                    "next_cursor": service._next_cursor(releases, limit, cursor_sort),
+                },
+            }
+            return response
+
+        return await self._cached(cache_key, build, ttl=settings.CACHE_SEARCH, tags=[SEARCH_TAG])
+
+    async def get_publishers(self) -> CacheEntry:
+        """Get all publishers with their release count."""
+        cache_key = "publishers:all"
+
+        async def build(service: "ReleaseService") -> Dict[str, Any]:
+            publishers = await service.publisher_repo.get_all_with_release_count()
+            return {"data": publishers}
+
+        return await self._cached(
+            cache_key, build, ttl=settings.CACHE_METADATA, tags=[PUBLISHERS_TAG]
         )
 
-        # Build response
-        response = {
-            "data": [self._release_to_schema(r) for r in releases],
-            "meta": {
-                "total": total,
-                "limit": limit,
-                "offset": offset,
-                "query": query,
-            },
-        }
-
-        # Cache the response
-        await cache_service.set(cache_key, response, ttl=settings.CACHE_SEARCH)
-
-        return response
-
-    async def get_metadata_filters(self) -> Dict[str, Any]:
+    async def get_metadata_filters(self) -> CacheEntry:
         """Get available filter options."""
         cache_key = "metadata:filters"
 
-        # Try cache first
-        cached = await cache_service.get(cache_key)
-        if cached:
-            return cached
-
-        # Get publishers with counts
-        publishers = await self.publisher_repo.get_all_with_release_count()
-
-        # Build response with common values
-        response = {
-            "publishers": publishers,
-            "regions": ["us", "uk", "ca", "au"],
-            "formats": ["Paperback", "Hardcover", "Digital"],
-            "demographics": ["Shonen", "Shojo", "Seinen", "Josei", "Kodomo"],
-            "genres": [
-                "Action", "Adventure", "Comedy", "Drama", "Fantasy",
-                "Horror", "Mystery", "Romance", "Sci-Fi", "Slice of Life",
-                "Sports", "Supernatural", "Thriller", "Historical"
-            ],
-        }
+        async def build(service: "ReleaseService") -> Dict[str, Any]:
+            # Get publishers with counts
+            publishers = await service.publisher_repo.get_all_with_release_count()
+
+            # Build response with common values
+            response = {
+                "publishers": publishers,
+                "regions": ["us", "uk", "ca", "au"],
+                "formats": ["Paperback", "Hardcover", "Digital"],
+                "demographics": ["Shonen", "Shojo", "Seinen", "Josei", "Kodomo"],
+                "genres": [
+                    "Action", "Adventure", "Comedy", "Drama", "Fantasy",
+                    "Horror", "Mystery", "Romance", "Sci-Fi", "Slice of Life",
+                    "Sports", "Supernatural", "Thriller", "Historical"
+                ],
+            }
+            return response
+
+        return await self._cached(
+            cache_key,
+            build,
+            ttl=settings.CACHE_METADATA,
+            tags=[PUBLISHERS_TAG],
+            spec={"method": "get_metadata_filters", "kwargs": {}},
+        )
 
-        # Cache the response
-        await cache_service.set(cache_key, response, ttl=settings.CACHE_METADATA)
-
-        return response
-
-    def _release_to_schema(self, release) -> dict:
-        """Convert release model to schema dict."""
-        return {
-            "id": release.id,
-            "title": release.title,
-            "series_name": release.series_name,
-            "volume_number": release.volume_number,
-            "isbn_13": release.isbn_13,
-            "isbn_10": release.isbn_10,
-            "release_date": release.release_date.isoformat(),
-            "publisher": {
-                "id": release.publisher.id,
-                "name": release.publisher.name,
-                "slug": release.publisher.slug,
-                "country": release.publisher.country,
-            },
-            "format": release.format,
-            "page_count": release.page_count,
-            "price_usd": float(release.price_usd) if release.price_usd else None,
-            "price_gbp": float(release.price_gbp) if release.price_gbp else None,
-            "cover_image_url": release.cover_image_url,
-            "description": release.description,
-            "demographic": release.demographic,
-            "genres": release.genres or [],
-            "regions": release.regions or [],
-            "authors": release.authors or [],
-            "illustrators": release.illustrators or [],
-        }
+    async def _cached(
+        self,
+        cache_key: str,
+        build: Callable[["ReleaseService"], Awaitable[Dict[str, Any]]],
+        ttl: int,
+        tags: List[str],
+        spec: Optional[Dict[str, Any]] = None,
+    ) -> CacheEntry:
+        """Serve a response through the cache as its serialized entry.
+
+        Concurrent misses share one computation, and background refreshes of
+        stale entries outlive the request, so both build on a session of
+        their own rather than on the request's. ``tags`` name
+        the data the response is built from, for write-driven invalidation.
+        ``spec`` names the method and arguments that rebuild the response;
+        requests carrying one are counted for the cache warmer.
+        """
+        if self.warming:
+            return await cache_service.warm(cache_key, lambda: build(self), ttl=ttl, tags=tags)
+        if spec is not None and settings.CACHE_WARM_ENABLED:
+            cache_service.count_request(cache_key, spec)
+
+        async def compute() -> Dict[str, Any]:
+            async with ReadSessionLocal() as session:
+                return await build(ReleaseService(session))
+
+        return await cache_service.get_or_set(
+            cache_key, compute, ttl=ttl, refresh=compute, tags=tags
+        )
+
+    def _snapshot_serves(self, *filters: Optional[str]) -> bool:
+        """Whether listing snapshots can serve a listing with these filters.
+
+        Snapshots are numbered per month and per publisher, so any other
+        filter is applied by a live query.
+        """
+        return settings.LISTING_SNAPSHOTS_ENABLED and not any(filters)
+
+    def _next_cursor(self, releases: List, limit: int, sort: str) -> Optional[str]:
+        """Build the cursor for the page after this one, if there may be one."""
+        if len(releases) < limit:
+            return None
+        return encode_cursor(sort, keyset_values(releases[-1], sort))
+
+    def _row_to_schema(self, row: Row, fields: str = "full") -> dict:
+        """Convert a projected release row to its response dict.
+
+        Listing snapshots build the full dict in SQL (``_release_json`` in
+        the snapshot repository); keep the two in step.
+        """
+        values = row._mapping
+        release = {}
+        for name in RELEASE_FIELDS[fields]:
+            if name == "publisher":
+                release[name] = {column: values[f"publisher_{column}"] for column in PUBLISHER_COLUMNS}
+            elif name in RENDER:
+                release[name] = RENDER[name](values[name])
+            else:
+                release[name] = values[name]
+        return release
+
+    def _select_fields(self, releases: List[Dict[str, Any]], fields: str) -> List[Dict[str, Any]]:
+        """Narrow full release dicts, as snapshots store them, to a field set."""
+        if fields == "full":
+            return releases
+        return [{name: release[name] for name in RELEASE_FIELDS[fields]} for release in releases]
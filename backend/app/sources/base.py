@@ -1,7 +1,13 @@
 """Base source protocol."""
-from dataclasses import dataclass
-from datetime import date
-from typing import Protocol, List, Optional
+import hashlib
+import json
+from dataclasses import asdict, dataclass
+from datetime import date, datetime
+from typing import Protocol, Any, AsyncIterator, Dict, List, Optional
+
+from app.config import get_settings
+
+settings = get_settings()
 
 
 @dataclass
@@ -29,6 +35,76 @@ class RawRelease:
     external_id: str
     source_url: str
     raw_data: dict
+    updated_at: Optional[datetime] = None  # when the source last changed it, if known
+
+    def content_hash(self) -> str:
+        """SHA-256 of the record's content, to spot records that did not change."""
+        content = asdict(self)
+        del content["updated_at"]
+        encoded = json.dumps(content, sort_keys=True, default=str, separators=(",", ":"))
+        return hashlib.sha256(encoded.encode()).hexdigest()
+
+    def to_row(self, publisher_id: int) -> Dict[str, Any]:
+        """Map to manga_releases columns, for ``bulk_upsert``."""
+        return {
+            "title": self.title,
+            "series_name": self.series_name,
+            "volume_number": self.volume_number,
+            "isbn_13": self.isbn_13,
+            "isbn_10": self.isbn_10,
+            "release_date": self.release_date,
+            "publisher_id": publisher_id,
+            "format": self.format,
+            "page_count": self.page_count,
+            "price_usd": self.price_usd,
+            "price_gbp": self.price_gbp,
+            "cover_image_url": self.cover_image_url,
+            "description": self.description,
+            "demographic": self.demographic,
+            "genres": self.genres,
+            "regions": self.regions,
+            "authors": self.authors,
+            "illustrators": self.illustrators,
+        }
+
+    def to_source_record(
+        self,
+        source_name: str,
+        release_id: int,
+        content_hash: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Map to source_records columns, for ``SourceRecordRepository.bulk_upsert``.
+
+        ``content_hash`` saves recomputing it when the caller already has it.
+        """
+        return {
+            "source_name": source_name,
+            "external_id": self.external_id,
+            "manga_release_id": release_id,
+            "source_url": self.source_url,
+            "raw_data": self.raw_data,
+            "content_hash": content_hash or self.content_hash(),
+        }
+
+
+@dataclass
+class SyncCursor:
+    """Where a source's previous sync left off.
+
+    Incremental sources fetch only what changed after ``last_modified``
+    (inclusive, so nothing stamped in the same instant is missed) and may
+    send ``etag`` as If-None-Match. They update both as they go; the sync
+    saves them once everything fetched has been written.
+    """
+
+    last_modified: Optional[datetime] = None
+    etag: Optional[str] = None
+
+    def advance(self, releases: List[RawRelease]) -> None:
+        """Move the watermark past the newest ``updated_at`` in a batch."""
+        stamps = [release.updated_at for release in releases if release.updated_at]
+        if stamps and (self.last_modified is None or max(stamps) > self.last_modified):
+            self.last_modified = max(stamps)
 
 
 class MangaSource(Protocol):
@@ -48,6 +124,76 @@ class MangaSource(Protocol):
         """Fetch releases from this source."""
         ...
 
+    def iter_releases(
+        self,
+        start_date: date,
+        end_date: date,
+        *,
+        language_filter: str = "en",
+        region_filter: Optional[List[str]] = None,
+        batch_size: int = settings.SOURCE_BATCH_SIZE,
+        cursor: Optional[SyncCursor] = None,
+    ) -> AsyncIterator[List[RawRelease]]:
+        """Yield releases page by page, as the source delivers them.
+
+        With a ``cursor``, sources that can should yield only releases
+        changed since it and update it (see SyncCursor); others ignore it.
+        """
+        ...
+
     async def health_check(self) -> bool:
         """Check if source is accessible."""
         ...
+
+
+class ListSourceAdapter:
+    """Give a source that only implements ``fetch_releases`` an ``iter_releases``.
+
+    The whole list is still fetched up front; it is only handed on in
+    batches so consumers can treat every source alike.
+    """
+
+    def __init__(self, source):
+        """Wrap a list-returning source."""
+        self.source = source
+        self.name = source.name
+        self.priority = source.priority
+
+    async def fetch_releases(self, start_date: date, end_date: date, **kwargs) -> List[RawRelease]:
+        """Fetch releases from the wrapped source."""
+        return await self.source.fetch_releases(start_date, end_date, **kwargs)
+
+    async def iter_releases(
+        self,
+        start_date: date,
+        end_date: date,
+        *,
+        batch_size: int = settings.SOURCE_BATCH_SIZE,
+        cursor: Optional[SyncCursor] = None,
+        **kwargs,
+    ) -> AsyncIterator[List[RawRelease]]:
+        """Fetch everything, then yield it in ``batch_size`` slices.
+
+        List sources cannot fetch incrementally, so ``cursor`` is ignored.
+        """
+        releases = await self.source.fetch_releases(start_date, end_date, **kwargs)
+        for start in range(0, len(releases), batch_size):
+            yield releases[start:start + batch_size]
+
+    async def health_check(self) -> bool:
+        """Check the wrapped source."""
+        return await self.source.health_check()
+
+
+def stream_releases(
+    source,
+    start_date: date,
+    end_date: date,
+    *,
+    batch_size: int = settings.SOURCE_BATCH_SIZE,
+    **kwargs,
+) -> AsyncIterator[List[RawRelease]]:
+    """Iterate a source in batches, adapting it if it only returns lists."""
+    if not hasattr(source, "iter_releases"):
+        source = ListSourceAdapter(source)
+    return source.iter_releases(start_date, end_date, batch_size=batch_size, **kwargs)
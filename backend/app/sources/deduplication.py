@@ -0,0 +1,255 @@
+"""Deduplication of raw releases fetched from several sources.
+
+Sits between ``MangaSource.fetch_releases`` and ``bulk_upsert``. Instead of
+scoring every pair of records, each record is filed under a few blocking
+keys and only scored against records sharing one of them:
+
+- its ISBN-13 (a match is certain, no scoring needed)
+- its normalized series name and volume
+- its publisher, volume and release week (adjacent weeks are also checked,
+  so a date that drifts across a week boundary still meets its twin)
+
+Blocks stay small however large the batch is, so the cost grows linearly
+with the number of records. Matches are merged with union-find, which keeps
+chains (A~B, B~C) in one cluster.
+"""
+import re
+import unicodedata
+from dataclasses import fields, replace
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from fuzzywuzzy import fuzz
+
+from app.sources.base import RawRelease
+
+# Threshold for deduplication
+SIMILARITY_THRESHOLD = 0.85
+
+# Records this far apart are different books unless their ISBN-13s match
+MAX_DATE_DRIFT_DAYS = 14
+
+# Fields that identify a source record rather than describe the release
+_SOURCE_FIELDS = {"external_id", "source_url", "raw_data"}
+
+
+def calculate_similarity_score(r1: RawRelease, r2: RawRelease) -> float:
+    """Calculate similarity score between two releases."""
+    score = 0.0
+
+    # ISBN match (strongest signal)
+    if r1.isbn_13 and r2.isbn_13 and r1.isbn_13 == r2.isbn_13:
+        return 1.0
+
+    # Series + volume match
+    if r1.series_name and r2.series_name:
+        series_sim = fuzz.ratio(r1.series_name, r2.series_name) / 100
+        score += series_sim * 0.4
+
+        if r1.volume_number == r2.volume_number:
+            score += 0.3
+
+    # Title match
+    title_sim = fuzz.ratio(r1.title, r2.title) / 100
+    score += title_sim * 0.2
+
+    # Publisher match
+    if r1.publisher_name == r2.publisher_name:
+        score += 0.1
+
+    return score
+
+
+def normalize_key(text: Optional[str]) -> str:
+    """Fold case, accents, punctuation and a leading article for blocking."""
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    text = re.sub(r"[^a-z0-9]+", " ", text).strip()
+    return re.sub(r"^the ", "", text)
+
+
+def _week(day: date) -> Tuple[int, int]:
+    """ISO (year, week) of a date."""
+    year, week, _ = day.isocalendar()
+    return year, week
+
+
+def _neighbour_weeks(day: date) -> List[Tuple[int, int]]:
+    """The ISO week of a date and the weeks either side of it."""
+    return [_week(date.fromordinal(day.toordinal() + offset)) for offset in (-7, 0, 7)]
+
+
+class DeduplicationEngine:
+    """Cluster raw releases that describe the same book.
+
+    Records are fed in with ``add`` (or all at once with ``process``) and
+    matched against everything added before them, so batches from several
+    sources can be streamed through one engine. Records with two different
+    ISBN-13s are never merged: they are different editions. Without a shared
+    ISBN, records must also be within MAX_DATE_DRIFT_DAYS of each other.
+    """
+
+    def __init__(self, threshold: float = SIMILARITY_THRESHOLD):
+        """Initialize engine."""
+        self.threshold = threshold
+        self.releases: List[RawRelease] = []
+        self.priorities: List[int] = []
+        self.comparisons = 0
+        self._parent: List[int] = []
+        # Records of each cluster by root, so a batch's clusters are found
+        # without walking every record
+        self._members: Dict[int, List[int]] = {}
+        # ISBN-13 of each cluster, tracked on its root
+        self._isbn: List[Optional[str]] = []
+        self._by_isbn: Dict[str, int] = {}
+        self._by_series: Dict[Tuple[str, str], List[int]] = {}
+        self._by_week: Dict[Tuple[str, str, Tuple[int, int]], List[int]] = {}
+
+    def add(self, release: RawRelease, priority: int = 0) -> int:
+        """Add a record, merging it into any cluster it matches.
+
+        ``priority`` is its source's priority (lower wins when merging).
+        Returns the record's index.
+        """
+        index = len(self.releases)
+        self.releases.append(release)
+        self.priorities.append(priority)
+        self._parent.append(index)
+        self._members[index] = [index]
+        self._isbn.append(release.isbn_13 or None)
+
+        if release.isbn_13:
+            existing = self._by_isbn.setdefault(release.isbn_13, index)
+            if existing != index:
+                self._union(existing, index)
+
+        # Pairs can share both blocks; score each one once
+        scored: Set[int] = set()
+        volume = normalize_key(release.volume_number)
+        series = normalize_key(release.series_name)
+        if series:
+            block = self._by_series.setdefault((series, volume), [])
+            self._match(index, block, scored)
+            block.append(index)
+
+        publisher = normalize_key(release.publisher_name)
+        candidates: List[int] = []
+        for week in _neighbour_weeks(release.release_date):
+            candidates.extend(self._by_week.get((publisher, volume, week), ()))
+        self._match(index, candidates, scored)
+        self._by_week.setdefault(
+            (publisher, volume, _week(release.release_date)), []
+        ).append(index)
+
+        return index
+
+    def clusters(self) -> List[List[int]]:
+        """Indexes of the records in each cluster, in order of first appearance."""
+        groups: Dict[int, List[int]] = {}
+        for index in range(len(self.releases)):
+            groups.setdefault(self._find(index), []).append(index)
+        return list(groups.values())
+
+    def merged(self) -> List[RawRelease]:
+        """One release per cluster (see ``merge``)."""
+        return [self.merge_cluster(cluster) for cluster in self.clusters()]
+
+    def clusters_for(self, indexes: Iterable[int]) -> List[List[int]]:
+        """Indexes of the records in just the clusters containing these records.
+
+        Costs time in proportion to the size of those clusters, not to
+        everything added so far.
+        """
+        roots = {self._find(index) for index in indexes}
+        return [sorted(self._members[root]) for root in sorted(roots)]
+
+    def merged_for(self, indexes: Iterable[int]) -> List[RawRelease]:
+        """Merged releases of just the clusters containing these records."""
+        return [self.merge_cluster(cluster) for cluster in self.clusters_for(indexes)]
+
+    def merge_cluster(self, cluster: List[int]) -> RawRelease:
+        """One release for a cluster of record indexes (see ``merge``)."""
+        return merge([self.releases[i] for i in cluster], [self.priorities[i] for i in cluster])
+
+    def process(self, releases: Iterable[RawRelease], priority: int = 0) -> List[RawRelease]:
+        """Add a batch of records and return the merged releases so far."""
+        for release in releases:
+            self.add(release, priority)
+        return self.merged()
+
+    def _match(self, index: int, candidates: Iterable[int], scored: Set[int]) -> None:
+        """Score a record against candidates and merge it with any that match."""
+        release = self.releases[index]
+        for candidate in candidates:
+            if candidate in scored or self._find(candidate) == self._find(index):
+                continue
+            scored.add(candidate)
+            other = self.releases[candidate]
+            drift = abs((release.release_date - other.release_date).days)
+            if drift > MAX_DATE_DRIFT_DAYS:
+                continue
+            self.comparisons += 1
+            score = calculate_similarity_score(release, other)
+            if score >= self.threshold:
+                self._union(candidate, index)
+
+    def _find(self, index: int) -> int:
+        """Root of a record's cluster, halving the path on the way."""
+        parent = self._parent
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    def _union(self, a: int, b: int) -> bool:
+        """Merge two clusters unless they carry different ISBN-13s."""
+        root_a, root_b = self._find(a), self._find(b)
+        if root_a == root_b:
+            return True
+        isbn_a, isbn_b = self._isbn[root_a], self._isbn[root_b]
+        if isbn_a and isbn_b and isbn_a != isbn_b:
+            return False
+        # Keep the earlier record as root so cluster order is stable
+        if root_b < root_a:
+            root_a, root_b = root_b, root_a
+        self._parent[root_b] = root_a
+        self._isbn[root_a] = isbn_a or isbn_b
+        # Move the smaller member list into the larger one
+        members_a, members_b = self._members[root_a], self._members.pop(root_b)
+        if len(members_b) > len(members_a):
+            members_a, members_b = members_b, members_a
+            self._members[root_a] = members_a
+        members_a.extend(members_b)
+        return True
+
+
+def merge(releases: List[RawRelease], priorities: Optional[List[int]] = None) -> RawRelease:
+    """Combine the records of one cluster into a single release.
+
+    The record from the highest-priority source (ties go to the first one
+    seen) is kept, and its empty fields are filled from the others in
+    priority order.
+    """
+    if priorities is None:
+        priorities = [0] * len(releases)
+    ordered = [
+        release
+        for _, _, release in sorted(
+            zip(priorities, range(len(releases)), releases), key=lambda item: item[:2]
+        )
+    ]
+    canonical = ordered[0]
+
+    filled = {}
+    for field in fields(RawRelease):
+        if field.name in _SOURCE_FIELDS or getattr(canonical, field.name):
+            continue
+        for other in ordered[1:]:
+            value = getattr(other, field.name)
+            if value:
+                filled[field.name] = value
+                break
+
+    return replace(canonical, **filled) if filled else canonical
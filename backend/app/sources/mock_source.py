@@ -1,9 +1,12 @@
 """Mock data source for testing and initial data."""
 from datetime import date, timedelta
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 import random
 
-from app.sources.base import RawRelease
+from app.sources.base import RawRelease, SyncCursor
+from app.config import get_settings
+
+settings = get_settings()
 
 
 class MockSource:
@@ -43,6 +46,25 @@ class MockSource:
     ) -> List[RawRelease]:
         """Generate mock releases."""
         releases = []
+        async for batch in self.iter_releases(start_date, end_date):
+            releases.extend(batch)
+        return releases
+
+    async def iter_releases(
+        self,
+        start_date: date,
+        end_date: date,
+        *,
+        language_filter: str = "en",
+        region_filter: Optional[List[str]] = None,
+        batch_size: int = settings.SOURCE_BATCH_SIZE,
+        cursor: Optional[SyncCursor] = None,
+    ) -> AsyncIterator[List[RawRelease]]:
+        """Generate mock releases in batches of at most ``batch_size``.
+
+        Everything is regenerated on each call, so ``cursor`` is ignored.
+        """
+        releases = []
         current_date = start_date
 
         # Generate releases across the date range
@@ -78,10 +100,14 @@ class MockSource:
                         raw_data={},
                     )
                     releases.append(release)
+                    if len(releases) >= batch_size:
+                        yield releases
+                        releases = []
 
             current_date += timedelta(days=1)
 
-        return releases
+        if releases:
+            yield releases
 
     async def health_check(self) -> bool:
         """Always healthy."""
@@ -0,0 +1,20 @@
+"""Registry of the sources synced by the background worker."""
+from typing import Dict, List
+
+from app.sources.base import MangaSource
+from app.sources.mock_source import MockSource
+
+_sources: Dict[str, MangaSource] = {}
+
+
+def register_source(source: MangaSource) -> None:
+    """Add a source, replacing any registered under the same name."""
+    _sources[source.name] = source
+
+
+def get_sources() -> List[MangaSource]:
+    """Registered sources, highest priority (lowest number) first."""
+    return sorted(_sources.values(), key=lambda source: source.priority)
+
+
+register_source(MockSource())
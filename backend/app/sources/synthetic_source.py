@@ -0,0 +1,185 @@
+"""Deterministic synthetic source for load tests and large seeds."""
+import random
+from datetime import date
+from typing import AsyncIterator, Dict, List, Optional
+
+from app.sources.base import RawRelease, SyncCursor
+from app.config import get_settings
+
+settings = get_settings()
+
+WORDS = [
+    "Blade", "Moon", "Shadow", "Academy", "Dragon", "Witch", "Summer", "Spirit",
+    "Hunter", "Garden", "Knight", "Star", "Tokyo", "Ghost", "Crimson", "Silent",
+    "Frontier", "Alchemist", "Kingdom", "Promise", "Runner", "Festival", "Ocean",
+    "Sword", "Demon", "Heart", "Winter", "Detective", "Café", "Dungeon", "Lantern",
+    "Phantom", "Harbor", "Cherry", "Iron", "Wolf", "Clockwork", "Paper", "Thunder",
+    "Jade", "Mirror", "River", "Orbit", "Velvet", "Signal", "Maple", "Comet",
+]
+PUBLISHER_WORDS = ["Press", "Comics", "Books", "Media", "Entertainment", "Publishing"]
+DEMOGRAPHICS = ["Shonen", "Shojo", "Seinen", "Josei"]
+GENRES = [
+    "Action", "Adventure", "Comedy", "Drama", "Fantasy", "Horror", "Mystery",
+    "Romance", "Sci-Fi", "Slice of Life", "Sports", "Supernatural", "Historical",
+]
+REGIONS = ["us", "uk", "ca", "au"]
+FORMATS = ["Paperback", "Paperback", "Paperback", "Hardcover", "Digital"]
+CADENCES = range(4, 17)  # weeks between volumes
+# ISBNs are 979 + six digits of series index + four of volume
+MAX_SERIES = 1_000_000
+# Series start within about four years either side of this, whatever the date
+EPOCH = date(2026, 1, 5)
+
+
+class SyntheticSource:
+    """Source generating a large, reproducible catalogue.
+
+    ``series`` series are spread over ``publishers`` publishers, and each one
+    puts out a volume every 4-16 weeks on a fixed schedule. There are about
+    ``series / 9`` releases a week, so 100,000 series give roughly a million
+    releases over two years. The same ``seed`` always gives the same
+    releases for a date, whatever range is asked for, so runs can be
+    repeated and compared.
+    """
+
+    name = "synthetic"
+    priority = 1000
+
+    def __init__(self, series: int = 2000, publishers: int = 40, seed: int = 42):
+        """Initialize source, laying out every series up front."""
+        if not 0 < series <= MAX_SERIES:
+            raise ValueError(f"series must be between 1 and {MAX_SERIES:,}, got {series:,}")
+        rng = random.Random(seed)
+        self.seed = seed
+        self.publisher_names = _unique_names(
+            rng, publishers, lambda: f"{rng.choice(WORDS)} {rng.choice(PUBLISHER_WORDS)}"
+        )
+        self.series = []
+        # Series due in a week: cadence -> week % cadence -> series indexes
+        self._schedule: Dict[int, Dict[int, List[int]]] = {}
+        names = _unique_names(rng, series, lambda: " ".join(rng.sample(WORDS, rng.randint(2, 3))))
+        for index, name in enumerate(names):
+            cadence = rng.choice(CADENCES)
+            phase = rng.randrange(cadence)
+            started = _week(EPOCH) + rng.randint(-200, 200)  # week of volume 1
+            self.series.append({
+                "name": name,
+                "publisher": rng.choice(self.publisher_names),
+                "demographic": rng.choice(DEMOGRAPHICS),
+                "genres": rng.sample(GENRES, rng.randint(1, 3)),
+                "regions": ["us"] + rng.sample(REGIONS[1:], rng.randint(0, 3)),
+                "author": f"{rng.choice(WORDS)} {rng.choice(WORDS)}",
+                "format": rng.choice(FORMATS),
+                "price": rng.choice([9.99, 11.99, 12.99, 14.99, 16.99]),
+                "cadence": cadence,
+                "first_week": started - (started - phase) % cadence,
+            })
+            self._schedule.setdefault(cadence, {}).setdefault(phase, []).append(index)
+
+    async def fetch_releases(
+        self,
+        start_date: date,
+        end_date: date,
+        *,
+        language_filter: str = "en",
+        region_filter: Optional[List[str]] = None,
+    ) -> List[RawRelease]:
+        """Generate every release in a date range at once."""
+        releases = []
+        async for batch in self.iter_releases(
+            start_date, end_date, language_filter=language_filter, region_filter=region_filter
+        ):
+            releases.extend(batch)
+        return releases
+
+    async def iter_releases(
+        self,
+        start_date: date,
+        end_date: date,
+        *,
+        language_filter: str = "en",
+        region_filter: Optional[List[str]] = None,
+        batch_size: int = settings.SOURCE_BATCH_SIZE,
+        cursor: Optional[SyncCursor] = None,
+    ) -> AsyncIterator[List[RawRelease]]:
+        """Generate releases week by week in batches of ``batch_size``.
+
+        Everything is regenerated on each call, so ``cursor`` is ignored.
+        """
+        batch: List[RawRelease] = []
+        for week in range(_week(start_date), _week(end_date) + 1):
+            release_date = date.fromordinal(week * 7 + 2)  # Tuesday
+            if not start_date <= release_date <= end_date:
+                continue
+            for index in self._due(week):
+                release = self._release(index, week, release_date)
+                if release is None:
+                    continue
+                if region_filter and not set(region_filter) & set(release.regions):
+                    continue
+                batch.append(release)
+                if len(batch) == batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+    async def health_check(self) -> bool:
+        """Check if source is healthy."""
+        return True
+
+    def _due(self, week: int) -> List[int]:
+        """Series with a volume out in a week, in series order."""
+        due = []
+        for cadence, phases in self._schedule.items():
+            due.extend(phases.get(week % cadence, ()))
+        return sorted(due)
+
+    def _release(self, index: int, week: int, release_date: date) -> Optional[RawRelease]:
+        """The volume of a series out in a week, if it has started by then."""
+        series = self.series[index]
+        volume = (week - series["first_week"]) // series["cadence"] + 1
+        if volume < 1:
+            return None
+        # Per-release details vary, but only with the seed, series and volume
+        rng = random.Random(hash((self.seed, index, volume)))
+        slug = series["name"].lower().replace(" ", "-")
+        return RawRelease(
+            title=f"{series['name']}, Vol. {volume}",
+            series_name=series["name"],
+            volume_number=str(volume),
+            isbn_13=None if rng.random() < 0.03 else f"979{index:06d}{volume % 10000:04d}",
+            isbn_10=None,
+            release_date=release_date,
+            publisher_name=series["publisher"],
+            format=series["format"],
+            page_count=rng.randint(160, 240),
+            price_usd=series["price"],
+            price_gbp=round(series["price"] * 0.8, 2),
+            cover_image_url=f"https://example.com/covers/{slug}/{volume}.jpg",
+            description=f"Volume {volume} of the {series['demographic'].lower()} series {series['name']}.",
+            demographic=series["demographic"],
+            genres=series["genres"],
+            regions=series["regions"],
+            authors=[series["author"]],
+            illustrators=[],
+            external_id=f"synthetic-{index}-{volume}",
+            source_url=f"https://example.com/manga/{slug}/vol-{volume}",
+            raw_data={"series": index, "volume": volume},
+        )
+
+
+def _week(day: date) -> int:
+    """Number of the Monday-to-Sunday week a date falls in."""
+    return (day.toordinal() - 1) // 7
+
+
+def _unique_names(rng: random.Random, count: int, make) -> List[str]:
+    """``count`` distinct names, numbering repeats once the words run out."""
+    names: List[str] = []
+    seen: Dict[str, int] = {}
+    for _ in range(count):
+        name = make()
+        seen[name] = seen.get(name, 0) + 1
+        names.append(name if seen[name] == 1 else f"{name} {seen[name]}")
+    return names
@@ -0,0 +1,172 @@
+"""Shared HTTP transport for external sources.
+
+Sources make their requests through ``source_transport`` rather than their
+own clients. It keeps one pooled keep-alive ``httpx.AsyncClient`` per host,
+paces each source with a token bucket sized from config, and retries 429s,
+5xx responses and connection errors with jittered exponential backoff.
+The app closes its clients on shutdown. The bundled sources generate their
+data locally, so nothing goes through it until an HTTP-backed source is
+added.
+"""
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+from app.config import get_settings
+
+settings = get_settings()
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Async token bucket: ``rate`` tokens per second, up to ``burst`` saved up.
+
+    Waiters are served in arrival order.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        """Initialize bucket, starting full."""
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(rate, 1.0)
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """Wait until ``tokens`` are available and take them."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+
+                self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self.tokens) / self.rate)
+
+    def block_for(self, seconds: float) -> None:
+        """Hold every caller back for a while, e.g. after a 429."""
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+        # Refill from empty once the block lifts
+        self.tokens = 0.0
+        self._updated = self._blocked_until
+
+
+class SourceTransport:
+    """Pooled, rate-limited, retrying HTTP requests for sources."""
+
+    def __init__(self, *, transport: Optional[httpx.AsyncBaseTransport] = None):
+        """Initialize transport.
+
+        ``transport`` replaces the network for every client, e.g. an
+        ``httpx.ASGITransport`` around a stub app.
+        """
+        self._transport = transport
+        self._clients: Dict[Tuple[str, str, Optional[int]], httpx.AsyncClient] = {}
+        self._limiters: Dict[str, TokenBucket] = {}
+
+    def limiter(self, source_name: str) -> TokenBucket:
+        """The token bucket shared by every request of one source."""
+        if source_name not in self._limiters:
+            rate = settings.SOURCE_RATE_LIMITS.get(source_name) or getattr(
+                settings, f"{source_name.upper()}_RATE_LIMIT", settings.SOURCE_DEFAULT_RATE_LIMIT
+            )
+            self._limiters[source_name] = TokenBucket(rate)
+        return self._limiters[source_name]
+
+    async def request(self, source_name: str, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send a request for a source, retrying throttled and failed attempts.
+
+        Returns the last response once it succeeds, fails with a status that
+        is not retried, or retries run out; connection errors are re-raised
+        when retries run out.
+        """
+        client = self._client_for(url)
+        limiter = self.limiter(source_name)
+
+        attempt = 0
+        while True:
+            await limiter.acquire()
+            try:
+                response = await client.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                if attempt == settings.SOURCE_MAX_RETRIES:
+                    raise
+                print(f"Source request error ({source_name}): {e}")
+                await asyncio.sleep(_backoff(attempt))
+                attempt += 1
+                continue
+
+            if response.status_code not in RETRY_STATUSES or attempt == settings.SOURCE_MAX_RETRIES:
+                return response
+
+            delay = _retry_after(response)
+            if delay is None:
+                delay = _backoff(attempt)
+            if response.status_code == 429:
+                # The whole source is over its quota, not just this request
+                limiter.block_for(delay)
+            await response.aclose()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def get(self, source_name: str, url: str, **kwargs) -> httpx.Response:
+        """GET a URL for a source."""
+        return await self.request(source_name, "GET", url, **kwargs)
+
+    async def close(self) -> None:
+        """Close every pooled client."""
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+
+    def _client_for(self, url: str) -> httpx.AsyncClient:
+        """Pooled keep-alive client for a URL's host."""
+        parsed = httpx.URL(url)
+        host = (parsed.scheme, parsed.host, parsed.port)
+        if host not in self._clients:
+            self._clients[host] = httpx.AsyncClient(
+                transport=self._transport,
+                timeout=settings.SOURCE_HTTP_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=settings.SOURCE_MAX_CONNECTIONS_PER_HOST,
+                    max_keepalive_connections=settings.SOURCE_MAX_CONNECTIONS_PER_HOST,
+                ),
+                follow_redirects=True,
+            )
+        return self._clients[host]
+
+
+def _backoff(attempt: int) -> float:
+    """Full-jitter exponential backoff for a zero-based attempt number."""
+    ceiling = min(settings.SOURCE_RETRY_BACKOFF_MAX, settings.SOURCE_RETRY_BACKOFF * 2 ** attempt)
+    return random.uniform(0, ceiling)
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """Seconds from a Retry-After header (delay or HTTP date), capped."""
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0.0), settings.SOURCE_RETRY_BACKOFF_MAX)
+
+
+# Global transport shared by all sources
+source_transport = SourceTransport()
@@ -0,0 +1,66 @@
+"""Cache tags shared by cached reads and the writes that invalidate them.
+
+A cached response is tagged with what it was built from, and every write
+records the tags it affects on its session. Committing the session then
+deletes exactly the dependent entries (see ``commit_and_invalidate``).
+
+- ``month:YYYY-MM`` - listings covering that month, not filtered by publisher
+- ``month:YYYY-MM:publisher:<slug>`` - the same, filtered to one publisher
+- ``search`` - every search result (the search index as a whole)
+- ``publishers`` - publisher lists and their release counts
+"""
+from datetime import date
+from typing import Iterable, List, Optional, Set
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+CACHE_TAGS_KEY = "cache_tags"
+SEARCH_TAG = "search"
+PUBLISHERS_TAG = "publishers"
+
+
+def month_key(day: date) -> str:
+    """Format the month a date falls in as ``YYYY-MM``."""
+    return f"{day.year}-{day.month:02d}"
+
+
+def upcoming_month_keys(months: int, today: Optional[date] = None) -> List[str]:
+    """The ``YYYY-MM`` keys of the ``months`` months after the current one."""
+    today = today or date.today()
+    keys = []
+    for month_offset in range(1, months + 1):
+        year, month = divmod(today.month - 1 + month_offset, 12)
+        keys.append(f"{today.year + year}-{month + 1:02d}")
+    return keys
+
+
+def month_tag(month: str, publisher_slug: Optional[str] = None) -> str:
+    """Tag for listings of one month, optionally filtered to one publisher."""
+    if publisher_slug:
+        return f"month:{month}:publisher:{publisher_slug}"
+    return f"month:{month}"
+
+
+def tag_months(tags: Iterable[str]) -> Set[str]:
+    """The ``YYYY-MM`` months named by month tags, with or without a publisher."""
+    return {tag.split(":")[1] for tag in tags if tag.startswith("month:")}
+
+
+def listing_tags(months: Iterable[str], publisher_slug: Optional[str] = None) -> List[str]:
+    """Tags for a listing covering ``months``."""
+    return [month_tag(month, publisher_slug) for month in months]
+
+
+def record_tags(db: AsyncSession, tags: Iterable[str]) -> None:
+    """Remember tags touched by writes in this session until it commits."""
+    db.info.setdefault(CACHE_TAGS_KEY, set()).update(tags)
+
+
+def peek_tags(db: AsyncSession) -> Set[str]:
+    """The tags recorded on a session so far, leaving them in place."""
+    return set(db.info.get(CACHE_TAGS_KEY, ()))
+
+
+def pop_tags(db: AsyncSession) -> Set[str]:
+    """Take the tags recorded on a session, leaving none behind."""
+    return db.info.pop(CACHE_TAGS_KEY, set())
@@ -1,13 +1,35 @@
-"""Database utilities and session management."""
-from typing import AsyncGenerator
+"""Database utilities and session management.
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import declarative_base
+Writes use the primary engine through ``get_db``. GET endpoints use
+``get_read_db``, whose sessions run in read-only transactions that are never
+committed, on the replica at DATABASE_REPLICA_URL when one is configured.
+Sessions of either kind take a pooled connection only when they first run
+SQL, so requests served from the cache use no connections at all.
+Reads fall back to the primary while the replica lags by more than
+DATABASE_REPLICA_MAX_LAG seconds, cannot be reached, or may not have
+replayed a write whose cached responses were just invalidated.
+"""
+import asyncio
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, AsyncGenerator, Dict, Optional, Set
+
+from alembic.config import Config as AlembicConfig
+from alembic.script import ScriptDirectory
+from sqlalchemy import event, text
+from sqlalchemy.exc import ProgrammingError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.orm import Session, declarative_base
 
 from app.config import get_settings
+from app.services.cache_service import cache_service
+from app.utils.cache_tags import peek_tags, pop_tags, tag_months
 
 settings = get_settings()
 
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "alembic"
+
 # Create async engine
 engine = create_async_engine(
     settings.DATABASE_URL,
@@ -17,6 +39,27 @@ engine = create_async_engine(
     pool_pre_ping=True,
 )
 
+replica_engine: Optional[AsyncEngine] = None
+if settings.DATABASE_REPLICA_URL:
+    replica_engine = create_async_engine(
+        settings.DATABASE_REPLICA_URL,
+        echo=settings.DEBUG,
+        pool_size=settings.DATABASE_REPLICA_POOL_SIZE,
+        max_overflow=settings.DATABASE_REPLICA_MAX_OVERFLOW,
+        pool_pre_ping=True,
+    )
+
+READ_ENGINE_KEY = "read_engine"
+
+# Seconds the replica is behind; 0 when it has replayed everything received
+REPLICA_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE extract(epoch FROM now() - pg_last_xact_replay_timestamp())
+    END
+"""
+
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -35,20 +78,205 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
         try:
             yield session
-            await session.commit()
+            await commit_and_invalidate(session)
         except Exception:
             await session.rollback()
+            pop_tags(session)
             raise
         finally:
             await session.close()
 
 
+class PoolMetrics:
+    """Checkout counters for one engine's connection pool."""
+
+    def __init__(self, engine: AsyncEngine):
+        """Initialize metrics and listen to the pool's events."""
+        self.pool = engine.sync_engine.pool
+        self.stats: Counter = Counter()
+        self.max_checked_out = 0
+        event.listen(self.pool, "connect", self._on_connect)
+        event.listen(self.pool, "checkout", self._on_checkout)
+        event.listen(self.pool, "checkin", self._on_checkin)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Connections opened, checkouts and checkins so far, and pool occupancy."""
+        return {
+            "connects": self.stats["connects"],
+            "checkouts": self.stats["checkouts"],
+            "checkins": self.stats["checkins"],
+            "checked_out": self.pool.checkedout(),
+            "max_checked_out": self.max_checked_out,
+            "size": self.pool.size(),
+            "overflow": self.pool.overflow(),
+        }
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        self.stats["connects"] += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        self.stats["checkouts"] += 1
+        self.max_checked_out = max(self.max_checked_out, self.pool.checkedout())
+
+    def _on_checkin(self, dbapi_connection, connection_record) -> None:
+        self.stats["checkins"] += 1
+
+
+class ReadRouter:
+    """Choose the engine for read-only sessions.
+
+    The choice is synchronous and uses the last measured replica lag; once
+    that is older than DATABASE_REPLICA_LAG_CHECK_INTERVAL, a choice starts
+    a background task to measure it again. Both engines are wrapped to
+    begin their transactions READ ONLY (``postgresql_readonly``), which
+    asyncpg sends as part of BEGIN instead of a separate SET TRANSACTION.
+    """
+
+    def __init__(self, primary: AsyncEngine, replica: Optional[AsyncEngine]):
+        """Initialize router."""
+        self.primary = primary.execution_options(postgresql_readonly=True)
+        self.replica = replica.execution_options(postgresql_readonly=True) if replica else None
+        self.lag: Optional[float] = None  # None until measured, or if unreachable
+        self._checked_at = float("-inf")
+        self._check: Optional[asyncio.Task] = None
+        self.stats: Counter = Counter()
+
+    def choose(self) -> AsyncEngine:
+        """The replica if it is close enough behind, otherwise the primary."""
+        if self.replica is None:
+            self.stats["primary_reads"] += 1
+            return self.primary
+
+        max_lag = settings.DATABASE_REPLICA_MAX_LAG
+        if time.monotonic() - cache_service.last_invalidated_at < max_lag:
+            # A write just invalidated cached responses; one rebuilt from a
+            # replica that has not replayed it would be cached stale
+            self.stats["primary_reads_after_write"] += 1
+            return self.primary
+
+        self._schedule_lag_check()
+        if self.lag is None or self.lag > max_lag:
+            self.stats["primary_reads_replica_behind"] += 1
+            return self.primary
+        self.stats["replica_reads"] += 1
+        return self.replica
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Read routing counters and the last measured replica lag."""
+        return {**self.stats, "replica_configured": self.replica is not None, "replica_lag": self.lag}
+
+    def _schedule_lag_check(self) -> None:
+        """Start measuring replica lag unless it was measured recently."""
+        if self._check is not None and not self._check.done():
+            return
+        if time.monotonic() - self._checked_at < settings.DATABASE_REPLICA_LAG_CHECK_INTERVAL:
+            return
+        self._check = asyncio.get_running_loop().create_task(self._check_lag())
+
+    async def _check_lag(self) -> None:
+        """Measure how far behind the replica is."""
+        try:
+            async with self.replica.connect() as conn:
+                self.lag = float((await conn.execute(text(REPLICA_LAG_SQL))).scalar() or 0)
+        except Exception as e:
+            print(f"Replica lag check error: {e}")
+            self.lag = None
+        self._checked_at = time.monotonic()
+
+
+read_router = ReadRouter(engine, replica_engine)
+pool_metrics = {"primary": PoolMetrics(engine)}
+if replica_engine is not None:
+    pool_metrics["replica"] = PoolMetrics(replica_engine)
+
+
+class ReadSession(Session):
+    """Session that binds to the engine ``read_router`` picks, when it first runs SQL.
+
+    Sessions take a pooled connection only once they execute something, so
+    a request answered from the cache never touches a pool. Deferring the
+    routing choice to the same moment keeps it off that path too. The
+    choice then holds for the session's lifetime.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        """The chosen engine's sync engine."""
+        if READ_ENGINE_KEY not in self.info:
+            self.info[READ_ENGINE_KEY] = read_router.choose()
+        return self.info[READ_ENGINE_KEY].sync_engine
+
+
+# Read-only sessions; never commit them
+ReadSessionLocal = async_sessionmaker(
+    class_=AsyncSession,
+    sync_session_class=ReadSession,
+    expire_on_commit=False,
+    autoflush=False,
+)
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Get read-only database session dependency.
+
+    Nothing is committed: closing the session ends the transaction, if SQL
+    ever started one.
+    """
+    async with ReadSessionLocal() as session:
+        yield session
+
+
+async def commit_and_invalidate(session: AsyncSession, refresh_listings: bool = True) -> Set[str]:
+    """Commit, then drop cached responses that depend on what was written.
+
+    Invalidating after the commit means later misses read the new rows; a
+    computation that read the old rows before it is refused when it tries
+    to store, since invalidation bumps the tags' generations (see
+    CacheService). The listing snapshots of
+    the months written are rebuilt first, in the same transaction. Writers
+    committing many batches pass ``refresh_listings=False`` to only mark
+    them stale, and refresh once at the end. Returns the tags invalidated.
+    """
+    months = tag_months(peek_tags(session))
+    if months and settings.LISTING_SNAPSHOTS_ENABLED:
+        # Imported here, as the repositories import this module's Base
+        from app.repositories.listing_snapshot_repository import ListingSnapshotRepository
+
+        snapshots = ListingSnapshotRepository(session)
+        if refresh_listings:
+            await snapshots.refresh(months)
+        else:
+            await snapshots.mark_stale(months)
+    await session.commit()
+    tags = pop_tags(session)
+    if tags:
+        await cache_service.invalidate_tags(tags)
+    return tags
+
+
 async def init_db() -> None:
-    """Initialize database tables."""
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    """Check that the database schema is at the latest migration.
+
+    Alembic owns the schema (``alembic upgrade head``); this raises when
+    migrations are pending, so a stale database stops startup.
+    """
+    config = AlembicConfig()
+    config.set_main_option("script_location", str(MIGRATIONS_DIR))
+    heads = set(ScriptDirectory.from_config(config).get_heads())
+
+    async with engine.connect() as conn:
+        try:
+            current = set((await conn.execute(text("SELECT version_num FROM alembic_version"))).scalars())
+        except ProgrammingError:
+            current = set()
+    if current != heads:
+        raise RuntimeError(
+            f"Database schema is at {', '.join(sorted(current)) or 'no revision'}, "
+            f"expected {', '.join(sorted(heads))}: run `alembic upgrade head`"
+        )
 
 
 async def close_db() -> None:
     """Close database connections."""
     await engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
@@ -0,0 +1,59 @@
+"""Opaque keyset cursors for listing and search pagination."""
+import base64
+import binascii
+import json
+from datetime import date
+from typing import Any, Tuple
+
+# Sort modes whose leading key is a release date ("search" is newest first)
+DATE_SORTS = {"date", "search"}
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a cursor cannot be decoded or does not match the sort."""
+
+
+def keyset_values(release, sort: str) -> Tuple[Any, int]:
+    """Get the (sort key, id) tuple a page ending at this release continues from.
+
+    ``release`` is a release dict as rendered, or a projected search row,
+    which carries its ``relevance``.
+    """
+    if isinstance(release, dict):
+        if sort == "title":
+            return release["title"], release["id"]
+        if sort == "publisher":
+            return release["publisher"]["name"], release["id"]
+        return date.fromisoformat(release["release_date"]), release["id"]
+    if sort == "relevance":
+        return release.relevance, release.id
+    return release.release_date, release.id
+
+
+def encode_cursor(sort: str, values: Tuple[Any, int]) -> str:
+    """Encode a sort mode and keyset tuple into an opaque cursor."""
+    key, release_id = values
+    if isinstance(key, date):
+        key = key.isoformat()
+    payload = json.dumps([sort, key, release_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> Tuple[Any, int]:
+    """Decode a cursor produced by encode_cursor for the given sort mode."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, key, release_id = json.loads(base64.urlsafe_b64decode(padded))
+        if cursor_sort != sort or not isinstance(release_id, int):
+            raise InvalidCursorError("Cursor does not match the requested sort")
+        if sort in DATE_SORTS:
+            key = date.fromisoformat(key)
+        elif sort == "relevance":
+            key = float(key)
+        elif not isinstance(key, str):
+            raise InvalidCursorError("Malformed cursor")
+    except InvalidCursorError:
+        raise
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+        raise InvalidCursorError("Malformed cursor") from e
+    return key, release_id
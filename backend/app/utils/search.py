@@ -0,0 +1,21 @@
+"""Full-text search helpers."""
+import re
+from typing import Optional
+
+# Text search configuration shared by the generated column and queries
+SEARCH_CONFIG = "english"
+
+# Letters and digits only: tsquery syntax characters and underscores are dropped
+_WORD_RE = re.compile(r"[^\W_]+")
+
+
+def prefix_tsquery(query: str) -> Optional[str]:
+    """Turn free text into a to_tsquery() string matching every word as a prefix.
+
+    "chainsaw ma" becomes "chainsaw:* & ma:*". Returns None when the query has
+    no searchable words.
+    """
+    words = _WORD_RE.findall(query.lower())
+    if not words:
+        return None
+    return " & ".join(f"{word}:*" for word in words)
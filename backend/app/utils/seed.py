@@ -2,9 +2,13 @@
 from datetime import date, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.sources.base import MangaSource, stream_releases
 from app.sources.mock_source import MockSource
 from app.repositories.publisher_repository import PublisherRepository
 from app.repositories.release_repository import ReleaseRepository
+from app.repositories.source_record_repository import SourceRecordRepository
+from app.utils.bulk_load import backfill_releases
+from app.utils.database import commit_and_invalidate
 
 
 async def seed_database(db: AsyncSession):
@@ -14,6 +18,7 @@ async def seed_database(db: AsyncSession):
     # Create publishers
     publisher_repo = PublisherRepository(db)
     release_repo = ReleaseRepository(db)
+    source_record_repo = SourceRecordRepository(db)
 
     publishers = {
         "VIZ Media": await publisher_repo.get_or_create(
@@ -42,7 +47,7 @@ async def seed_database(db: AsyncSession):
         ),
     }
 
-    await db.commit()
+    await commit_and_invalidate(db)
     print(f"Created {len(publishers)} publishers")
 
     # Generate mock releases
@@ -56,42 +61,42 @@ async def seed_database(db: AsyncSession):
     start_date = today.replace(day=1) - timedelta(days=30)
     end_date = today + timedelta(days=120)
 
-    raw_releases = await mock_source.fetch_releases(start_date, end_date)
-    print(f"Generated {len(raw_releases)} mock releases")
-
-    # Convert to database format
+    # Write each batch as it is generated instead of building the whole list,
+    # with a source record linking each release to what it was built from
     created_count = 0
-    for raw_release in raw_releases:
-        publisher = publishers.get(raw_release.publisher_name)
-        if not publisher:
-            continue
+    async for raw_releases in mock_source.iter_releases(start_date, end_date):
+        rows = []
+        seeded = []
+        for raw_release in raw_releases:
+            publisher = publishers.get(raw_release.publisher_name)
+            if not publisher:
+                continue
+
+            rows.append(raw_release.to_row(publisher.id))
+            seeded.append(raw_release)
 
-        try:
-            await release_repo.create(
-                title=raw_release.title,
-                series_name=raw_release.series_name,
-                volume_number=raw_release.volume_number,
-                isbn_13=raw_release.isbn_13,
-                isbn_10=raw_release.isbn_10,
-                release_date=raw_release.release_date,
-                publisher_id=publisher.id,
-                format=raw_release.format,
-                page_count=raw_release.page_count,
-                price_usd=raw_release.price_usd,
-                price_gbp=raw_release.price_gbp,
-                cover_image_url=raw_release.cover_image_url,
-                description=raw_release.description,
-                demographic=raw_release.demographic,
-                genres=raw_release.genres,
-                regions=raw_release.regions,
-                authors=raw_release.authors,
-                illustrators=raw_release.illustrators,
-            )
-            created_count += 1
-        except Exception as e:
-            print(f"Error creating release: {e}")
-            continue
+        counts = await release_repo.bulk_upsert(rows)
+        await source_record_repo.bulk_upsert([
+            raw_release.to_source_record(mock_source.name, release_id)
+            for raw_release, release_id in zip(seeded, counts["ids"])
+        ])
+        await commit_and_invalidate(db)
+        created_count += counts["created"]
 
-    await db.commit()
     print(f"Created {created_count} releases")
     print("Database seeding complete!")
+
+
+async def backfill_database(db: AsyncSession, source: MangaSource, start_date: date, end_date: date):
+    """Backfill releases from a source through the COPY fast path.
+
+    Publishers are created as needed. Meant for bootstrapping a database
+    with years of history; source records are not written.
+    """
+    print(f"Backfilling {source.name} releases from {start_date} to {end_date}...")
+    counts = await backfill_releases(
+        db, stream_releases(source, start_date, end_date, batch_size=10000)
+    )
+    await commit_and_invalidate(db)
+    print(f"Created {counts['created']} releases, updated {counts['updated']}")
+    print("Backfill complete!")
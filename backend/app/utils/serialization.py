@@ -0,0 +1,36 @@
+"""JSON serialization helpers.
+
+orjson is used when installed; the standard library is the fallback.
+"""
+import json
+import zlib
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def dumps(value: Any) -> bytes:
+    """Serialize a value to compact JSON bytes; unknown types become strings."""
+    if orjson is not None:
+        return orjson.dumps(value, default=str)
+    return json.dumps(value, default=str, separators=(",", ":")).encode()
+
+
+def loads(data: bytes) -> Any:
+    """Deserialize JSON bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def compress(value: Any, level: int = 6) -> bytes:
+    """Serialize a value to zlib-compressed JSON."""
+    return zlib.compress(dumps(value), level)
+
+
+def decompress(data: bytes) -> Any:
+    """Deserialize zlib-compressed JSON."""
+    return loads(zlib.decompress(data))
@@ -0,0 +1,121 @@
+"""Cache warming for the most requested listing and filter responses.
+
+Requests for warmable responses (current-month and upcoming listings, and
+the filter options) are counted per cache key, along with the service call
+that rebuilds the key. Each pass of the warmer takes the CACHE_WARM_KEYS
+most requested keys and recomputes those that are missing (invalidated by
+a write, flushed, or never stored) or within CACHE_WARM_MARGIN seconds of
+their soft expiry, at most CACHE_WARM_CONCURRENCY at a time. Passes run
+every CACHE_WARM_INTERVAL seconds, at startup, and right after a sync, so
+visitors find hot pages computed instead of paying for the miss.
+"""
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+from app.services.cache_service import cache_service
+from app.services.release_service import ReleaseService
+from app.utils.database import ReadSessionLocal
+from app.config import get_settings
+
+settings = get_settings()
+
+# ReleaseService methods a warm pass may call, by the name a spec gives
+WARMABLE = {
+    "get_current_month_releases",
+    "get_upcoming_releases",
+    "get_metadata_filters",
+}
+
+
+class CacheWarmer:
+    """Periodically recompute the most requested cache keys."""
+
+    def __init__(
+        self,
+        *,
+        keys: int = settings.CACHE_WARM_KEYS,
+        concurrency: int = settings.CACHE_WARM_CONCURRENCY,
+        interval: float = settings.CACHE_WARM_INTERVAL,
+        margin: float = settings.CACHE_WARM_MARGIN,
+    ):
+        """Initialize warmer."""
+        self.keys = keys
+        self.concurrency = concurrency
+        self.interval = interval
+        self.margin = margin
+        self._task: Optional[asyncio.Task] = None
+        self._pass_lock = asyncio.Lock()
+
+    async def start(self) -> None:
+        """Run a first pass, waiting up to CACHE_WARM_STARTUP_TIMEOUT, then keep warming."""
+        try:
+            await asyncio.wait_for(self.warm(), timeout=settings.CACHE_WARM_STARTUP_TIMEOUT)
+        except asyncio.TimeoutError:
+            print("Cache warm: startup pass timed out, continuing in the background")
+        except Exception as e:
+            print(f"Cache warm error: {e}")
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the periodic passes."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def warm(self, everything: bool = False) -> Dict[str, int]:
+        """One pass; ``everything`` recomputes hot keys even if fresh.
+
+        Request counts are flushed (and decayed) first. Returns how many
+        keys were ``warmed``, ``skipped`` as fresh or already being filled
+        elsewhere, and ``failed``.
+        """
+        async with self._pass_lock:
+            await cache_service.flush_request_counts(decay=settings.CACHE_WARM_DECAY)
+            hot = await cache_service.hot_keys(self.keys)
+
+            counts = {"warmed": 0, "skipped": 0, "failed": 0}
+            semaphore = asyncio.Semaphore(self.concurrency)
+            deadline = time.time() + self.margin
+
+            async def warm_key(key: str, spec: Dict[str, Any]) -> None:
+                async with semaphore:
+                    try:
+                        warmed = await self._rebuild(spec)
+                        counts["warmed" if warmed else "skipped"] += 1
+                    except Exception as e:
+                        print(f"Cache warm error ({key}): {e}")
+                        counts["failed"] += 1
+
+            await asyncio.gather(*(
+                warm_key(key, spec)
+                for key, spec, soft_expires_at in hot
+                if everything or soft_expires_at is None or soft_expires_at <= deadline
+            ))
+            counts["skipped"] += len(hot) - sum(counts.values())
+            return counts
+
+    async def _rebuild(self, spec: Dict[str, Any]) -> bool:
+        """Call the service method a spec names; False if someone else was filling it."""
+        method = spec.get("method")
+        if method not in WARMABLE:
+            return False
+        async with ReadSessionLocal() as db:
+            entry = await getattr(ReleaseService(db, warming=True), method)(**spec["kwargs"])
+        return entry is not None
+
+    async def _run(self) -> None:
+        """Warm every ``interval`` seconds until stopped."""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.warm()
+            except Exception as e:
+                print(f"Cache warm error: {e}")
+
+
+cache_warmer = CacheWarmer()
@@ -0,0 +1,365 @@
+"""Multi-source release sync.
+
+Every source is streamed concurrently with ``stream_releases``, bounded by a
+semaphore and a per-batch timeout. Batches go through a bounded
+``asyncio.Queue`` to a single consumer that deduplicates them and writes them
+with ``bulk_upsert``, so writing starts with the first batch and overlaps the
+remaining fetches, and at most ``queue_size`` fetched batches wait in memory.
+
+Syncs are incremental. Each source gets the SyncCursor saved by its last
+completed run over the same date window, so sources that support it fetch
+only what changed; none of the current sources do yet, and they fetch the
+whole window every time. Every fetched record is hashed and compared with
+its stored source record, and only clusters containing a new or changed
+record are written, so the writes cost time in proportion to what changed.
+``full=True`` ignores both checks.
+
+Batches only mark the listing snapshots of the months they write stale, so
+those months are read live during the run; the snapshots are rebuilt once
+at the end.
+"""
+import asyncio
+import re
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories.data_source_repository import DataSourceRepository
+from app.repositories.listing_snapshot_repository import ListingSnapshotRepository
+from app.repositories.publisher_repository import PublisherRepository
+from app.repositories.release_repository import ReleaseRepository
+from app.repositories.source_record_repository import SourceRecordRepository
+from app.sources.base import MangaSource, RawRelease, SyncCursor, stream_releases
+from app.sources.deduplication import DeduplicationEngine
+from app.sources.registry import get_sources
+from app.utils.database import AsyncSessionLocal, commit_and_invalidate
+from app.workers.cache_warmer import cache_warmer
+from app.config import get_settings
+
+settings = get_settings()
+
+
+@dataclass
+class SyncResult:
+    """Outcome of one sync run."""
+
+    fetched: int = 0  # raw records from all sources
+    unchanged: int = 0  # fetched records whose content hash had not changed
+    deduplicated: int = 0  # distinct releases after deduplication
+    created: int = 0
+    updated: int = 0
+    errors: Dict[str, str] = field(default_factory=dict)  # by source name
+    # Seconds per stage: fetch (wall clock until the last source finished),
+    # dedup and persist (time spent in each), and total
+    timings: Dict[str, float] = field(default_factory=lambda: defaultdict(float))
+    source_timings: Dict[str, float] = field(default_factory=dict)
+
+
+class SyncOrchestrator:
+    """Fetch, deduplicate and persist releases from several sources."""
+
+    def __init__(
+        self,
+        sources: List[MangaSource],
+        session_factory: Callable[[], AsyncSession] = AsyncSessionLocal,
+        *,
+        max_concurrency: int = settings.SYNC_MAX_CONCURRENT_SOURCES,
+        source_timeout: float = settings.SYNC_SOURCE_TIMEOUT,
+        queue_size: int = settings.SYNC_QUEUE_SIZE,
+    ):
+        """Initialize orchestrator."""
+        self.sources = sources
+        self.session_factory = session_factory
+        self.max_concurrency = max_concurrency
+        self.source_timeout = source_timeout
+        self.queue_size = queue_size
+        self._publisher_ids: Dict[str, int] = {}
+
+    async def run(self, start_date: date, end_date: date, *, full: bool = False) -> SyncResult:
+        """Sync releases between two dates from every source.
+
+        A failing or timed-out source is recorded in ``errors`` and the rest
+        of the sync carries on; a failed write aborts the whole run. Cursors
+        are kept per source and window, and saved only for sources that
+        completed, after everything fetched has been written, so a failed run
+        is retried from the old cursor.
+        """
+        result = SyncResult()
+        started = time.perf_counter()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        data_sources, cursors = await self._load_cursors(start_date, end_date, full)
+
+        consumer = asyncio.create_task(self._consume(queue, result, full))
+        fetching = asyncio.gather(*(
+            self._fetch(
+                source, start_date, end_date, cursors[source.name], semaphore, queue, result
+            )
+            for source in self.sources
+        ))
+
+        try:
+            # The consumer only finishes first if it failed
+            await asyncio.wait({fetching, consumer}, return_when=asyncio.FIRST_COMPLETED)
+            if consumer.done():
+                fetching.cancel()
+                consumer.result()
+            await fetching
+            result.timings["fetch"] = time.perf_counter() - started
+            await queue.put(None)
+            await consumer
+        except BaseException:
+            fetching.cancel()
+            consumer.cancel()
+            raise
+
+        await self._save_cursors(data_sources, start_date, end_date, cursors, result)
+        await self._refresh_listings()
+        result.timings["total"] = time.perf_counter() - started
+        result.timings = dict(result.timings)
+        return result
+
+    async def _fetch(
+        self,
+        source: MangaSource,
+        start_date: date,
+        end_date: date,
+        cursor: SyncCursor,
+        semaphore: asyncio.Semaphore,
+        queue: asyncio.Queue,
+        result: SyncResult,
+    ) -> None:
+        """Stream one source into the queue; errors are recorded, not raised.
+
+        Batches already queued before a failure are still written.
+        """
+        async with semaphore:
+            started = time.perf_counter()
+            batches = stream_releases(source, start_date, end_date, cursor=cursor)
+            try:
+                while True:
+                    try:
+                        releases = await asyncio.wait_for(
+                            batches.__anext__(), timeout=self.source_timeout
+                        )
+                    except StopAsyncIteration:
+                        break
+                    result.fetched += len(releases)
+                    cursor.advance(releases)
+                    await queue.put((source, releases))
+            except asyncio.TimeoutError:
+                result.errors[source.name] = f"timed out after {self.source_timeout}s"
+            except Exception as e:
+                print(f"Sync fetch error ({source.name}): {e}")
+                result.errors[source.name] = str(e)
+            finally:
+                if hasattr(batches, "aclose"):
+                    await batches.aclose()
+                result.source_timings[source.name] = time.perf_counter() - started
+
+    async def _consume(self, queue: asyncio.Queue, result: SyncResult, full: bool) -> None:
+        """Deduplicate and write batches as they arrive.
+
+        Records are pending from when they arrive new or changed until their
+        cluster is written. Clusters with an ISBN-13 are written straight
+        away; if a later source adds to them, the upsert rewrites the same
+        row. Clusters without one are held back until every source is in.
+        Clusters already stored are written by the release id their source
+        records point to, so a release stored without an ISBN takes one
+        when a source supplies it rather than being stored again.
+        """
+        engine = DeduplicationEngine()
+        origins: List[str] = []  # source name of each engine record
+        hashes: List[str] = []
+        release_ids: Dict[int, int] = {}  # engine record -> stored release
+        pending: Set[int] = set()
+
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+            source, releases = item
+
+            async with self.session_factory() as db:
+                known = await SourceRecordRepository(db).get_known(
+                    source.name, [release.external_id for release in releases]
+                )
+
+            started = time.perf_counter()
+            # CPU-bound; a worker thread keeps the fetches moving meanwhile
+            indexes = await asyncio.to_thread(self._deduplicate, engine, releases, source.priority)
+            for index, release in zip(indexes, releases):
+                origins.append(source.name)
+                hashes.append(release.content_hash())
+                stored_hash, release_id = known.get(release.external_id, (None, None))
+                if release_id is not None:
+                    release_ids[index] = release_id
+                if full or stored_hash != hashes[index]:
+                    pending.add(index)
+                else:
+                    result.unchanged += 1
+
+            clusters = await asyncio.to_thread(self._merge_pending, engine, pending)
+            result.timings["dedup"] += time.perf_counter() - started
+
+            ready = [(cluster, merged) for cluster, merged in clusters if merged.isbn_13]
+            await self._persist(engine, ready, origins, hashes, release_ids, pending, result)
+
+        started = time.perf_counter()
+        clusters = self._merge_pending(engine, pending)
+        result.deduplicated = len(engine.clusters())
+        result.timings["dedup"] += time.perf_counter() - started
+        await self._persist(engine, clusters, origins, hashes, release_ids, pending, result)
+
+    def _deduplicate(
+        self,
+        engine: DeduplicationEngine,
+        releases: List[RawRelease],
+        priority: int,
+    ) -> List[int]:
+        """Add a batch to the engine; returns the records' indexes."""
+        return [engine.add(release, priority) for release in releases]
+
+    def _merge_pending(
+        self,
+        engine: DeduplicationEngine,
+        pending: Set[int],
+    ) -> List[Tuple[List[int], RawRelease]]:
+        """Clusters holding pending records, with their merged release."""
+        return [(cluster, engine.merge_cluster(cluster)) for cluster in engine.clusters_for(pending)]
+
+    async def _persist(
+        self,
+        engine: DeduplicationEngine,
+        clusters: List[Tuple[List[int], RawRelease]],
+        origins: List[str],
+        hashes: List[str],
+        release_ids: Dict[int, int],
+        pending: Set[int],
+        result: SyncResult,
+    ) -> None:
+        """Upsert merged releases and their source records in one transaction."""
+        if not clusters:
+            return
+
+        started = time.perf_counter()
+        async with self.session_factory() as db:
+            try:
+                rows = []
+                for cluster, release in clusters:
+                    publisher_id = await self._publisher_id(db, release.publisher_name)
+                    row = release.to_row(publisher_id)
+                    known_id = _known_release_id(cluster, release_ids)
+                    if known_id is not None:
+                        row["id"] = known_id
+                    rows.append(row)
+                counts = await ReleaseRepository(db).bulk_upsert(rows)
+
+                # Provenance: every changed record, and every record whose
+                # cluster now lives in a different release, points at its row
+                records = []
+                for (cluster, _), release_id in zip(clusters, counts["ids"]):
+                    for index in cluster:
+                        if index in pending or release_ids.get(index) != release_id:
+                            records.append(engine.releases[index].to_source_record(
+                                origins[index], release_id, hashes[index]
+                            ))
+                        release_ids[index] = release_id
+                await SourceRecordRepository(db).bulk_upsert(records)
+                await commit_and_invalidate(db, refresh_listings=False)
+            except Exception:
+                # Publishers created in the failed transaction are gone
+                self._publisher_ids.clear()
+                raise
+
+        for cluster, _ in clusters:
+            pending.difference_update(cluster)
+        result.created += counts["created"]
+        result.updated += counts["updated"]
+        result.timings["persist"] += time.perf_counter() - started
+
+    async def _load_cursors(
+        self,
+        start_date: date,
+        end_date: date,
+        full: bool,
+    ) -> Tuple[Dict[str, int], Dict[str, SyncCursor]]:
+        """Each source's id, and the cursor saved by its last run over this window."""
+        data_source_ids: Dict[str, int] = {}
+        cursors: Dict[str, SyncCursor] = {}
+        async with self.session_factory() as db:
+            repo = DataSourceRepository(db)
+            for source in self.sources:
+                data_source = await repo.get_or_create(
+                    name=source.name, slug=_slugify(source.name), priority=source.priority
+                )
+                data_source_ids[source.name] = data_source.id
+                state = None if full else await repo.get_sync_state(
+                    data_source.id, start_date, end_date
+                )
+                cursors[source.name] = (
+                    SyncCursor(state.last_modified, state.etag) if state else SyncCursor()
+                )
+            await db.commit()
+        return data_source_ids, cursors
+
+    async def _save_cursors(
+        self,
+        data_source_ids: Dict[str, int],
+        start_date: date,
+        end_date: date,
+        cursors: Dict[str, SyncCursor],
+        result: SyncResult,
+    ) -> None:
+        """Save the cursors of the sources that completed, for this window."""
+        async with self.session_factory() as db:
+            repo = DataSourceRepository(db)
+            for name, data_source_id in data_source_ids.items():
+                if name in result.errors:
+                    continue
+                cursor = cursors[name]
+                await repo.save_sync_state(
+                    data_source_id, start_date, end_date, cursor.last_modified, cursor.etag
+                )
+            await db.commit()
+
+    async def _refresh_listings(self) -> None:
+        """Rebuild the listing snapshots marked stale, and any not built yet."""
+        if not settings.LISTING_SNAPSHOTS_ENABLED:
+            return
+        async with self.session_factory() as db:
+            await ListingSnapshotRepository(db).refresh([])
+            await db.commit()
+
+    async def _publisher_id(self, db: AsyncSession, name: str) -> int:
+        """Look up or create a publisher by name, once per run."""
+        if name not in self._publisher_ids:
+            publisher = await PublisherRepository(db).get_or_create(name=name, slug=_slugify(name))
+            self._publisher_ids[name] = publisher.id
+        return self._publisher_ids[name]
+
+
+async def sync_releases(start_date: date, end_date: date) -> SyncResult:
+    """Sync every registered source for a date range, then rewarm the cache."""
+    result = await SyncOrchestrator(get_sources()).run(start_date, end_date)
+    if settings.CACHE_WARM_ENABLED:
+        await cache_warmer.warm()
+    return result
+
+
+def _known_release_id(cluster: List[int], release_ids: Dict[int, int]) -> Optional[int]:
+    """A release already stored for any record of a cluster."""
+    for index in cluster:
+        if index in release_ids:
+            return release_ids[index]
+    return None
+
+
+def _slugify(name: str) -> str:
+    """URL slug for a publisher name ("VIZ Media" -> "viz-media")."""
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
@@ -0,0 +1 @@
+"""Benchmarks; the database ones run against DATABASE_URL."""
@@ -0,0 +1,139 @@
+"""Benchmark ReleaseRepository.bulk_upsert against the row-by-row loop.
+
+Usage:
+    python -m benchmarks.bulk_upsert --rows 20000
+
+Each strategy runs twice over the same payload, first against an empty key
+space (all inserts) and then again (all updates). Everything happens inside
+a transaction that is rolled back, so the database is left untouched.
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, List
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.models import MangaRelease
+from app.repositories.publisher_repository import PublisherRepository
+from app.repositories.release_repository import ReleaseRepository
+from app.utils.database import AsyncSessionLocal, init_db
+
+
+async def legacy_bulk_upsert(db: AsyncSession, releases_data: List[Dict[str, Any]]) -> Dict[str, int]:
+    """The original SELECT-then-update/create loop, kept for comparison.
+
+    Inlined as the repository's get_by_isbn, update and create ran it, so
+    later additions to those methods do not slow the baseline down.
+    """
+    created = 0
+    updated = 0
+
+    async def create(release_data: Dict[str, Any]) -> None:
+        release = MangaRelease(**release_data)
+        db.add(release)
+        await db.flush()
+        await db.refresh(release)
+
+    for release_data in releases_data:
+        isbn = release_data.get("isbn_13")
+        if isbn:
+            result = await db.execute(
+                select(MangaRelease)
+                .options(selectinload(MangaRelease.publisher))
+                .where(MangaRelease.isbn_13 == isbn)
+            )
+            existing = result.scalar_one_or_none()
+            if existing:
+                await db.execute(
+                    update(MangaRelease).where(MangaRelease.id == existing.id).values(**release_data)
+                )
+                await db.flush()
+                (await db.execute(
+                    select(MangaRelease).where(MangaRelease.id == existing.id)
+                )).scalar_one_or_none()
+                updated += 1
+            else:
+                await create(release_data)
+                created += 1
+        else:
+            await create(release_data)
+            created += 1
+
+    await db.flush()
+    return {"created": created, "updated": updated}
+
+
+def build_payload(rows: int, publisher_id: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """Generate upcoming-month style rows, about 5% of them without an ISBN."""
+    rng = random.Random(seed)
+    start = date.today().replace(day=1)
+    payload = []
+    for i in range(rows):
+        vol = rng.randint(1, 40)
+        payload.append({
+            "title": f"Benchmark Series {i % 500}, Vol. {vol}",
+            "series_name": f"Benchmark Series {i % 500}",
+            "volume_number": str(vol),
+            "isbn_13": None if rng.random() < 0.05 else f"979{i:010d}",
+            "release_date": start + timedelta(days=rng.randint(0, 120)),
+            "publisher_id": publisher_id,
+            "format": rng.choice(["Paperback", "Hardcover", "Digital"]),
+            "page_count": rng.randint(160, 240),
+            "price_usd": round(rng.uniform(9.99, 16.99), 2),
+            "demographic": rng.choice(["Shonen", "Shojo", "Seinen", "Josei"]),
+            "genres": ["Action"],
+            "regions": ["us", "uk"],
+            "authors": [f"Author {i % 300}"],
+            "illustrators": [],
+        })
+    return payload
+
+
+async def run(strategy: str, rows: int) -> None:
+    """Time two passes of one strategy inside a rolled-back transaction."""
+    async with AsyncSessionLocal() as db:
+        publisher = await PublisherRepository(db).get_or_create(
+            name="Benchmark Press", slug="benchmark-press"
+        )
+        repo = ReleaseRepository(db)
+        payload = build_payload(rows, publisher.id)
+
+        for label in ("insert pass", "update pass"):
+            # Copy rows so one pass cannot leak state into the next
+            data = [dict(row) for row in payload]
+            started = time.perf_counter()
+            if strategy == "legacy":
+                counts = await legacy_bulk_upsert(db, data)
+            else:
+                counts = await repo.bulk_upsert(data)
+            elapsed = time.perf_counter() - started
+            print(
+                f"{strategy:>8} {label}: {elapsed:8.2f}s "
+                f"({rows / elapsed:,.0f} rows/s) "
+                f"{counts['created']} created, {counts['updated']} updated"
+            )
+            db.expunge_all()
+
+        await db.rollback()
+
+
+async def main() -> None:
+    """Main function."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--skip-legacy", action="store_true", help="Only time the set-based path")
+    args = parser.parse_args()
+
+    await init_db()
+    await run("set", args.rows)
+    if not args.skip_legacy:
+        await run("legacy", args.rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
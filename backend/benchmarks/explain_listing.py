@@ -0,0 +1,191 @@
+"""Check that every ReleaseRepository query shape is served by an index.
+
+Usage:
+    python -m benchmarks.explain_listing
+    python -m benchmarks.explain_listing --no-load --skip search
+
+Runs each listing and search shape through ReleaseRepository, captures the
+SQL it sends, and EXPLAINs it with the same parameters. A shape fails if
+manga_releases is read by a sequential scan. Shapes marked ``ordered`` must
+also return their page straight from an index, with no Sort node. The
+process exits non-zero on any failure, so it can gate a migration.
+
+By default a SyntheticSource catalogue is backfilled first (and ANALYZEd),
+so the planner sees production-like sizes. Everything runs in one
+transaction that is rolled back. ``--no-load`` checks the data already in
+DATABASE_URL instead.
+"""
+import argparse
+import asyncio
+import json
+import sys
+from datetime import date, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories.release_repository import ReleaseRepository
+from app.sources.base import stream_releases
+from app.sources.synthetic_source import SyntheticSource
+from app.utils.bulk_load import backfill_releases
+from app.utils.database import AsyncSessionLocal, engine
+
+TABLE = "manga_releases"
+
+# (name, call, ordered)
+Shape = Tuple[str, Callable[[ReleaseRepository, Dict[str, Any]], Awaitable[Any]], bool]
+
+SHAPES: List[Shape] = [
+    ("current by date", lambda repo, ctx: repo.get_current_month_releases(), True),
+    (
+        "current by date, keyset page",
+        lambda repo, ctx: repo.get_current_month_releases(
+            after=(ctx["month_start"], 0), include_total=False
+        ),
+        True,
+    ),
+    ("current by title", lambda repo, ctx: repo.get_current_month_releases(sort_by="title"), False),
+    (
+        "current by publisher name",
+        lambda repo, ctx: repo.get_current_month_releases(sort_by="publisher"),
+        False,
+    ),
+    (
+        "current for a publisher",
+        lambda repo, ctx: repo.get_current_month_releases(publisher_slug=ctx["publisher"]),
+        False,
+    ),
+    (
+        "current for a format",
+        lambda repo, ctx: repo.get_current_month_releases(format="Hardcover"),
+        True,
+    ),
+    (
+        "current for region, genre and demographic",
+        lambda repo, ctx: repo.get_current_month_releases(
+            region="au", genre="Sports", demographic="Josei"
+        ),
+        False,
+    ),
+    ("upcoming", lambda repo, ctx: repo.get_upcoming_releases(months=3), False),
+    (
+        "upcoming for a publisher",
+        lambda repo, ctx: repo.get_upcoming_releases(months=3, publisher_slug=ctx["publisher"]),
+        False,
+    ),
+    ("search", lambda repo, ctx: repo.search_releases(query="dragon"), False),
+]
+
+
+class StatementCapture:
+    """Collect the statements and parameters sent on the engine."""
+
+    def __init__(self):
+        """Initialize capture."""
+        self.statements: List[Tuple[str, Any]] = []
+        self.active = False
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        """before_cursor_execute hook."""
+        if self.active and not executemany:
+            self.statements.append((statement, parameters))
+
+
+def plan_nodes(plan: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Every node of a JSON plan, depth first."""
+    nodes = [plan]
+    for child in plan.get("Plans", ()):
+        nodes.extend(plan_nodes(child))
+    return nodes
+
+
+async def check_shape(
+    db: AsyncSession,
+    capture: StatementCapture,
+    shape: Shape,
+    ctx: Dict[str, Any],
+) -> bool:
+    """Run one shape, EXPLAIN what it sent, and print the verdict."""
+    name, call, ordered = shape
+    capture.statements.clear()
+    capture.active = True
+    try:
+        await call(ReleaseRepository(db), ctx)
+    finally:
+        capture.active = False
+
+    problems = []
+    scans = set()
+    connection = await db.connection()
+    for statement, parameters in capture.statements:
+        if TABLE not in statement:
+            continue
+        result = await connection.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {statement}", parameters
+        )
+        raw = result.scalar()
+        nodes = plan_nodes((json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"])
+        for node in nodes:
+            index = node.get("Index Name", "")
+            if node.get("Relation Name") != TABLE and not index.startswith(("ix_" + TABLE, TABLE)):
+                continue
+            scans.add(node["Node Type"] + (f" ({index})" if index else ""))
+            if node["Node Type"] == "Seq Scan":
+                problems.append("sequential scan")
+        if ordered and "LIMIT" in statement and any(
+            node["Node Type"] in ("Sort", "Incremental Sort") for node in nodes
+        ):
+            problems.append("page is sorted, not read in index order")
+
+    passed = not problems
+    print(f"  {'PASS' if passed else 'FAIL'}  {name}: {', '.join(sorted(scans)) or 'no scans'}")
+    for problem in sorted(set(problems)):
+        print(f"          {problem}")
+    return passed
+
+
+async def main() -> None:
+    """Main function."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--no-load", action="store_true", help="Use the data already there")
+    parser.add_argument("--series", type=int, default=20000)
+    parser.add_argument("--skip", action="append", default=[], help="Skip shapes containing this")
+    args = parser.parse_args()
+
+    capture = StatementCapture()
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+
+    async with AsyncSessionLocal() as db:
+        if not args.no_load:
+            source = SyntheticSource(series=args.series)
+            today = date.today()
+            await backfill_releases(
+                db,
+                stream_releases(
+                    source, today - timedelta(days=365), today + timedelta(days=180), batch_size=10000
+                ),
+            )
+            await db.execute(text(f"ANALYZE {TABLE}"))
+            await db.execute(text("ANALYZE publishers"))
+
+        publisher = (await db.execute(text(
+            "SELECT p.slug FROM publishers p JOIN manga_releases m ON m.publisher_id = p.id "
+            "GROUP BY p.slug ORDER BY count(*) DESC LIMIT 1"
+        ))).scalar()
+        ctx = {"publisher": publisher, "month_start": date.today().replace(day=1)}
+
+        results = []
+        for shape in SHAPES:
+            if any(skip in shape[0] for skip in args.skip):
+                continue
+            results.append(await check_shape(db, capture, shape, ctx))
+        await db.rollback()
+
+    print(f"{sum(results)}/{len(results)} query shapes index-served")
+    if not all(results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,300 @@
+"""Load test the release endpoints against the TECHNICAL_DESIGN targets.
+
+Usage:
+    python -m benchmarks.load_test --load --series 100000
+    python -m benchmarks.load_test --url http://localhost:8000 --rate 100 --duration 60
+    python -m benchmarks.load_test --in-process --rate 50 --duration 20
+
+``--load`` first fills DATABASE_URL with a SyntheticSource catalogue through
+COPY. The catalogue covers ``--months`` either side of today; the same seed
+always gives the same data, so point it at a fresh, migrated database. The test then
+sends a realistic mix of ``/releases/*``, publisher and filter requests at a
+fixed ``--rate``, without waiting for responses. Latency is measured from
+when each request was due, so a slow server cannot hide its own backlog.
+p50/p95/p99 are reported per endpoint and overall, against P95 < 200ms,
+P99 < 500ms and 100 req/s, along with the connection pool checkouts and
+cache misses ``/metrics`` counted during the run. ``--in-process`` calls the
+app directly instead of over the network.
+"""
+import argparse
+import asyncio
+import math
+import random
+import re
+import time
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from app.config import get_settings
+from app.models import MangaRelease
+from app.repositories.publisher_repository import PublisherRepository
+from app.sources.synthetic_source import MAX_SERIES, WORDS, SyntheticSource
+from app.utils.bulk_load import copy_rows
+from app.utils.database import AsyncSessionLocal, init_db
+
+settings = get_settings()
+
+TARGET_P95_MS = 200
+TARGET_P99_MS = 500
+TARGET_RPS = 100
+
+REGIONS = ["us", "uk", "ca", "au"]
+FORMATS = ["Paperback", "Hardcover", "Digital"]
+
+
+def slugify(name: str) -> str:
+    """URL slug for a publisher name."""
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+
+async def load(source: SyntheticSource, months: int) -> None:
+    """COPY the source's releases for ``months`` either side of today."""
+    await init_db()
+    today = date.today()
+    start_date = today - timedelta(days=months * 31)
+    end_date = today + timedelta(days=months * 31)
+
+    async with AsyncSessionLocal() as db:
+        repo = PublisherRepository(db)
+        publisher_ids = {}
+        for name in source.publisher_names:
+            publisher = await repo.get_or_create(name=name, slug=slugify(name))
+            publisher_ids[name] = publisher.id
+        await db.commit()
+
+        started = time.perf_counter()
+        loaded = 0
+        async for batch in source.iter_releases(start_date, end_date, batch_size=10000):
+            rows = [release.to_row(publisher_ids[release.publisher_name]) for release in batch]
+            loaded += await copy_rows(db, MangaRelease.__table__, rows, list(rows[0]))
+            await db.commit()
+            elapsed = time.perf_counter() - started
+            print(f"\rloaded {loaded:,} releases ({loaded / elapsed:,.0f}/s)", end="", flush=True)
+        print()
+
+
+class RequestMix:
+    """Weighted, seeded choice of requests shaped like real traffic."""
+
+    def __init__(self, source: SyntheticSource, seed: int = 42):
+        """Initialize mix."""
+        self.rng = random.Random(seed)
+        self.publishers = [slugify(name) for name in source.publisher_names]
+        self.series = [series["name"] for series in source.series]
+        self.choices: List[Tuple[str, int]] = [
+            ("current", 40),
+            ("current_filtered", 15),
+            ("upcoming", 20),
+            ("search", 20),
+            ("publishers", 3),
+            ("filters", 2),
+        ]
+
+    def next(self) -> Tuple[str, str, Dict[str, str]]:
+        """The next (endpoint name, path, query params)."""
+        rng = self.rng
+        names, weights = zip(*self.choices)
+        name = rng.choices(names, weights)[0]
+        prefix = settings.API_V1_PREFIX
+
+        if name == "current":
+            params = {"limit": str(rng.choice([20, 50, 100]))}
+            return name, f"{prefix}/releases/current", params
+        if name == "current_filtered":
+            params = {rng.choice(["publisher", "region", "format"]): ""}
+            if "publisher" in params:
+                params["publisher"] = rng.choice(self.publishers)
+            elif "region" in params:
+                params["region"] = rng.choice(REGIONS)
+            else:
+                params["format"] = rng.choice(FORMATS)
+            params["sort"] = rng.choice(["date", "title", "publisher"])
+            return name, f"{prefix}/releases/current", params
+        if name == "upcoming":
+            params = {"months": str(rng.randint(1, 4))}
+            if rng.random() < 0.3:
+                params["publisher"] = rng.choice(self.publishers)
+            return name, f"{prefix}/releases/upcoming", params
+        if name == "search":
+            if rng.random() < 0.5:
+                # Someone typing part of a series name
+                words = rng.choice(self.series).split()
+                query = " ".join(words[:rng.randint(1, len(words))])
+            else:
+                query = rng.choice(WORDS)
+            params = {"q": query, "limit": "20"}
+            return name, f"{prefix}/releases/search", params
+        if name == "publishers":
+            return name, f"{prefix}/publishers", {}
+        return name, f"{prefix}/metadata/filters", {}
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    if not values:
+        return 0.0
+    return values[max(0, math.ceil(pct / 100 * len(values)) - 1)]
+
+
+async def run(
+    client: httpx.AsyncClient,
+    mix: RequestMix,
+    rate: float,
+    duration: float,
+    max_in_flight: int,
+) -> None:
+    """Send requests at a fixed rate for ``duration`` seconds and report."""
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    statuses: Counter = Counter()
+    semaphore = asyncio.Semaphore(max_in_flight)
+    tasks = []
+
+    async def send(name: str, path: str, params: Dict[str, str], due: float) -> None:
+        try:
+            response = await client.get(path, params=params)
+            statuses[response.status_code] += 1
+        except httpx.HTTPError as e:
+            statuses[type(e).__name__] += 1
+        finally:
+            semaphore.release()
+        latencies[name].append((time.perf_counter() - due) * 1000)
+
+    before = await server_metrics(client)
+    total = int(rate * duration)
+    started = time.perf_counter()
+    for i in range(total):
+        due = started + i / rate
+        delay = due - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        # Past max_in_flight the client, not the server, is the bottleneck
+        await semaphore.acquire()
+        name, path, params = mix.next()
+        tasks.append(asyncio.create_task(send(name, path, params, due)))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+
+    report(latencies, statuses, total, elapsed)
+    report_pools(before, await server_metrics(client), total)
+
+
+async def server_metrics(client: httpx.AsyncClient) -> Optional[Dict]:
+    """The server's ``/metrics``, or None if unavailable."""
+    try:
+        response = await client.get("/metrics")
+        response.raise_for_status()
+        return response.json()
+    except httpx.HTTPError:
+        return None
+
+
+def report_pools(before: Optional[Dict], after: Optional[Dict], total: int) -> None:
+    """Print pool checkouts during the run next to requests and cache misses.
+
+    Counters are per worker process, so with several workers this only
+    covers the one that answered ``/metrics``.
+    """
+    if not before or not after or "pools" not in after:
+        print("pool checkouts: /metrics unavailable")
+        return
+    misses = after["cache"].get("misses", 0) - before["cache"].get("misses", 0)
+    print(f"requests: {total:,}, cache misses: {misses:,}")
+    for name, stats in after["pools"].items():
+        previous = before["pools"].get(name, {})
+        checkouts = stats["checkouts"] - previous.get("checkouts", 0)
+        print(
+            f"  {name} pool: {checkouts:,} checkouts ({checkouts / max(total, 1):.2f}/request), "
+            f"{stats['connects'] - previous.get('connects', 0):,} new connections, "
+            f"at most {stats['max_checked_out']} checked out"
+        )
+
+
+def report(
+    latencies: Dict[str, List[float]],
+    statuses: Counter,
+    total: int,
+    elapsed: float,
+) -> None:
+    """Print percentiles per endpoint and overall, and check the targets."""
+    print(f"{'endpoint':<18}{'requests':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    everything: List[float] = []
+    for name in sorted(latencies):
+        values = sorted(latencies[name])
+        everything.extend(values)
+        print(
+            f"{name:<18}{len(values):>9,}{percentile(values, 50):>9.1f}"
+            f"{percentile(values, 95):>9.1f}{percentile(values, 99):>9.1f}{values[-1]:>9.1f}"
+        )
+    everything.sort()
+    p95, p99 = percentile(everything, 95), percentile(everything, 99)
+    throughput = total / elapsed
+    print(
+        f"{'all':<18}{len(everything):>9,}{percentile(everything, 50):>9.1f}"
+        f"{p95:>9.1f}{p99:>9.1f}{everything[-1] if everything else 0:>9.1f}"
+    )
+    print(f"statuses: {dict(statuses)}")
+
+    errors = sum(count for status, count in statuses.items() if status != 200 and status != 304)
+    checks = [
+        (f"P95 < {TARGET_P95_MS}ms", p95 < TARGET_P95_MS),
+        (f"P99 < {TARGET_P99_MS}ms", p99 < TARGET_P99_MS),
+        (f"{TARGET_RPS} req/s (got {throughput:,.1f})", throughput >= TARGET_RPS),
+        (f"no errors (got {errors})", errors == 0),
+    ]
+    for label, passed in checks:
+        print(f"  {'PASS' if passed else 'FAIL'}  {label}")
+
+
+def client_for(url: Optional[str]) -> httpx.AsyncClient:
+    """HTTP client for a running server, or for the app in this process."""
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=100)
+    if url:
+        return httpx.AsyncClient(base_url=url, limits=limits, timeout=30.0)
+
+    from app.main import app
+
+    return httpx.AsyncClient(
+        # Errors count as 500s, as they would over the network
+        transport=httpx.ASGITransport(app=app, raise_app_exceptions=False),
+        base_url="http://test",
+        timeout=30.0,
+    )
+
+
+async def main() -> None:
+    """Main function."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--load", action="store_true", help="COPY a synthetic catalogue first")
+    parser.add_argument("--series", type=int, default=20000)
+    parser.add_argument("--publishers", type=int, default=60)
+    parser.add_argument("--months", type=int, default=6, help="Months either side of today to load")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--in-process", action="store_true", help="Call the app without a server")
+    parser.add_argument("--rate", type=float, default=TARGET_RPS, help="Requests per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of traffic (0 to skip)")
+    parser.add_argument("--max-in-flight", type=int, default=500)
+    args = parser.parse_args()
+    if not 0 < args.series <= MAX_SERIES:
+        parser.error(f"--series must be between 1 and {MAX_SERIES:,}")
+
+    source = SyntheticSource(series=args.series, publishers=args.publishers, seed=args.seed)
+    if args.load:
+        await load(source, args.months)
+    if not args.duration:
+        return
+
+    if args.in_process:
+        # No lifespan without a server
+        from app.services.cache_service import cache_service
+
+        await cache_service.connect()
+    async with client_for(None if args.in_process else args.url) as client:
+        await run(client, RequestMix(source, args.seed), args.rate, args.duration, args.max_in_flight)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,186 @@
+"""Compare ORM hydration with the projected read path for listing pages.
+
+Usage:
+    python -m benchmarks.projection
+    python -m benchmarks.projection --no-load --pages 500 --limit 100
+
+Reads the same current-month pages three ways and renders each to the
+response dicts:
+
+- ``orm``: MangaRelease instances with selectinload(publisher), converted
+  attribute by attribute, as listings did before the projected path
+- ``projection``: ReleaseRepository's projected rows, ``fields=full``
+- ``card``: the same, ``fields=card``
+
+For each it reports wall time and this process's CPU time per page (the
+database runs in another process, so CPU time is the app's share), the peak
+memory allocated while building one page, and the JSON size of a page.
+
+By default a SyntheticSource catalogue is backfilled first, as in
+explain_listing. Everything runs in one transaction that is rolled back.
+"""
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+from datetime import date, timedelta
+from typing import Any, Awaitable, Callable, Dict, List
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.models import MangaRelease
+from app.services.release_service import ReleaseService
+from app.sources.base import stream_releases
+from app.sources.synthetic_source import SyntheticSource
+from app.utils.bulk_load import backfill_releases
+from app.utils.database import AsyncSessionLocal
+
+Page = Callable[[AsyncSession, int, int], Awaitable[List[Dict[str, Any]]]]
+
+
+def orm_to_dict(release: MangaRelease) -> Dict[str, Any]:
+    """A release model as the API renders it."""
+    return {
+        "id": release.id,
+        "title": release.title,
+        "series_name": release.series_name,
+        "volume_number": release.volume_number,
+        "isbn_13": release.isbn_13,
+        "isbn_10": release.isbn_10,
+        "release_date": release.release_date.isoformat(),
+        "publisher": {
+            "id": release.publisher.id,
+            "name": release.publisher.name,
+            "slug": release.publisher.slug,
+            "country": release.publisher.country,
+        },
+        "format": release.format,
+        "page_count": release.page_count,
+        "price_usd": float(release.price_usd) if release.price_usd else None,
+        "price_gbp": float(release.price_gbp) if release.price_gbp else None,
+        "cover_image_url": release.cover_image_url,
+        "description": release.description,
+        "demographic": release.demographic,
+        "genres": release.genres or [],
+        "regions": release.regions or [],
+        "authors": release.authors or [],
+        "illustrators": release.illustrators or [],
+    }
+
+
+async def orm_page(db: AsyncSession, limit: int, offset: int) -> List[Dict[str, Any]]:
+    """One page through full ORM hydration."""
+    today = date.today()
+    result = await db.execute(
+        select(MangaRelease)
+        .options(selectinload(MangaRelease.publisher))
+        .where(MangaRelease.release_date >= today.replace(day=1))
+        .where(MangaRelease.release_date < (today.replace(day=28) + timedelta(days=4)).replace(day=1))
+        .order_by(MangaRelease.release_date, MangaRelease.id)
+        .offset(offset)
+        .limit(limit)
+    )
+    page = [orm_to_dict(release) for release in result.scalars().all()]
+    # Each request has a fresh session; do not let the identity map carry over
+    db.expunge_all()
+    return page
+
+
+def projected_page(fields: str) -> Page:
+    """One page through the projected read path."""
+
+    async def page(db: AsyncSession, limit: int, offset: int) -> List[Dict[str, Any]]:
+        service = ReleaseService(db)
+        rows, _ = await service.release_repo.get_current_month_releases(
+            limit=limit, offset=offset, include_total=False, fields=fields
+        )
+        return [service._row_to_schema(row, fields) for row in rows]
+
+    return page
+
+
+PATHS: Dict[str, Page] = {
+    "orm": orm_page,
+    "projection": projected_page("full"),
+    "card": projected_page("card"),
+}
+
+
+async def measure(db: AsyncSession, page: Page, limit: int, offsets: List[int]) -> Dict[str, float]:
+    """Time every offset's page, then trace the allocations of one."""
+    await page(db, limit, offsets[0])  # warm up
+
+    wall, cpu = time.perf_counter(), time.process_time()
+    for offset in offsets:
+        await page(db, limit, offset)
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+
+    tracemalloc.start()
+    releases = await page(db, limit, offsets[0])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "wall_ms": wall / len(offsets) * 1000,
+        "cpu_ms": cpu / len(offsets) * 1000,
+        "peak_kib": peak / 1024,
+        "json_kib": len(json.dumps({"data": releases}, separators=(",", ":"))) / 1024,
+        "rows": len(releases),
+    }
+
+
+async def main() -> None:
+    """Main function."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--no-load", action="store_true", help="Use the data already there")
+    parser.add_argument("--series", type=int, default=20000)
+    parser.add_argument("--pages", type=int, default=200, help="Pages read per path")
+    parser.add_argument("--limit", type=int, default=100, help="Releases per page")
+    args = parser.parse_args()
+
+    async with AsyncSessionLocal() as db:
+        if not args.no_load:
+            source = SyntheticSource(series=args.series)
+            today = date.today()
+            await backfill_releases(
+                db,
+                stream_releases(
+                    source, today - timedelta(days=365), today + timedelta(days=180), batch_size=10000
+                ),
+            )
+            await db.execute(text("ANALYZE manga_releases"))
+            await db.execute(text("ANALYZE publishers"))
+
+        rows, total = await ReleaseService(db).release_repo.get_current_month_releases(limit=1)
+        if total < args.limit:
+            print(f"only {total} releases this month; load more with --series")
+            return
+        # Spread the pages over the month, as real traffic would
+        span = total - args.limit + 1
+        offsets = [(i * 7919) % span for i in range(args.pages)]
+
+        results = {name: await measure(db, page, args.limit, offsets) for name, page in PATHS.items()}
+        await db.rollback()
+
+    print(f"{args.pages} pages of {args.limit} releases, from {total:,} this month")
+    print(f"{'path':<12}{'wall ms':>9}{'cpu ms':>9}{'peak KiB':>10}{'JSON KiB':>10}")
+    for name, result in results.items():
+        print(
+            f"{name:<12}{result['wall_ms']:>9.2f}{result['cpu_ms']:>9.2f}"
+            f"{result['peak_kib']:>10.0f}{result['json_kib']:>10.1f}"
+        )
+    baseline = results["orm"]
+    for name, result in results.items():
+        if name == "orm":
+            continue
+        print(
+            f"{name}: {baseline['cpu_ms'] / result['cpu_ms']:.1f}x less CPU, "
+            f"{baseline['peak_kib'] / result['peak_kib']:.1f}x less peak memory than orm"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
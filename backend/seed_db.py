@@ -1,17 +1,41 @@
-"""Seed database script."""
+"""Seed database script.
+
+Usage:
+    python seed_db.py                                  # a few months of mock data
+    python seed_db.py --backfill --years 5 --series 50000
+"""
+import argparse
 import asyncio
+from datetime import date, timedelta
+
+from app.sources.synthetic_source import SyntheticSource
 from app.utils.database import AsyncSessionLocal, init_db
-from app.utils.seed import seed_database
+from app.utils.seed import backfill_database, seed_database
 
 
 async def main():
     """Main function."""
+    parser = argparse.ArgumentParser(description="Seed the database")
+    parser.add_argument("--backfill", action="store_true", help="Load synthetic history with COPY")
+    parser.add_argument("--years", type=int, default=3, help="Years of history to backfill")
+    parser.add_argument("--series", type=int, default=20000)
+    parser.add_argument("--publishers", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
     # Initialize database
     await init_db()
 
     # Seed data
     async with AsyncSessionLocal() as db:
-        await seed_database(db)
+        if args.backfill:
+            source = SyntheticSource(series=args.series, publishers=args.publishers, seed=args.seed)
+            today = date.today()
+            await backfill_database(
+                db, source, today - timedelta(days=365 * args.years), today + timedelta(days=120)
+            )
+        else:
+            await seed_database(db)
 
 
 if __name__ == "__main__":